@@ -1,7 +1,6 @@
 import numpy as np
 from .model import AssignmentProblem, Assignment, NormalizedAssignmentProblem
 from ..simplex.model import Model
-from ..simplex.expressions.expression import Expression
 from dataclasses import dataclass
 from typing import List 
 
@@ -27,45 +26,27 @@ class Solver:
         # 1) creates variables, one for each cost in the cost matrix
         # 2) add constraint, that sum of every row has to be equal 1
         # 3) add constraint, that sum of every col has to be equal 1
-        # 4) add constraint, that every variable has to be <= 1
+        # 4) every variable has to be <= 1 (it's the variable upper bound, not a constraint)
         # 5) create an objective expression, involving all variables weighted by their cost
         # 6) add the objective to model (minimize it!)
         #
-        #  tip. model.add_constraint(Expression.from_vectors([x1,x2,x3], [3,2,1]) < 3))
-        #       accepts lists as arguments and gives the same result as:
-        #       model.add_constraint(3*x1 + 2*x2 + x3 < 3) 
-        tab = []
-        for i in range(len(self.problem.costs)):
-            temp = []
-            for j in range(len(self.problem.costs[i])):
-                temp.append(model.create_variable(f'x{i}{j}'))
-            tab.append(temp)
-
-        for i in range(len(tab)):
-            row_sum = tab[i][0]
-            for j in range(1, len(tab[i])):
-                row_sum += tab[i][j]
-            model.add_constraint(row_sum >= 1)
-            model.add_constraint(row_sum <= 1)
-
-        for i in range(len(tab[0])):
-            column_sum = tab[0][i]
-            for j in range(1, len(tab)):
-                column_sum += tab[j][i]
-            model.add_constraint(column_sum <= 1)
-            model.add_constraint(column_sum >= 1)
-
-        for i in range(len(tab)):
-            for j in range(len(tab[i])):
-                model.add_constraint(tab[i][j] <= 1)
-        # for i in range(len(tab)):
-            # model.add_constraint(Expression.from_vectors(tab[i], self.problem.costs[i]) == 0)
-        obj_expr = Expression.from_vectors(tab[0], self.problem.costs[0])
-        for i in range(1, len(tab)):
-            obj_expr += Expression.from_vectors(tab[i], self.problem.costs[i])
+        #  tip. model.create_variables(shape, "x", upper=1) creates the whole matrix of variables at once,
+        #       x.sum(axis) gives the sums of its rows or columns as arrays of expressions
+        #       and costs.ravel() @ x.ravel() weights every variable by its cost
+        tab = model.create_variables(self.problem.costs.shape, "x", upper=1)
+
+        row_sums = tab.sum(axis=1)
+        model.add_constraint(row_sums >= 1)
+        model.add_constraint(row_sums <= 1)
+
+        column_sums = tab.sum(axis=0)
+        model.add_constraint(column_sums <= 1)
+        model.add_constraint(column_sums >= 1)
+
+        obj_expr = self.problem.costs.ravel() @ tab.ravel()
         model.minimize(obj_expr)
 
-        solution = model.solve()
+        solution = model.solve(presolve=True)
 
 
         # 1) extract assignment for the original problem from the solution object
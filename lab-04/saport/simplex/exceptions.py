@@ -14,4 +14,62 @@ class EmptyModelError(Exception):
 class MissingObjectiveError(Exception):
     
     def __init__(self) -> None:
-        super().__init__(f"Cannot solve model missing an objective.")
\ No newline at end of file
+        super().__init__(f"Cannot solve model missing an objective.")
+
+
+class BatchSizeError(Exception):
+
+    def __init__(self, rhs_n: int, costs_n: int) -> None:
+        super().__init__(f"Cannot solve a batch of {rhs_n} right hand sides and {costs_n} objectives. Both lists have to be of the same length.")
+        self.rhs_n = rhs_n
+        self.costs_n = costs_n
+
+
+class InvalidBoundsError(Exception):
+
+    def __init__(self, name: str, lower: float, upper: float) -> None:
+        super().__init__(f"Cannot bound variable {name} with [{lower}, {upper}]. The lower bound has to be finite and not greater than the upper one.")
+        self.name = name
+
+
+class ShapeMismatchError(Exception):
+
+    def __init__(self, operation: str, left: tuple, right: tuple) -> None:
+        super().__init__(f"Cannot {operation} arrays with shapes {left} and {right}.")
+        self.operation = operation
+        self.left = left
+        self.right = right
+
+
+class SolveTimeoutError(Exception):
+
+    def __init__(self, index: int, timeout: float) -> None:
+        super().__init__(f"Cannot solve model {index} within {timeout} seconds. Its worker process has been terminated.")
+        self.index = index
+        self.timeout = timeout
+
+
+class SolveFailedError(Exception):
+
+    def __init__(self, index: int, reason: str) -> None:
+        super().__init__(f"Cannot solve model {index}: {reason}")
+        self.index = index
+        self.reason = reason
+
+
+class ModelFormatError(Exception):
+
+    def __init__(self, path: str, reason: str, line: int = None) -> None:
+        location = path if line is None else f"{path}, line {line}"
+        super().__init__(f"Cannot read model from {location}: {reason}")
+        self.path = path
+        self.reason = reason
+        self.line = line
+
+
+class SnapshotError(Exception):
+
+    def __init__(self, path: str, reason: str) -> None:
+        super().__init__(f"Cannot load snapshot from {path}: {reason}")
+        self.path = path
+        self.reason = reason
@@ -0,0 +1,230 @@
+from __future__ import annotations
+from typing import Dict, List
+import multiprocessing
+import multiprocessing.connection
+import os
+import time
+
+import saport.simplex.model as ssmod
+import saport.simplex.solution as sssol
+import saport.simplex.compiled_model as sscom
+import saport.simplex.stats as ssstat
+import saport.simplex.limits as sslim
+from saport.simplex.exceptions import SolveFailedError, SolveTimeoutError
+
+
+class SolveTask:
+    """
+        A class to represent a single model shipped to a worker process.
+        It holds only the compiled arrays and the names, so the expression graph of the model is never pickled.
+
+        Attributes
+        ----------
+        index : int
+            position of the model in the solved list
+        compiled : CompiledModel
+            the unscaled arrays of the model
+        names : List[str]
+            names of the variables
+        name : str
+            name of the model
+        options : Dict[str, object]
+            keyword arguments of Model.solve
+
+        Methods
+        -------
+        __init__(index: int, compiled: CompiledModel, names: List[str], name: str, options: Dict[str, object]) -> SolveTask:
+            constructs a new task
+        @staticmethod from_model(index: int, model: Model, options: Dict[str, object]) -> SolveTask:
+            compiles the model into a new task
+        run() -> SolveResult:
+            rebuilds the model from the arrays and solves it
+    """
+    index: int
+    compiled: sscom.CompiledModel
+    names: List[str]
+    name: str
+    options: Dict[str, object]
+
+    def __init__(self, index: int, compiled: sscom.CompiledModel, names: List[str], name: str, options: Dict[str, object]):
+        self.index = index
+        self.compiled = compiled
+        self.names = names
+        self.name = name
+        self.options = options
+
+    @staticmethod
+    def from_model(index: int, model: ssmod.Model, options: Dict[str, object]) -> SolveTask:
+        names = [var.name for var in model.variables]
+        return SolveTask(index, model.compile(), names, model.name, options)
+
+    def run(self) -> SolveResult:
+        model = ssmod.Model.from_compiled(self.compiled, self.names, self.name)
+        solution = model.solve(retention=sssol.RetentionType.BASIS, **self.options)
+        return SolveResult(self.index, solution._assignment, solution.is_feasible, solution.is_bounded,
+                           solution.iterations, solution.stats, solution.basis(), solution.limit)
+
+
+class SolveResult:
+    """
+        A class to represent a solution shipped back from a worker process, without any reference to the worker's model.
+
+        Attributes
+        ----------
+        index : int
+            position of the model in the solved list
+        assignment : List[float] | None
+            values of the variables, None if the model is infeasible or unbounded
+        is_feasible : bool
+            whether the model is feasible
+        is_bounded : bool
+            whether the model is bounded
+        iterations : int
+            number of the simplex iterations
+        stats : SolveStats | None
+            statistics of the solve
+        basis : List[int] | None
+            the final basis
+        limit : LimitType | None
+            the limit which stopped the solve, None if it finished
+
+        Methods
+        -------
+        __init__(index: int, assignment: List[float] | None, is_feasible: bool, is_bounded: bool, iterations: int, stats: SolveStats | None, basis: List[int] | None, limit: LimitType | None = None) -> SolveResult:
+            constructs a new result
+        solution(model: Model) -> Solution:
+            returns the solution of the given (original) model
+    """
+
+    def __init__(self, index: int, assignment: List[float], is_feasible: bool, is_bounded: bool, iterations: int,
+                 stats: ssstat.SolveStats, basis: List[int], limit: sslim.LimitType = None):
+        self.index = index
+        self.assignment = assignment
+        self.is_feasible = is_feasible
+        self.is_bounded = is_bounded
+        self.iterations = iterations
+        self.stats = stats
+        self.basis = basis
+        self.limit = limit
+
+    def solution(self, model: ssmod.Model) -> sssol.Solution:
+        solution = sssol.Solution(model, self.assignment, None, None, self.is_feasible, self.is_bounded)
+        solution.iterations = self.iterations
+        solution.stats = self.stats
+        solution._basis = self.basis
+        solution.limit = self.limit
+        return solution
+
+
+def solve_many(models: List[ssmod.Model], workers: int = None, timeout: float = None,
+               **options) -> List[sssol.Solution | SolveTimeoutError | SolveFailedError]:
+    """
+        Solves the independent models in a pool of worker processes, returns their solutions in the order of the models.
+        Every model is shipped to the workers as its compiled arrays and rebuilt there,
+        the solutions come back as plain values attached to the original models (with the basis retained).
+
+        workers is the number of processes (the number of CPUs by default),
+        timeout limits the wall time of every single model in seconds,
+        the other keyword arguments (engine, pricing, presolve, scaling, start, max_iterations, time_limit)
+        are passed to Model.solve, the cancellation tokens don't cross the process boundary.
+
+        A model failing in its worker (e.g. because it has no objective) doesn't affect the other ones,
+        its entry is a SolveFailedError, the entry of a model exceeding the timeout is a SolveTimeoutError
+        (its worker process is terminated and replaced).
+    """
+    workers = (os.cpu_count() or 1) if workers is None else max(1, workers)
+    tasks = [SolveTask.from_model(i, model, options) for (i, model) in enumerate(models)]
+    results: List[sssol.Solution | Exception] = [None] * len(models)
+
+    pending = list(reversed(tasks))
+    pool = [_Worker() for _ in range(min(workers, len(tasks)))]
+    try:
+        while pending or any(worker.task is not None for worker in pool):
+            for worker in pool:
+                if worker.task is None and pending:
+                    worker.start(pending.pop())
+
+            busy = [worker for worker in pool if worker.task is not None]
+            deadlines = [worker.deadline(timeout) for worker in busy]
+            wait = None if timeout is None else max(0.0, min(deadlines) - time.perf_counter())
+            ready = multiprocessing.connection.wait([worker.connection for worker in busy], wait)
+
+            for (i, worker) in enumerate(pool):
+                if worker.task is None:
+                    continue
+                index = worker.task.index
+                if worker.connection in ready:
+                    result = worker.receive()
+                    if isinstance(result, SolveResult):
+                        results[index] = result.solution(models[index])
+                    elif result is not None:
+                        results[index] = SolveFailedError(index, result)
+                    else:
+                        # the process died without sending anything back (e.g. it was killed)
+                        results[index] = SolveFailedError(index, f"the worker exited with code {worker.process.exitcode}")
+                        pool[i] = _Worker()
+                elif timeout is not None and time.perf_counter() >= worker.deadline(timeout):
+                    results[index] = SolveTimeoutError(index, timeout)
+                    worker.terminate()
+                    pool[i] = _Worker()
+    finally:
+        for worker in pool:
+            worker.stop()
+    return results
+
+
+class _Worker:
+    """
+        A worker process solving the tasks received through its pipe one by one.
+    """
+
+    def __init__(self):
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_work, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.task = None
+        self._started = 0.0
+
+    def start(self, task: SolveTask):
+        self.task = task
+        self._started = time.perf_counter()
+        self.connection.send(task)
+
+    def deadline(self, timeout: float | None) -> float:
+        return self._started + (timeout if timeout is not None else float("inf"))
+
+    def receive(self) -> SolveResult | str | None:
+        """ returns the result or the reason of the failure of the task, None if the process died """
+        self.task = None
+        try:
+            return self.connection.recv()
+        except EOFError:
+            self.terminate()
+            return None
+
+    def terminate(self):
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+    def stop(self):
+        if self.task is not None or not self.process.is_alive() or self.connection.closed:
+            self.terminate()
+            return
+        self.connection.send(None)
+        self.process.join()
+        self.connection.close()
+
+
+def _work(connection: multiprocessing.connection.Connection):
+    while True:
+        task = connection.recv()
+        if task is None:
+            return
+        try:
+            result = task.run()
+        except Exception as error:
+            # the exception itself may not be picklable, only its description is sent back
+            result = f"{type(error).__name__}: {error}"
+        connection.send(result)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Callable, List
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# tolerance of the simplex, shared with the tableau module (which depends on this one)
+eps = 0.000000001
+
+
+class PricingRule(ABC):
+    """
+        An abstract class to represent a pricing rule, i.e. the strategy choosing the variable entering the basis.
+        Reduced costs follow the convention of the tableau cost row: negative ones improve the objective.
+
+        Attributes
+        ----------
+        needs_edge_information : bool
+            whether the rule has to be notified about every pivot with the pivot row and column
+
+        Methods
+        -------
+        start(cols_n: int, column_norms: Callable[[], array]):
+            resets the rule before a simplex phase, column_norms() returns squared norms of the current tableau columns
+        price(cols_n: int, reduced_costs: Callable[[slice], array]) -> int | None:
+            returns index of the entering column or None if the basis is optimal,
+            reduced_costs(columns) computes the reduced costs of a slice of the columns,
+            by default all of them are computed at once and given to choose_entering_variable
+        choose_entering_variable(reduced_costs: array) -> int:
+            returns index of the entering column, there has to be at least one negative reduced cost
+        choose_leaving_row(quotients: array, basis: List[int]) -> int:
+            returns index of the leaving row among the ones with the minimal ratio, by default the last one
+        update(row: int, col: int, leaving: int, pivot_column: array, pivot_row: array, column_products: Callable[[], array]):
+            updates the rule before the pivot, column_products() returns dot products of every column with the pivot column
+            called only if the rule needs the edge information
+    """
+    needs_edge_information: bool = False
+
+    def start(self, cols_n: int, column_norms: Callable[[], ArrayLike]):
+        pass
+
+    def price(self, cols_n: int, reduced_costs: Callable[[slice], ArrayLike]) -> int | None:
+        costs = reduced_costs(slice(0, cols_n))
+        return None if costs.min() >= -eps else self.choose_entering_variable(costs)
+
+    @abstractmethod
+    def choose_entering_variable(self, reduced_costs: ArrayLike) -> int:
+        pass
+
+    def choose_leaving_row(self, quotients: ArrayLike, basis: List[int]) -> int:
+        return len(quotients) - 1 - np.argmin(quotients[::-1])
+
+    def update(self, row: int, col: int, leaving: int, pivot_column: ArrayLike, pivot_row: ArrayLike,
+               column_products: Callable[[], ArrayLike]):
+        pass
+
+
+class DantzigRule(PricingRule):
+    """
+        Chooses the column with the most negative reduced cost.
+    """
+    def choose_entering_variable(self, reduced_costs: ArrayLike) -> int:
+        return reduced_costs.argmin()
+
+
+class BlandRule(PricingRule):
+    """
+        Chooses the improving column and the leaving row with the lowest variable indices.
+        It's slower than the other rules, but it never cycles on the degenerate problems.
+    """
+    def choose_entering_variable(self, reduced_costs: ArrayLike) -> int:
+        return np.flatnonzero(reduced_costs < -eps)[0]
+
+    def choose_leaving_row(self, quotients: ArrayLike, basis: List[int]) -> int:
+        ties = np.flatnonzero(quotients <= quotients.min() + eps)
+        return ties[np.argmin(np.asarray(basis)[ties])]
+
+
+class PartialPricingRule(PricingRule):
+    """
+        Prices the columns in blocks, starting after the previously chosen column,
+        and chooses the most negative reduced cost in the first block containing an improving column.
+        The reduced costs of the remaining blocks aren't computed at all, so in the revised engine
+        an iteration costs only the products of the duals with the priced blocks instead of the whole matrix.
+        The optimality is proven only by the iteration pricing every block without finding an improving column.
+
+        Attributes
+        ----------
+        block_size : int | None
+            how many columns are priced at once, by default square root of the columns number
+    """
+    block_size: int | None
+
+    def __init__(self, block_size: int | None = None):
+        self.block_size = block_size
+        self._start = 0
+
+    def start(self, cols_n: int, column_norms: Callable[[], ArrayLike]):
+        self._start = 0
+
+    def price(self, cols_n: int, reduced_costs: Callable[[slice], ArrayLike]) -> int | None:
+        block_size = self.block_size or max(1, int(np.sqrt(cols_n)))
+        # the blocks wrap around to the first column, the last one before the wrap may be shorter
+        firsts = list(range(self._start, cols_n, block_size)) + list(range(0, self._start, block_size))
+        for first in firsts:
+            last = min(first + block_size, cols_n if first >= self._start else self._start)
+            costs = reduced_costs(slice(first, last))
+            col = costs.argmin()
+            if costs[col] < -eps:
+                self._start = (first + col + 1) % cols_n
+                return first + col
+        return None
+
+    def choose_entering_variable(self, reduced_costs: ArrayLike) -> int:
+        col = self.price(len(reduced_costs), lambda columns: reduced_costs[columns])
+        return reduced_costs.argmin() if col is None else col
+
+
+class SteepestEdgeRule(PricingRule):
+    """
+        Chooses the column with the most negative reduced cost per unit length of the edge (the tableau column),
+        so the objective improves the most per distance travelled.
+        The edge norms are computed at the start and then updated exactly with the Goldfarb-Reid recurrence.
+    """
+    needs_edge_information = True
+
+    def start(self, cols_n: int, column_norms: Callable[[], ArrayLike]):
+        self._weights = 1.0 + column_norms()
+
+    def choose_entering_variable(self, reduced_costs: ArrayLike) -> int:
+        return _best_weighted_column(reduced_costs, self._weights)
+
+    def update(self, row: int, col: int, leaving: int, pivot_column: ArrayLike, pivot_row: ArrayLike,
+               column_products: Callable[[], ArrayLike]):
+        ratios = pivot_row / pivot_row[col]
+        entering_weight = self._weights[col]
+        updated = self._weights - 2 * ratios * column_products() + ratios ** 2 * entering_weight
+        self._weights = np.maximum(updated, 1.0 + ratios ** 2)
+        self._weights[leaving] = max(entering_weight / pivot_row[col] ** 2, 1.0)
+        self._weights[col] = 1.0
+
+
+class DevexRule(PricingRule):
+    """
+        Approximates the steepest edge rule with the reference weights (Forrest-Goldfarb),
+        which don't need the norms of the columns, only the pivot row.
+    """
+    needs_edge_information = True
+
+    def start(self, cols_n: int, column_norms: Callable[[], ArrayLike]):
+        self._weights = np.ones(cols_n)
+
+    def choose_entering_variable(self, reduced_costs: ArrayLike) -> int:
+        return _best_weighted_column(reduced_costs, self._weights)
+
+    def update(self, row: int, col: int, leaving: int, pivot_column: ArrayLike, pivot_row: ArrayLike,
+               column_products: Callable[[], ArrayLike]):
+        ratios = pivot_row / pivot_row[col]
+        entering_weight = self._weights[col]
+        self._weights = np.maximum(self._weights, ratios ** 2 * entering_weight)
+        self._weights[leaving] = max(entering_weight / pivot_row[col] ** 2, 1.0)
+        self._weights[col] = 1.0
+
+
+def _best_weighted_column(reduced_costs: ArrayLike, weights: ArrayLike) -> int:
+    scores = np.where(reduced_costs < -eps, reduced_costs ** 2 / weights, -1.0)
+    return scores.argmax()
+
+
+class PricingType(Enum):
+    """
+    An enum representing all the available pricing rules.
+    """
+    DANTZIG = "dantzig"
+    BLAND = "bland"
+    PARTIAL = "partial"
+    STEEPEST_EDGE = "steepest_edge"
+    DEVEX = "devex"
+
+
+class PricingFactory:
+    """
+    A factory class creating pricing rule objects.
+
+    Static Methods:
+    ---------------
+    rule(pricing: PricingType | str | PricingRule) -> PricingRule:
+        creates a new pricing rule based on the specified type (or its name), rule objects are returned unchanged
+    """
+    @staticmethod
+    def rule(pricing: PricingType | str | PricingRule) -> PricingRule:
+        if isinstance(pricing, PricingRule):
+            return pricing
+        return {
+            PricingType.DANTZIG: DantzigRule,
+            PricingType.BLAND: BlandRule,
+            PricingType.PARTIAL: PartialPricingRule,
+            PricingType.STEEPEST_EDGE: SteepestEdgeRule,
+            PricingType.DEVEX: DevexRule,
+        }[PricingType(pricing)]()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import saport.simplex.model as ssmod
+import saport.simplex.tableau as sstab
+import saport.simplex.compiled_model as sscom
+import saport.simplex.scaling as ssscl
+import saport.simplex.expressions.expression as sseexp
+import saport.simplex.expressions.constraint as ssecon
+
+# tolerance of the basis solves, looser than the one of the tableau
+residual_eps = 0.0000001
+
+
+class Sensitivity:
+    """
+        A class to represent the sensitivity analysis of an optimal solution, read from its final tableau.
+        All the values are expressed in terms of the solved model (its objective sense, bounds and coefficients).
+
+        Attributes
+        ----------
+        shadow_prices : numpy.Array
+            change of the objective value per unit increase of the bound of every constraint
+        reduced_costs : numpy.Array
+            change of the objective value per unit increase of every variable from its current value, 0 for the basic ones
+        rhs_ranges : numpy.Array
+            2d-array with the lowest and the highest bound of every constraint keeping the basis optimal
+            (the other bounds fixed), the shadow prices stay valid within them
+        cost_ranges : numpy.Array
+            2d-array with the lowest and the highest objective coefficient of every variable keeping the basis optimal
+            (the other coefficients fixed), the assignment stays optimal within them
+
+        Methods
+        -------
+        __init__(shadow_prices: array, reduced_costs: array, rhs_ranges: array, cost_ranges: array) -> Sensitivity:
+            constructs the sensitivity analysis from the given values
+        @staticmethod from_tableau(model: Model, tableau: Tableau, augmented: CompiledModel, row_factors: array, scaling: Scaling | None) -> Sensitivity:
+            computes the analysis from the optimal tableau of the augmented model
+            (with the rows multiplied by the row factors and the columns by the scaling)
+        shadow_price(constraint: Constraint) -> float:
+            returns the shadow price of the constraint
+        reduced_cost(var: Variable) -> float:
+            returns the reduced cost of the variable
+        rhs_range(constraint: Constraint) -> (float, float):
+            returns the range of the constraint bound keeping the basis optimal
+        cost_range(var: Variable) -> (float, float):
+            returns the range of the objective coefficient of the variable keeping the basis optimal
+    """
+    shadow_prices: ArrayLike
+    reduced_costs: ArrayLike
+    rhs_ranges: ArrayLike
+    cost_ranges: ArrayLike
+
+    def __init__(self, shadow_prices: ArrayLike, reduced_costs: ArrayLike, rhs_ranges: ArrayLike, cost_ranges: ArrayLike):
+        self.shadow_prices = shadow_prices
+        self.reduced_costs = reduced_costs
+        self.rhs_ranges = rhs_ranges
+        self.cost_ranges = cost_ranges
+
+    @staticmethod
+    def from_tableau(model: ssmod.Model, tableau: sstab.Tableau, augmented: sscom.CompiledModel, row_factors: ArrayLike,
+                     scaling: ssscl.Scaling | None) -> Sensitivity:
+        sign = model.objective.type.value
+        cols_n = len(model.variables)
+        column_scales = np.ones(cols_n) if scaling is None else scaling.column_scales[:cols_n]
+        # the tableau columns of the flipped variables represent their complements
+        flips = np.where(tableau.flipped, -1.0, 1.0)
+        matrix = augmented.matrix * flips
+        factors = tableau.table[0, :-1]
+        basis = np.asarray(tableau.basis)
+        rows = np.flatnonzero(basis >= 0)
+
+        # every column satisfies: duals @ column - cost = objective factor
+        duals = np.linalg.lstsq(matrix.T, factors + augmented.costs * flips, rcond=None)[0]
+        shadow_prices = sign * duals * row_factors
+
+        reduced_costs = -sign * factors[:cols_n] * flips[:cols_n] / column_scales
+        basic = basis[rows]
+        reduced_costs[basic[basic < cols_n]] = 0.0
+
+        bounds = np.array([constraint.bound for constraint in model.constraints], dtype=float)
+        rhs_ranges = bounds[:, np.newaxis] + _rhs_deltas(tableau, matrix, rows, row_factors)
+        costs = np.array(model.objective.expression.coefficients(model), dtype=float)
+        directions = sign * column_scales * flips[:cols_n]
+        cost_ranges = costs[:, np.newaxis] + _cost_deltas(tableau, rows, directions)
+        return Sensitivity(shadow_prices, reduced_costs, rhs_ranges, cost_ranges)
+
+    def shadow_price(self, constraint: ssecon.Constraint) -> float:
+        return float(self.shadow_prices[constraint.index])
+
+    def reduced_cost(self, var: sseexp.Variable) -> float:
+        return float(self.reduced_costs[var.index])
+
+    def rhs_range(self, constraint: ssecon.Constraint) -> Tuple[float, float]:
+        low, high = self.rhs_ranges[constraint.index]
+        return float(low), float(high)
+
+    def cost_range(self, var: sseexp.Variable) -> Tuple[float, float]:
+        low, high = self.cost_ranges[var.index]
+        return float(low), float(high)
+
+    def __str__(self) -> str:
+        text = "- constraints (shadow price, bound range):"
+        for (i, (price, (low, high))) in enumerate(zip(self.shadow_prices, self.rhs_ranges)):
+            text += f"\n\t- {i}: {price:.6g}, [{low:.6g}, {high:.6g}]"
+        text += "\n- variables (reduced cost, cost range):"
+        for (i, (cost, (low, high))) in enumerate(zip(self.reduced_costs, self.cost_ranges)):
+            text += f"\n\t- {i}: {cost:.6g}, [{low:.6g}, {high:.6g}]"
+        return text
+
+
+def _rhs_deltas(tableau: sstab.Tableau, matrix: ArrayLike, rows: ArrayLike, row_factors: ArrayLike) -> ArrayLike:
+    """
+        returns the changes of every constraint bound the basic variables stay within their bounds for
+    """
+    basis = np.asarray(tableau.basis)[rows]
+    basic_matrix = matrix[:, basis]
+    # change of the basic values per unit increase of every bound: B^-1 R
+    directions = np.linalg.lstsq(basic_matrix, np.diag(row_factors), rcond=None)[0]
+    # a bound outside of the span of the basis (e.g. of a redundant row) can't move without breaking the feasibility
+    reachable = np.abs(basic_matrix @ directions - np.diag(row_factors)).max(axis=0, initial=0.0) <= residual_eps
+
+    values = tableau.table[1:, -1][rows]
+    deltas = _feasible_steps(values, directions, tableau.upper_bounds[basis])
+    deltas[~reachable] = 0.0
+    return deltas
+
+
+def _cost_deltas(tableau: sstab.Tableau, rows: ArrayLike, directions: ArrayLike) -> ArrayLike:
+    """
+        returns the changes of every objective coefficient the objective factors stay nonnegative for,
+        directions are the changes of the tableau costs per unit change of the coefficients
+    """
+    cols_n = len(directions)
+    factors = tableau.table[0, :-1]
+    basis = np.asarray(tableau.basis)[rows]
+    nonbasic = np.ones(len(factors), dtype=bool)
+    nonbasic[basis] = False
+    deltas = np.zeros((cols_n, 2))
+
+    # a nonbasic variable changes only its own factor: factor - direction * delta >= 0
+    structural = np.flatnonzero(nonbasic[:cols_n])
+    limits = factors[structural] / directions[structural]
+    deltas[structural, 0] = np.where(directions[structural] < 0, limits, -np.inf)
+    deltas[structural, 1] = np.where(directions[structural] > 0, limits, np.inf)
+
+    # a basic variable changes the factors of all the nonbasic ones: factors + direction * delta * row >= 0
+    structural_rows = rows[basis < cols_n]
+    structural = basis[basis < cols_n]
+    changes = directions[structural, np.newaxis] * tableau.table[1 + structural_rows, :-1][:, nonbasic]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        limits = -factors[nonbasic] / changes
+    deltas[structural, 0] = np.where(changes > sstab.eps, limits, -np.inf).max(axis=1, initial=-np.inf)
+    deltas[structural, 1] = np.where(changes < -sstab.eps, limits, np.inf).min(axis=1, initial=np.inf)
+    # factors slightly below 0 (the numerical noise) shouldn't exclude the current coefficient
+    return np.stack([np.minimum(deltas[:, 0], 0.0), np.maximum(deltas[:, 1], 0.0)], axis=1)
+
+
+def _feasible_steps(values: ArrayLike, directions: ArrayLike, upper_bounds: ArrayLike) -> ArrayLike:
+    """
+        returns the lowest and the highest step of every direction (column) keeping values + step * direction
+        within [0, upper bounds]
+    """
+    values, upper_bounds = values[:, np.newaxis], upper_bounds[:, np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        to_zero = -values / directions
+        to_upper = (upper_bounds - values) / directions
+    increasing, decreasing = directions > sstab.eps, directions < -sstab.eps
+    low = np.where(increasing, to_zero, np.where(decreasing, to_upper, -np.inf)).max(axis=0, initial=-np.inf)
+    high = np.where(increasing, to_upper, np.where(decreasing, to_zero, np.inf)).min(axis=0, initial=np.inf)
+    return np.stack([np.minimum(low, 0.0), np.maximum(high, 0.0)], axis=1)
@@ -4,8 +4,9 @@ from numpy.typing import ArrayLike
 import numpy as np
 import math
 from . import model as ssmod
+from . import pricing as sspri
 
-eps = 0.000000001
+eps = sspri.eps
 
 class Tableau:
     """
@@ -17,11 +18,19 @@ class Tableau:
             model corresponding to the tableau
         table : numpy.Array
             2d-array with the tableau
+        upper_bounds : numpy.Array
+            upper bounds of the variables (columns), `inf` if the variable is not bounded from above
+        flipped : numpy.Array
+            whether the column represents the complement `upper bound - variable` instead of the variable
+        basis : numpy.Array
+            indexes of the basic variables, basis[i] is the variable of the (i+1)-th row (the first row is the cost row)
+            -1 marks a row without a basic variable
 
         Methods
         -------
-        __init__(model: Model, table: array) -> Tableau:
+        __init__(model: Model, table: array, upper_bounds: array | None, flipped: array | None, basis: array | None) -> Tableau:
             constructs a new tableau for the specified model and initial table
+            by default variables have no upper bounds, no column is flipped and the basis is made of the unit columns
         objective_factors() -> numpy.Array:
             returns a vector containing factors in the cost row
         objective_value() -> float:
@@ -32,21 +41,45 @@ class Tableau:
             finds index of the variable, that should enter the basis next
         is_unbounded(col: int) -> bool:
             checks whether the problem is unbounded
-        choose_leaving_variable(col: int) -> int:
-            finds index of the variable, that should leave the basis next
-        pivot(col: int, row: int):
-            updates tableau using pivot operation with given entering and leaving variables
+        choose_leaving_variable(col: int, pricing: PricingRule | None) -> int | None:
+            finds index of the variable, that should leave the basis next, the pricing rule breaks the ties
+            returns None if the entering variable reaches its own upper bound first
+        flip(col: int):
+            substitutes the variable with its complement (upper bound - variable)
+        choose_dual_leaving_variable() -> int | None:
+            finds index of the row, whose basic variable violates its bounds the most, None if there is no such row
+        choose_dual_entering_variable(row: int) -> int | None:
+            finds index of the variable, that should enter the basis in the dual simplex, None if the problem is infeasible
+        with_constraint(model: Model, coefficients: array, bound: float) -> Tableau:
+            returns a new tableau extended with constraint "coefficients * x + slack = bound", the slack becomes basic
+        pivot(row: int, col: int):
+            updates tableau in place using pivot operation with given leaving and entering variables
         extract_assignment() -> List[float]:
             returns assignment corresponding to the tableau
         extract_basis() -> List[int]
             returns list of indexes corresponding to the variables belonging to the basis
+        remove_rows(rows: List[int]):
+            removes the given constraint rows together with their basic variables
+        remove_columns(cols: List[int]):
+            removes the given non-basic columns, renumbering the basis
+        copy() -> Tableau:
+            returns a copy of the tableau arrays sharing the same model
     """
     model: ssmod.Model
     table: ArrayLike
+    upper_bounds: ArrayLike
+    flipped: ArrayLike
+    basis: ArrayLike
 
-    def __init__(self, model: ssmod.Model, table: ArrayLike):
+    def __init__(self, model: ssmod.Model, table: ArrayLike, upper_bounds: ArrayLike = None, flipped: ArrayLike = None,
+                 basis: ArrayLike = None):
         self.model = model
-        self.table = table
+        self.table = np.asarray(table, dtype=float)
+        cols_n = self.table.shape[1] - 1
+        self.upper_bounds = np.full(cols_n, np.inf) if upper_bounds is None else np.array(upper_bounds, dtype=float)
+        self.flipped = np.zeros(cols_n, dtype=bool) if flipped is None else np.array(flipped, dtype=bool)
+        self.basis = self._find_basis() if basis is None else np.array(basis, dtype=int)
+        self._buffer = None
 
     def objective_factors(self) -> ArrayLike:
         return self.table[0,:-1] 
@@ -61,59 +94,159 @@ class Tableau:
         return self.objective_factors().argmin()
 
     def is_unbounded(self, col: int) -> bool:
-        return self.table[1:, col].max() <= 0 
+        return np.isinf(self.upper_bounds[col]) and np.isinf(self._leaving_quotients(col)).all()
 
-    def choose_leaving_variable(self, col: int) -> int:
-        column = np.copy(self.table[1:, col])
-        column = np.where(column > 0, column, -1)
-        indicators = self.table[1:, -1] / column
-        quotients = np.where(column > 0, indicators, np.inf)
-        index = len(quotients) - np.argmin(quotients[::-1])
+    def choose_leaving_variable(self, col: int, pricing: sspri.PricingRule = None) -> int | None:
+        quotients = self._leaving_quotients(col)
+        if len(quotients) == 0:
+            return None
+        pricing = sspri.DantzigRule() if pricing is None else pricing
+        index = pricing.choose_leaving_row(quotients, self.basis) + 1
 
+        if self.upper_bounds[col] < quotients[index - 1]:
+            return None
         return index
 
-    def pivot(self, row: int, col: int):
+    def _leaving_quotients(self, col: int) -> ArrayLike:
+        """
+            _leaving_quotients(col: int) -> numpy.Array:
+                returns how much the entering variable can grow before each basic variable hits its bound
+                basic variables decreasing to 0 correspond to positive factors in the column,
+                the ones growing to their upper bounds correspond to the negative factors
+        """
+        column = self.table[1:, col]
+        values = self.table[1:, -1]
+        quotients = np.full(len(column), np.inf)
+
+        decreasing = column > eps
+        quotients[decreasing] = values[decreasing] / column[decreasing]
+
+        if np.isfinite(self.upper_bounds).any():
+            basic_upper_bounds = self._basic_upper_bounds()
+            increasing = (column < -eps) & np.isfinite(basic_upper_bounds)
+            quotients[increasing] = (basic_upper_bounds[increasing] - values[increasing]) / -column[increasing]
+
+        return quotients
+
+    def _basic_upper_bounds(self) -> ArrayLike:
+        basic_upper_bounds = np.full(len(self.basis), np.inf)
+        in_basis = self.basis >= 0
+        basic_upper_bounds[in_basis] = self.upper_bounds[self.basis[in_basis]]
+        return basic_upper_bounds
+
+    def flip(self, col: int):
+        self.table[:, -1] -= self.upper_bounds[col] * self.table[:, col]
+        self.table[:, col] *= -1
+        self.flipped[col] = not self.flipped[col]
+
+        # a basic variable keeps a unit column, so its row has to be negated as well
+        self.table[np.flatnonzero(self.basis == col) + 1] *= -1
+
+    def choose_dual_leaving_variable(self) -> int | None:
+        values = self.table[1:, -1]
+        violations = -values
+
+        if np.isfinite(self.upper_bounds).any():
+            violations = np.maximum(violations, values - self._basic_upper_bounds())
+
+        if len(violations) == 0 or violations.max() <= eps:
+            return None
+        return violations.argmax() + 1
+
+    def choose_dual_entering_variable(self, row: int) -> int | None:
+        factors = self.table[row, :-1]
+        candidates = factors < -eps
+        if not candidates.any():
+            return None
+
+        quotients = np.full(len(factors), np.inf)
+        quotients[candidates] = self.objective_factors()[candidates] / -factors[candidates]
+        return quotients.argmin()
+
+    def with_constraint(self, model: ssmod.Model, coefficients: ArrayLike, bound: float) -> Tableau:
         rows_n, cols_n = self.table.shape
-        pivot_factor = self.table[row, col]
+        table = np.zeros((rows_n + 1, cols_n + 1))
+        table[:rows_n, :cols_n - 1] = self.table[:, :-1]
+        table[:rows_n, -1] = self.table[:, -1]
+
+        new_row = np.concatenate([coefficients, [1.0, bound]])
+        # the new row has to be expressed in terms of the current basis
+        in_basis = self.basis >= 0
+        new_row -= new_row[self.basis[in_basis]] @ table[1:rows_n][in_basis]
+        table[-1] = new_row
+
+        upper_bounds = np.append(self.upper_bounds, np.inf)
+        flipped = np.append(self.flipped, False)
+        basis = np.append(self.basis, cols_n - 1)
+        return Tableau(model, table, upper_bounds, flipped, basis)
 
-        new_table = self.table.copy()
-        new_table[row] = self.table[row] / pivot_factor
+    def pivot(self, row: int, col: int):
+        pivot_row = self.table[row]
+        pivot_row /= pivot_row[col]
+
+        # the elimination is a single rank-1 update: table -= column * pivot_row
+        # the pivot row itself is skipped by zeroing its factor in the column
+        column = self.table[:, col].copy()
+        column[row] = 0.0
+        workspace = self._workspace()
+        np.multiply(column[:, np.newaxis], pivot_row, out=workspace)
+        self.table -= workspace
 
-        new_table[:, col] = 0.0
-        new_table[row, col] = 1.0
-        
-        for r in range(rows_n):
-            if r == row:
-                continue
-            for c in range(cols_n):
-                if c == col:
-                    continue 
-                new_table[r,c] = (-self.table[r, col]) * new_table[row, c] + self.table[r,c]
+        self.table[:, col] = 0.0
+        self.table[row, col] = 1.0
+        self.basis[row - 1] = col
 
-        self.table = new_table
+    def _workspace(self) -> ArrayLike:
+        if self._buffer is None or self._buffer.shape != self.table.shape:
+            self._buffer = np.empty_like(self.table)
+        return self._buffer
 
     def extract_assignment(self) -> List[float]:
-        rows_n, cols_n = self.table.shape
-        assignment = [0.0 for _ in range(cols_n - 1)]
-        basis = self.extract_basis()
-        for r in range(1, rows_n):
-            var_index = basis[r - 1]
-            assignment[var_index] = self.table[r, -1]
-        
-        return assignment
+        assignment = np.zeros(self.table.shape[1] - 1)
+        in_basis = self.basis >= 0
+        assignment[self.basis[in_basis]] = self.table[1:, -1][in_basis]
+
+        assignment[self.flipped] = self.upper_bounds[self.flipped] - assignment[self.flipped]
+        return assignment.tolist()
     
     def extract_basis(self) -> List[int]:
+        return self.basis.tolist()
+
+    def remove_rows(self, rows: List[int]):
+        self.table = np.delete(self.table, rows, 0)
+        # [row-1] because the cost row has no basic variable
+        self.basis = np.delete(self.basis, [row - 1 for row in rows])
+
+    def remove_columns(self, cols: List[int]):
+        kept = np.ones(len(self.upper_bounds), dtype=bool)
+        kept[cols] = False
+        new_indexes = np.cumsum(kept) - 1
+
+        self.table = np.delete(self.table, cols, 1)
+        self.upper_bounds = self.upper_bounds[kept]
+        self.flipped = self.flipped[kept]
+        self.basis = np.where(self.basis >= 0, new_indexes[self.basis], -1)
+
+    def copy(self) -> Tableau:
+        return Tableau(self.model, self.table.copy(), self.upper_bounds, self.flipped, self.basis)
+
+    def _find_basis(self) -> ArrayLike:
+        """
+            _find_basis() -> numpy.Array:
+                finds the basis by looking for the unit columns, used only when the basis is not known upfront
+        """
         rows_n, cols_n = self.table.shape
-        basis = [-1 for _ in range(rows_n -1)]
+        basis = np.full(rows_n - 1, -1)
         for c in range(cols_n - 1):
             column = self.table[:,c]
             belongs_to_basis = math.isclose(column.min(), 0.0, abs_tol = eps) \
                            and math.isclose(column.max(), 1.0, abs_tol = eps) \
                            and math.isclose(column.sum(), 1.0, abs_tol = eps)
             if belongs_to_basis:
-                row = np.where(column == 1.0)[0][0]
+                row = column.argmax()
                 # [row-1] because we ignore the cost variable in the basis
-                basis[row-1] = c
+                if row > 0 and basis[row-1] == -1:
+                    basis[row-1] = c
         return basis
 
     def __str__(self) -> str:
@@ -121,11 +254,10 @@ class Tableau:
             return '{0: >{1}}'.format(x, w)
 
         cost_name = self.model.objective.name()
-        basis = self.extract_basis()
         header = ["basis", cost_name] + [var.name for var in self.model.variables] + ["b"]
         longest_col = max([len(h) for h in header])
 
-        rows = [[cost_name]] + [[self.model.variables[i].name] for i in basis]
+        rows = [[cost_name]] + [[self.model.variables[i].name if i >= 0 else "-"] for i in self.basis]
 
         for (i,r) in enumerate(rows):
             cost_factor = 0.0 if i > 0 else 1.0
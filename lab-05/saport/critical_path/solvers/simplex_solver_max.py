@@ -1,7 +1,7 @@
 from ..model import Project
 from ..project_network import ProjectNetwork
 from ...simplex.model import Model
-from ...simplex.expressions.expression import Expression
+from ...simplex.expressions.expression import Expression, quicksum
 from ..solution import BasicSolution
 
 
@@ -79,28 +79,27 @@ class Solver:
         max_model = []
         variables = {}
         for i in self.project_network.edges():
-            variables[(i[0], i[1])] = model.create_variable(f"x{i[0]}{i[1]}")
-            model.add_constraint(variables[(i[0], i[1])] <= 1)
+            variables[(i[0], i[1])] = model.create_variable(f"x{i[0]}{i[1]}", upper=1)
             max_model.append(self.project_network.arc_duration(i[0], i[1]) * variables[(i[0], i[1])])
 
         sum_start = []
         for i in self.project_network.successors(self.project_network.start_node):
             sum_start.append(variables[(self.project_network.start_node, i)])
-        model.add_constraint(sum(sum_start) == 1)
+        model.add_constraint(quicksum(sum_start) == 1)
         sum_goal = []
         for i in self.project_network.predecessors(self.project_network.goal_node):
             sum_goal.append(variables[(i, self.project_network.goal_node)])
-        model.add_constraint(sum(sum_goal) == 1)
+        model.add_constraint(quicksum(sum_goal) == 1)
         for i in self.project_network.normal_nodes():
             suma = []
             for j in self.project_network.successors(i):
                 suma.append(-variables[(i, j)])
             for j in self.project_network.predecessors(i):
                 suma.append(variables[(j, i)])
-            model.add_constraint(sum(suma) == 0)
+            model.add_constraint(quicksum(suma) == 0)
             # suma.clear()
 
-        model.maximize(sum(max_model))
+        model.maximize(quicksum(max_model))
 
         return model
 
@@ -0,0 +1,3 @@
+from .expressions.expression import quicksum
+from .parallel import solve_many
+from .limits import CancellationToken
@@ -1,20 +1,24 @@
 from __future__ import annotations
-from copy import deepcopy
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
-from itertools import groupby
-from functools import reduce
+import math
 import saport.simplex.expressions.constraint as ssecon
 import saport.simplex.model as ssmod
 
 class Expression:
     """
         A class to represent a linear polynomial in the linear programming, i.e. a sum of atom (e.g. 4x + 5y - 0.4z)
+        The polynomial is kept as a mapping from the variable indices to their coefficients,
+        so repeated variables are always reduced and single coefficients are read or updated in O(1).
 
         Attributes
         ----------
+        factors : Dict[int, float]
+            coefficients of the polynomial keyed by the variable indices
+        variables : Dict[int, Variable]
+            variables of the polynomial keyed by their indices
         atoms : list[Atom]
-            list of the atoms in the polynomial
+            list of the atoms in the polynomial, created on demand from the factors
 
         Methods
         -------
@@ -25,17 +29,30 @@ class Expression:
         evaluate(assignment: List[float]) -> float:
             returns value of the expression for the given assignment
             assignment is just a list of values with order corresponding to the variables in the model
-        simplified() -> Expression:
-            returns a new expression with sorted and atoms and reduced coefficients 
+        simplify():
+            sorts the atoms by the variable indices, the coefficients are always reduced
         coefficients(model: Model) -> list[float]:
             return list of coefficients corresponding to the variables in the model
+        get_coefficient(var: Variable) -> float:
+            gets a coefficient for the given variable
+        set_coefficient(var: Variable, coeff: float):
+            overrides coefficient for the given variable 
+            if there is no such variable in the expression, it's get added with the given coefficient
+            setting coeff to 0.0 removes variable from the expression
         is_equivalent(other: Expression, model: Model) -> bool:
             returns true if other expression is equivalent given the specific model
         __add__(other: Expression) -> Expression:
             returns sum of the two polynomials
+        __iadd__(other: Expression) -> Expression:
+            adds the other polynomial in place, in time proportional to its size (not the size of the sum)
+            every alias of the expression (e.g. in the constraints built from it) observes the change
+        __radd__(other: 0) -> Expression:
+            allows the builtin `sum` starting at 0, prefer `quicksum` which runs in linear time
         __sub__(other: Expression) -> Expression:
             returns sum of the two polynomials, inverting the first atom in the second polynomial
             useful for expressions like 3*x - 4y, otherwise one would have to write 3*x + -4*y 
+        __isub__(other: Expression) -> Expression:
+            subtracts the other polynomial in place
         __mul__(coefficient: float) -> Expression:
             return a new polynomial with all coefficients multiplied by the given number
         __eq__(bound: float) -> Constraint:
@@ -45,57 +62,98 @@ class Expression:
         __ge__(bound: float) -> Constraint:
             returns a new "greater than or equal" constraint
     """
-    atoms: List[Atom]
+    factors: Dict[int, float]
+    variables: Dict[int, Variable]
 
     def __init__(self, *atoms: Atom):
-        self.atoms = atoms 
+        self.factors = dict()
+        self.variables = dict()
+        for a in atoms:
+            index = a.var.index
+            self.factors[index] = self.factors.get(index, 0.0) + a.coefficient
+            self.variables[index] = a.var
 
     @classmethod
     def from_vectors(self, variables: Iterable[Variable], coefficients: Iterable[float]) -> Expression:
         assert len(variables) == len(coefficients), f"number of coefficients should correspond to variables in the expression"
-        atoms = [Atom(v,f) for (v,f) in zip(variables, coefficients)]
+        atoms = [Atom(v,f) for (v,f) in zip(variables, coefficients) if f != 0]
         return Expression(*atoms)
 
+    @classmethod
+    def _from_factors(cls, factors: Dict[int, float], variables: Dict[int, Variable]) -> Expression:
+        expression = Expression()
+        expression.factors = factors
+        expression.variables = variables
+        return expression
+
+    @property
+    def atoms(self) -> List[Atom]:
+        return [Atom(self.variables[i], c) for (i, c) in self.factors.items()]
+
     def evaluate(self, assignment: List[float]) -> float:
-        adder = lambda val, a: val + a.evaluate_with_value(assignment[a.var.index])
-        return reduce(adder, self.atoms, 0) 
+        return sum(c * assignment[i] for (i, c) in self.factors.items())
 
     def simplify(self):
-        projection = lambda a: a.var.index
-        reduce_atoms = lambda a1, a2: Atom(a1.var, a1.coefficient + a2.coefficient)
-        reduce_group = lambda g: reduce(reduce_atoms, g[1:], g[0])
-    
-        sorted_atoms = sorted(self.atoms, key=projection)
-        grouped_atoms = [list(g[1]) for g in groupby(sorted_atoms, key=projection)]
- 
-        self.atoms = [reduce_group(g) for g in grouped_atoms]
-        
+        self.factors = dict(sorted(self.factors.items()))
+            
     def coefficients(self, model: ssmod.Model) -> List[float]:
-        simplified_expression = deepcopy(self)
-        simplified_expression.simplify()
         coefficients = [0.0 for _ in model.variables]
-        for a in simplified_expression.atoms:
-            if a.var.index < len(coefficients):
-                coefficients[a.var.index] = a.coefficient
+        for (i, c) in self.factors.items():
+            if i < len(coefficients):
+                coefficients[i] = c
         return coefficients
 
+    def get_coefficient(self, var: Variable) -> float:
+        return self.factors.get(var.index, 0.0)
+
+    def set_coefficient(self, var: Variable, coeff: float):
+        if coeff == 0.0:
+            self.factors.pop(var.index, None)
+            self.variables.pop(var.index, None)
+            return
+
+        self.factors[var.index] = float(coeff)
+        self.variables[var.index] = var
+
     def is_equivalent(self, other: Expression, model: ssmod.model) -> bool:
         return self.coefficients(model) == other.coefficients(model)
 
     def __add__(self, other: Expression) -> Expression:
-        new_atoms = list(self.atoms)
-        new_atoms += other.atoms;
-        return Expression(*new_atoms)
+        factors = dict(self.factors)
+        for (i, c) in other.factors.items():
+            factors[i] = factors.get(i, 0.0) + c
+        return Expression._from_factors(factors, {**self.variables, **other.variables})
+
+    def __iadd__(self, other: Expression) -> Expression:
+        if isinstance(other, Atom):
+            # the most common case, skips creating the factors of the atom
+            index = other.var.index
+            self.factors[index] = self.factors.get(index, 0.0) + other.coefficient
+            self.variables[index] = other.var
+            return self
+
+        for (i, c) in other.factors.items():
+            self.factors[i] = self.factors.get(i, 0.0) + c
+        self.variables.update(other.variables)
+        return self
+
+    def __radd__(self, other: float) -> Expression:
+        if isinstance(other, (int, float)) and other == 0:
+            return self * 1
+        return NotImplemented
 
     def __sub__(self, other: Expression) -> Expression:
         return self.__add__(other * -1)
 
+    def __isub__(self, other: Expression) -> Expression:
+        return self.__iadd__(other * -1)
+
     def __neg__(self) -> Expression:
         return self.__mul__(-1)
 
     def __mul__(self, factor: float) -> Expression:
-        new_atoms = [a * factor for a in self.atoms]
-        return Expression(*new_atoms)
+        factors = {i: c * factor for (i, c) in self.factors.items()}
+        return Expression._from_factors(factors, dict(self.variables))
 
     __rmul__ = __mul__
 
@@ -109,9 +167,12 @@ class Expression:
         return ssecon.Constraint(self, bound, ssecon.ConstraintType.LE)
 
     def __str__(self) -> str:
-        text = str(self.atoms[0])
+        atoms = self.atoms
+        if len(atoms) == 0:
+            return "0"
+        text = str(atoms[0])
         
-        for atom in self.atoms[1:]:
+        for atom in atoms[1:]:
             text += ' + ' if atom.coefficient >= 0 else ' - '
             coefficient = "" if abs(atom.coefficient) == 1.0 else f"{abs(atom.coefficient)}*"
             text += f'{coefficient}{atom.var.name}'
@@ -121,6 +182,8 @@ class Atom(Expression):
     """
         A class to represent an atom of the linear programming expression, i.e. variable and it's factor (e.g. 4x, -5.3x, etc.)
         It derives from the Expression class and can be intepreted as a expression containing only single atom, itself
+        Its factors are created on demand, so atoms (and variables) stay lightweight and immutable,
+        constraints and objectives built from an atom get their own expression
 
         Attributes
         ----------
@@ -137,6 +200,8 @@ class Atom(Expression):
             returns value of the atom for the given assignment
         __mul__(factor: float) -> Atom:
             return new atom with a multiplied coefficient
+        __iadd__(other: Expression) -> Expression:
+            returns a new expression, atoms (and variables) are never modified in place
     """
     var: Variable
     coefficient: float
@@ -144,7 +209,17 @@ class Atom(Expression):
     def __init__(self, var: Variable, coefficient: float):
         self.var = var 
         self.coefficient = float(coefficient)
-        super().__init__(self)
+
+    @property
+    def factors(self) -> Dict[int, float]:
+        return {self.var.index: self.coefficient}
+
+    @property
+    def variables(self) -> Dict[int, Variable]:
+        return {self.var.index: self.var}
+
+    def simplify(self):
+        pass
 
     def evaluate_with_value(self, assigned_value: float) -> float:
         return self.coefficient * assigned_value
@@ -157,6 +232,12 @@ class Atom(Expression):
 
     __rmul__ = __mul__
 
+    def __iadd__(self, other: Expression) -> Expression:
+        return self + other
+
+    def __isub__(self, other: Expression) -> Expression:
+        return self - other
+
     def __str__(self):
         if (float(self.coefficient) == 1.0):
             return str(self.var) 
@@ -176,24 +257,33 @@ class Variable(Atom):
             name of the variable
         index : int
             index of the variable used in the model
-        type : VariableType
-            type of the variable
+        lower : float
+            lower bound of the variable (0 by default)
+        upper : float
+            upper bound of the variable (`inf` by default)
 
         Methods
         -------
-        __init__(name: str, index: int) -> Variable:
-            constructs new variable with a specified name and index
+        __init__(name: str, index: int, lower: float = 0.0, upper: float = inf) -> Variable:
+            constructs new variable with a specified name, index and bounds
     """
     name: str
     index: int 
+    lower: float
+    upper: float
 
-    def __init__(self, name: str, index: int):
+    def __init__(self, name: str, index: int, lower: float = 0.0, upper: float = math.inf):
         self.name = name
         self.index = index
+        self.lower = float(lower)
+        self.upper = float(upper)
         super().__init__(self, 1)
 
     def __str__(self) -> str:
         return self.name
+    
+    def __repr__(self) -> str:
+        return self.name
 
     def __key__(self) -> Tuple[str, int]:
         return (self.name, self.index)
@@ -204,4 +294,16 @@ class Variable(Atom):
     def __eq__(self, other: Variable) -> bool:
         if isinstance(other, Variable):
             return self.__key__() == other.__key__()
-        return NotImplemented
\ No newline at end of file
+        return NotImplemented
+
+
+def quicksum(expressions: Iterable[Expression]) -> Expression:
+    """
+        quicksum(expressions: Iterable[Expression]) -> Expression:
+            returns sum of the given expressions in time linear in the total number of their atoms
+            (the builtin `sum` copies the partial sum on every addition)
+    """
+    total = Expression()
+    for expression in expressions:
+        total += expression
+    return total
@@ -0,0 +1,345 @@
+from __future__ import annotations
+from typing import Iterator, List, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import saport.simplex.expressions.expression as sseexp
+import saport.simplex.expressions.constraint as ssecon
+import saport.simplex.model as ssmod
+from saport.simplex.exceptions import ShapeMismatchError
+
+
+class VariableArray:
+    """
+        A class to represent an n-dimensional array of the model variables.
+        It behaves like a numpy array of variables, but the linear algebra (A @ x, c @ x, x.sum(axis), C * x)
+        produces whole blocks of expressions from the coefficient arrays, without creating any atoms.
+
+        Attributes
+        ----------
+        model : Model
+            model owning the variables
+        indices : numpy.Array
+            indices of the variables in the model, the array has the shape of the variable array
+
+        Methods
+        -------
+        __init__(model: Model, indices: array) -> VariableArray:
+            constructs an array of the model variables with the given indices
+        shape, ndim, size, T, ravel(), reshape(shape), __getitem__, __iter__, __len__:
+            the same as in numpy, indexing a single element returns the Variable
+        sum(axis: int | None = None) -> ExpressionArray | Expression:
+            sums the variables along the given axis (all of them if axis is None)
+        __matmul__(other: array) -> ExpressionArray | Expression, __rmatmul__(other: array) -> ExpressionArray | Expression:
+            matrix product with the coefficient array, a 0-dimensional result is returned as an Expression
+        __mul__(other: array | float) -> ExpressionArray:
+            elementwise product with the (broadcasted) coefficients
+        __le__, __ge__, __eq__ (bounds: array | float) -> ConstraintArray:
+            constrains every variable of the array
+    """
+    model: ssmod.Model
+    indices: ArrayLike
+
+    # makes numpy operators (e.g. `A @ x` or `b >= x`) defer to the methods of this class
+    __array_ufunc__ = None
+
+    def __init__(self, model: ssmod.Model, indices: ArrayLike):
+        self.model = model
+        self.indices = np.asarray(indices, dtype=int)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.indices.shape
+
+    @property
+    def ndim(self) -> int:
+        return self.indices.ndim
+
+    @property
+    def size(self) -> int:
+        return self.indices.size
+
+    @property
+    def T(self) -> VariableArray:
+        return VariableArray(self.model, self.indices.T)
+
+    def ravel(self) -> VariableArray:
+        return VariableArray(self.model, self.indices.ravel())
+
+    def reshape(self, *shape) -> VariableArray:
+        return VariableArray(self.model, self.indices.reshape(*shape))
+
+    def tolist(self) -> List:
+        return [self[i] if self.ndim == 1 else self[i].tolist() for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator:
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, key) -> VariableArray | sseexp.Variable:
+        indices = self.indices[key]
+        if np.ndim(indices) == 0:
+            return self.model.variables[int(indices)]
+        return VariableArray(self.model, indices)
+
+    def expressions(self) -> ExpressionArray:
+        """ returns the array as a block of expressions, each one containing a single variable """
+        return ExpressionArray(self.model, self.shape, np.arange(self.size), self.indices.ravel(), np.ones(self.size))
+
+    def sum(self, axis: int | None = None) -> ExpressionArray | sseexp.Expression:
+        return self.expressions().sum(axis)
+
+    def __matmul__(self, other: ArrayLike) -> ExpressionArray | sseexp.Expression:
+        return self.expressions() @ other
+
+    def __rmatmul__(self, other: ArrayLike) -> ExpressionArray | sseexp.Expression:
+        return self.expressions().__rmatmul__(other)
+
+    def __mul__(self, other: ArrayLike) -> ExpressionArray:
+        return self.expressions() * other
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> ExpressionArray:
+        return -self.expressions()
+
+    def __add__(self, other: VariableArray | ExpressionArray) -> ExpressionArray:
+        return self.expressions() + other
+
+    __radd__ = __add__
+
+    def __sub__(self, other: VariableArray | ExpressionArray) -> ExpressionArray:
+        return self.expressions() - other
+
+    def __rsub__(self, other: VariableArray | ExpressionArray) -> ExpressionArray:
+        return (-self.expressions()) + other
+
+    def __le__(self, bounds: ArrayLike) -> ConstraintArray:
+        return self.expressions() <= bounds
+
+    def __ge__(self, bounds: ArrayLike) -> ConstraintArray:
+        return self.expressions() >= bounds
+
+    def __eq__(self, bounds: ArrayLike) -> ConstraintArray:
+        return self.expressions() == bounds
+
+    def __str__(self) -> str:
+        names = np.array([var.name for var in self.model.variables], dtype=object)
+        return str(names[self.indices] if self.size > 0 else self.indices)
+
+    __repr__ = __str__
+
+
+class ExpressionArray:
+    """
+        A class to represent an n-dimensional array of linear expressions, kept as the coordinate lists:
+        the expression with flat index rows[k] contains the variable cols[k] with the coefficient data[k]
+        (repeated coordinates are summed up)
+
+        Attributes
+        ----------
+        model : Model
+            model owning the variables
+        shape : Tuple[int, ...]
+            shape of the array
+        rows : numpy.Array
+            flat indices of the expressions
+        cols : numpy.Array
+            indices of the variables
+        data : numpy.Array
+            coefficients
+
+        Methods
+        -------
+        __init__(model: Model, shape: Tuple[int, ...], rows: array, cols: array, data: array) -> ExpressionArray:
+            constructs a new array of expressions from the coordinate lists
+        sum(axis: int | None = None) -> ExpressionArray | Expression:
+            sums the expressions along the given axis (all of them if axis is None)
+        expressions() -> List[Expression]:
+            returns the flattened array as a list of expressions
+        __matmul__, __rmatmul__, __mul__, __add__, __sub__, __neg__:
+            linear algebra with the coefficient arrays and other expression arrays, like in numpy
+        __le__, __ge__, __eq__ (bounds: array | float) -> ConstraintArray:
+            returns a block of constraints, bounds are broadcasted to the shape of the array
+    """
+    model: ssmod.Model
+    shape: Tuple[int, ...]
+    rows: ArrayLike
+    cols: ArrayLike
+    data: ArrayLike
+
+    __array_ufunc__ = None
+
+    def __init__(self, model: ssmod.Model, shape: Tuple[int, ...], rows: ArrayLike, cols: ArrayLike, data: ArrayLike):
+        self.model = model
+        self.shape = tuple(shape)
+        self.rows = np.asarray(rows, dtype=int)
+        self.cols = np.asarray(cols, dtype=int)
+        self.data = np.asarray(data, dtype=float)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=int))
+
+    def _reshaped(self, shape: Tuple[int, ...], rows: ArrayLike, cols: ArrayLike, data: ArrayLike) -> ExpressionArray | sseexp.Expression:
+        result = ExpressionArray(self.model, shape, rows, cols, data)
+        return result.expressions()[0] if len(shape) == 0 else result
+
+    def sum(self, axis: int | None = None) -> ExpressionArray | sseexp.Expression:
+        if axis is None:
+            return self._reshaped((), np.zeros(len(self.rows), dtype=int), self.cols, self.data)
+
+        axis = axis % self.ndim
+        position = list(np.unravel_index(self.rows, self.shape))
+        del position[axis]
+        shape = self.shape[:axis] + self.shape[axis + 1:]
+        rows = np.ravel_multi_index(position, shape) if len(shape) > 0 else np.zeros(len(self.rows), dtype=int)
+        return self._reshaped(shape, rows, self.cols, self.data)
+
+    def __matmul__(self, other: ArrayLike) -> ExpressionArray | sseexp.Expression:
+        """ self @ other, with the numpy rules: vectors are treated as a single row (left) or column (right) """
+        other = np.asarray(other, dtype=float)
+        inner_n = self.shape[-1]
+        matrix = other[:, np.newaxis] if other.ndim == 1 else other
+        if matrix.shape[0] != inner_n:
+            raise ShapeMismatchError("multiply", self.shape, other.shape)
+
+        # every coordinate (i, l) of the expressions contributes to the result (i, j) with the factor matrix[l, j]
+        position_row, position_inner = np.divmod(self.rows, inner_n)
+        factors = matrix[position_inner]
+        term, col = np.nonzero(factors)
+        rows = position_row[term] * matrix.shape[1] + col
+
+        # dropping the dimensions of size one keeps the flat indices
+        shape = self.shape[:-1] + other.shape[1:]
+        return self._reshaped(shape, rows, self.cols[term], self.data[term] * factors[term, col])
+
+    def __rmatmul__(self, other: ArrayLike) -> ExpressionArray | sseexp.Expression:
+        """ other @ self, the last axis of the coefficients is contracted with the first axis of the expressions """
+        other = np.asarray(other, dtype=float)
+        transposed = self.T if self.ndim == 2 else self
+        result = transposed @ other.T
+        return result.T if isinstance(result, ExpressionArray) and result.ndim == 2 else result
+
+    @property
+    def T(self) -> ExpressionArray:
+        if self.ndim < 2:
+            return self
+        position = np.unravel_index(self.rows, self.shape)
+        shape = self.shape[::-1]
+        return ExpressionArray(self.model, shape, np.ravel_multi_index(position[::-1], shape), self.cols, self.data)
+
+    def __mul__(self, other: ArrayLike) -> ExpressionArray:
+        factors = _broadcast(other, self.shape, "multiply")
+        return ExpressionArray(self.model, self.shape, self.rows, self.cols, self.data * factors[self.rows])
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> ExpressionArray:
+        return self * -1.0
+
+    def __add__(self, other: ExpressionArray | VariableArray) -> ExpressionArray:
+        other = other.expressions() if isinstance(other, VariableArray) else other
+        if not isinstance(other, ExpressionArray):
+            return NotImplemented
+        if self.shape != other.shape:
+            raise ShapeMismatchError("add", self.shape, other.shape)
+        return ExpressionArray(self.model, self.shape,
+                               np.concatenate([self.rows, other.rows]),
+                               np.concatenate([self.cols, other.cols]),
+                               np.concatenate([self.data, other.data]))
+
+    __radd__ = __add__
+
+    def __sub__(self, other: ExpressionArray | VariableArray) -> ExpressionArray:
+        return self + (-other)
+
+    def __rsub__(self, other: ExpressionArray | VariableArray) -> ExpressionArray:
+        return (-self) + other
+
+    def expressions(self) -> List[sseexp.Expression]:
+        size = self.size
+        variables_n = len(self.model.variables)
+        # coordinates sorted by the expression and the variable, the repeated ones are summed up
+        keys, inverse = np.unique(self.rows * variables_n + self.cols, return_inverse=True)
+        data = np.bincount(inverse.ravel(), weights=self.data, minlength=len(keys))
+        nonzero = data != 0.0
+        rows, cols = np.divmod(keys[nonzero], variables_n)
+        data = data[nonzero]
+        bounds = np.searchsorted(rows, np.arange(size + 1))
+
+        cols, data = cols.tolist(), data.tolist()
+        variables = self.model.variables
+        expressions = []
+        for i in range(size):
+            factors = dict(zip(cols[bounds[i]:bounds[i + 1]], data[bounds[i]:bounds[i + 1]]))
+            expressions.append(sseexp.Expression._from_factors(factors, {c: variables[c] for c in factors}))
+        return expressions
+
+    def _constraints(self, bounds: ArrayLike, type: ssecon.ConstraintType) -> ConstraintArray:
+        bounds = _broadcast(bounds, self.shape, "constrain")
+        return ConstraintArray(self, bounds, type)
+
+    def __le__(self, bounds: ArrayLike) -> ConstraintArray:
+        return self._constraints(bounds, ssecon.ConstraintType.LE)
+
+    def __ge__(self, bounds: ArrayLike) -> ConstraintArray:
+        return self._constraints(bounds, ssecon.ConstraintType.GE)
+
+    def __eq__(self, bounds: ArrayLike) -> ConstraintArray:
+        return self._constraints(bounds, ssecon.ConstraintType.EQ)
+
+    def __str__(self) -> str:
+        return '\n'.join([str(e) for e in self.expressions()])
+
+
+class ConstraintArray:
+    """
+        A class to represent a block of constraints of the same type, e.g. A @ x <= b
+
+        Attributes
+        ----------
+        expressions : ExpressionArray
+            constrained expressions
+        bounds : numpy.Array
+            bounds of the flattened expressions
+        type : ConstraintType
+            type of all the constraints
+
+        Methods
+        -------
+        __init__(expressions: ExpressionArray, bounds: array, type: ConstraintType) -> ConstraintArray:
+            constructs a new block of constraints
+        constraints() -> List[Constraint]:
+            returns the block as a list of separate constraints
+    """
+    expressions: ExpressionArray
+    bounds: ArrayLike
+    type: ssecon.ConstraintType
+
+    def __init__(self, expressions: ExpressionArray, bounds: ArrayLike, type: ssecon.ConstraintType):
+        self.expressions = expressions
+        self.bounds = bounds
+        self.type = type
+
+    def constraints(self) -> List[ssecon.Constraint]:
+        return [ssecon.Constraint(expression, bound, self.type)
+                for (expression, bound) in zip(self.expressions.expressions(), self.bounds.tolist())]
+
+    def __str__(self) -> str:
+        return '\n'.join([str(c) for c in self.constraints()])
+
+
+def _broadcast(values: ArrayLike, shape: Tuple[int, ...], operation: str) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    try:
+        return np.broadcast_to(values, shape).ravel()
+    except ValueError:
+        raise ShapeMismatchError(operation, shape, values.shape) from None
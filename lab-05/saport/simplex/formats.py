@@ -0,0 +1,564 @@
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterator, List, TextIO, Tuple
+import math
+import re
+
+import numpy as np
+
+import saport.simplex.model as ssmod
+import saport.simplex.expressions.constraint as ssecon
+import saport.simplex.expressions.objective as sseobj
+from saport.simplex.exceptions import ModelFormatError
+
+# number of terms written in a single line of the lp files
+lp_terms_per_line = 8
+# bounds at least this large are infinite, as in the other solvers reading these formats
+infinity = 1e30
+
+_lp_sections = {
+    "maximize": "max", "maximum": "max", "max": "max",
+    "minimize": "min", "minimum": "min", "min": "min",
+    "subject to": "st", "such that": "st", "st": "st", "s.t.": "st",
+    "bounds": "bounds", "bound": "bounds",
+    "general": "general", "generals": "general", "gen": "general", "integer": "general", "integers": "general",
+    "binary": "binary", "binaries": "binary", "bin": "binary",
+    "end": "end"
+}
+_lp_section = re.compile(r"\s*(subject\s+to|such\s+that|s\.t\.|\w*)\s*(.*)$", re.IGNORECASE)
+_lp_token = re.compile(r"\s*(?:(<=|>=|=<|=>|<|>|=)|([+-])|(:)|((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|([^\s:+\-<>=]+))")
+_lp_senses = {"<=": ssecon.ConstraintType.LE, "=<": ssecon.ConstraintType.LE, "<": ssecon.ConstraintType.LE,
+              ">=": ssecon.ConstraintType.GE, "=>": ssecon.ConstraintType.GE, ">": ssecon.ConstraintType.GE,
+              "=": ssecon.ConstraintType.EQ}
+_mps_senses = {"L": ssecon.ConstraintType.LE, "E": ssecon.ConstraintType.EQ, "G": ssecon.ConstraintType.GE}
+
+
+class ModelBuilder:
+    """
+        A class to represent a model being read from a file, kept in the compiled form:
+        the nonzero coefficients of the constraints are appended to flat arrays (without any expression objects),
+        so the memory used grows with the number of the nonzeros, not with the size of the matrix.
+
+        Attributes
+        ----------
+        name : str
+            name of the model
+        names : List[str]
+            names of the variables, in the order of their first appearance
+        columns : Dict[str, int]
+            index of every variable keyed by its name
+        rows : Dict[str, int]
+            index of every constraint keyed by its name
+        objective_type : ObjectiveType | None
+            type of the objective, None if the file has no objective
+
+        Methods
+        -------
+        __init__(name: str) -> ModelBuilder:
+            constructs an empty builder
+        column(name: str) -> int:
+            returns index of the variable, adding the variable bounded by [0, inf) if it's new
+        row(name: str, sense: ConstraintType) -> int:
+            adds a new constraint with bound 0, returns its index
+        add(row: int, column: int, value: float):
+            adds the coefficient to the constraint, repeated coefficients are summed
+        add_cost(column: int, value: float):
+            adds the coefficient to the objective
+        set_bound(row: int, value: float):
+            sets the bound of the constraint
+        set_range(row: int, value: float):
+            turns the constraint into a range [bound - |value|, bound] (<=), [bound, bound + |value|] (>=)
+            or [bound, bound + value] (= with the sign deciding the direction)
+        set_lower(column: int, value: float), set_upper(column: int, value: float):
+            set the bounds of the variable
+        build() -> Model:
+            returns the model, the ranges become pairs of constraints
+    """
+    name: str
+    names: List[str]
+    columns: Dict[str, int]
+    rows: Dict[str, int]
+    objective_type: sseobj.ObjectiveType
+
+    def __init__(self, name: str):
+        self.name = name
+        self.names = []
+        self.columns = dict()
+        self.rows = dict()
+        self.objective_type = None
+        self._lower = array("d")
+        self._upper = array("d")
+        self._costs = array("d")
+        self._senses = array("b")
+        self._bounds = array("d")
+        self._ranges: Dict[int, float] = dict()
+        self._row_indices = array("l")
+        self._column_indices = array("l")
+        self._data = array("d")
+
+    def column(self, name: str) -> int:
+        index = self.columns.get(name)
+        if index is None:
+            index = self.columns[name] = len(self.names)
+            self.names.append(name)
+            self._lower.append(0.0)
+            self._upper.append(math.inf)
+            self._costs.append(0.0)
+        return index
+
+    def row(self, name: str, sense: ssecon.ConstraintType) -> int:
+        index = self.rows[name] = len(self._senses)
+        self._senses.append(sense.value)
+        self._bounds.append(0.0)
+        return index
+
+    def add(self, row: int, column: int, value: float):
+        self._row_indices.append(row)
+        self._column_indices.append(column)
+        self._data.append(value)
+
+    def add_cost(self, column: int, value: float):
+        self._costs[column] += value
+
+    def set_bound(self, row: int, value: float):
+        self._bounds[row] = value
+
+    def set_range(self, row: int, value: float):
+        self._ranges[row] = value
+
+    def set_lower(self, column: int, value: float):
+        self._lower[column] = value
+
+    def set_upper(self, column: int, value: float):
+        self._upper[column] = value
+
+    def build(self) -> ssmod.Model:
+        rows = np.frombuffer(self._row_indices, dtype=self._row_indices.typecode) if len(self._data) else np.empty(0, int)
+        cols = np.frombuffer(self._column_indices, dtype=self._column_indices.typecode) if len(self._data) else np.empty(0, int)
+        data = np.frombuffer(self._data) if len(self._data) else np.empty(0)
+        senses, bounds = np.array(self._senses, dtype=int), np.array(self._bounds)
+        rows, cols, data, senses, bounds = self._split_ranges(rows, cols, data, senses, bounds)
+
+        # sorting by the rows (and the columns within them) puts the repeated coefficients next to each other
+        order = np.lexsort((cols, rows))
+        rows, cols, data = rows[order], cols[order], data[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        starts = np.flatnonzero(first)
+        rows, cols, data = rows[starts], cols[starts], np.add.reduceat(data, starts) if len(starts) else data
+        nonzero = data != 0
+        rows, cols, data = rows[nonzero], cols[nonzero], data[nonzero]
+
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(senses)))])
+        return ssmod.Model._from_rows(self.name, self.names, np.array(self._lower), np.array(self._upper),
+                                      indptr, cols, data, senses, bounds, np.array(self._costs), self.objective_type)
+
+    def _split_ranges(self, rows, cols, data, senses, bounds):
+        if not self._ranges:
+            return rows, cols, data, senses, bounds
+        ranged = np.array(list(self._ranges.keys()))
+        values = np.array(list(self._ranges.values()))
+        types = senses[ranged]
+        # the ranged row keeps the bound on one side, its copy gets the other one
+        low_side = (types == ssecon.ConstraintType.GE.value) | ((types == ssecon.ConstraintType.EQ.value) & (values > 0))
+        other_bounds = np.where(low_side, bounds[ranged] + np.abs(values), bounds[ranged] - np.abs(values))
+        senses[ranged] = np.where(low_side, ssecon.ConstraintType.GE.value, ssecon.ConstraintType.LE.value)
+
+        copies = np.full(len(senses), -1)
+        copies[ranged] = len(senses) + np.arange(len(ranged))
+        copied = copies[rows] >= 0
+        rows = np.concatenate([rows, copies[rows[copied]]])
+        cols = np.concatenate([cols, cols[copied]])
+        data = np.concatenate([data, data[copied]])
+        senses = np.concatenate([senses, -senses[ranged]])
+        bounds = np.concatenate([bounds, other_bounds])
+        return rows, cols, data, senses, bounds
+
+
+def read_mps(path: str) -> ssmod.Model:
+    """
+        Reads the model from the (fixed or free) MPS file, line by line.
+        The integrality markers are ignored (the linear relaxation is read), the ranges become pairs of constraints.
+        Names can't contain whitespace, the variables have to have finite lower bounds.
+    """
+    builder = ModelBuilder("model")
+    objective_row, free_rows, section = None, set(), None
+    # the consecutive lines of the columns section usually describe the same variable
+    column_name, column = None, None
+    with open(path) as file:
+        for (line_number, line) in enumerate(file, start=1):
+            fields = line.split()
+            if not fields or line[0] == "*":
+                continue
+            try:
+                if section == "COLUMNS" and line[0].isspace():
+                    if fields[1] == "'MARKER'":
+                        continue
+                    if fields[0] != column_name:
+                        column_name, column = fields[0], builder.column(fields[0])
+                    for (row, value) in _mps_pairs(fields):
+                        if row == objective_row:
+                            builder.add_cost(column, value)
+                        elif row not in free_rows:
+                            builder.add(builder.rows[row], column, value)
+                elif not line[0].isspace():
+                    section = fields[0].upper()
+                    if section == "NAME" and len(fields) > 1:
+                        builder.name = fields[1]
+                    elif section == "OBJSENSE" and len(fields) > 1:
+                        builder.objective_type = _mps_objective_type(fields[1])
+                    elif section == "ENDATA":
+                        break
+                    elif section not in ("NAME", "OBJSENSE", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS"):
+                        raise ValueError(f"unknown section {fields[0]}")
+                elif section == "OBJSENSE":
+                    builder.objective_type = _mps_objective_type(fields[0])
+                elif section == "ROWS":
+                    if fields[0].upper() == "N":
+                        # only the first free row is the objective, the other ones are ignored
+                        objective_row = fields[1] if objective_row is None else objective_row
+                        free_rows.add(fields[1])
+                        builder.objective_type = builder.objective_type or sseobj.ObjectiveType.MIN
+                    else:
+                        builder.row(fields[1], _mps_senses[fields[0].upper()])
+                elif section in ("RHS", "RANGES"):
+                    # the name of the vector is optional
+                    for (row, value) in _mps_pairs(fields if len(fields) % 2 == 1 else [None] + fields):
+                        if row == objective_row:
+                            raise ValueError("objective constants are not supported")
+                        elif section == "RHS":
+                            builder.set_bound(builder.rows[row], value)
+                        else:
+                            builder.set_range(builder.rows[row], value)
+                elif section == "BOUNDS":
+                    _mps_bound(builder, fields)
+            except (ValueError, KeyError, IndexError) as error:
+                raise ModelFormatError(path, str(error).strip("'"), line_number) from error
+    return _built(builder, path)
+
+
+def _mps_objective_type(field: str) -> sseobj.ObjectiveType:
+    return {"MAX": sseobj.ObjectiveType.MAX, "MAXIMIZE": sseobj.ObjectiveType.MAX,
+            "MIN": sseobj.ObjectiveType.MIN, "MINIMIZE": sseobj.ObjectiveType.MIN}[field.upper()]
+
+
+def _mps_pairs(fields: List[str]) -> List[Tuple[str, float]]:
+    """ returns the (row name, value) pairs following the first field """
+    if len(fields) == 3:
+        return [(fields[1], float(fields[2]))]
+    if len(fields) == 5:
+        return [(fields[1], float(fields[2])), (fields[3], float(fields[4]))]
+    raise ValueError(f"expected one or two (name, value) pairs, got: {' '.join(fields[1:])}")
+
+
+def _mps_bound(builder: ModelBuilder, fields: List[str]):
+    kind = fields[0].upper()
+    if kind in ("FR", "MI", "PL", "BV"):
+        column = builder.column(fields[2] if len(fields) > 2 else fields[1])
+        value = None
+    else:
+        column, value = builder.column(fields[-2]), _finite_or_infinite(float(fields[-1]))
+
+    if kind in ("FR", "MI"):
+        raise ValueError(f"variable {builder.names[column]} has no finite lower bound, which is not supported")
+    elif kind in ("UP", "UI"):
+        builder.set_upper(column, value)
+    elif kind in ("LO", "LI"):
+        builder.set_lower(column, value)
+    elif kind == "FX":
+        builder.set_lower(column, value)
+        builder.set_upper(column, value)
+    elif kind == "PL":
+        builder.set_upper(column, math.inf)
+    elif kind == "BV":
+        builder.set_lower(column, 0.0)
+        builder.set_upper(column, 1.0)
+    else:
+        raise ValueError(f"unknown bound type {fields[0]}")
+
+
+def read_lp(path: str) -> ssmod.Model:
+    """
+        Reads the model from the CPLEX LP file, line by line (the expressions may span many lines).
+        The general and integer sections are ignored (the linear relaxation is read), the binary variables get bounds [0, 1].
+        The variables have to have finite lower bounds.
+    """
+    builder = ModelBuilder("model")
+    section = None
+    # the objective or the constraint being read, it may span many lines
+    state = _LpExpression()
+    with open(path) as file:
+        for (line_number, line) in enumerate(file, start=1):
+            line = line.split("\\", 1)[0]
+            if not line.strip():
+                continue
+            try:
+                match = _lp_section.match(line)
+                keyword = " ".join(match.group(1).lower().split())
+                if keyword in _lp_sections and not (match.group(2).startswith(":") or
+                                                    (section == "bounds" and match.group(2).lower() == "free")):
+                    state.finish(builder, section)
+                    section, line = _lp_sections[keyword], match.group(2)
+                    if section in ("max", "min"):
+                        builder.objective_type = sseobj.ObjectiveType.MAX if section == "max" else sseobj.ObjectiveType.MIN
+                    elif section == "end":
+                        break
+                if not line.strip():
+                    continue
+                if section in ("max", "min", "st"):
+                    state.read(builder, section, line)
+                elif section == "bounds":
+                    _lp_bound(builder, line)
+                elif section == "binary":
+                    for name in line.split():
+                        column = builder.column(name)
+                        builder.set_lower(column, 0.0)
+                        builder.set_upper(column, 1.0)
+                elif section == "general":
+                    for name in line.split():
+                        builder.column(name)
+                else:
+                    raise ValueError(f"unexpected text outside of the sections: {line.strip()}")
+            except (ValueError, KeyError, IndexError) as error:
+                raise ModelFormatError(path, str(error).strip("'"), line_number) from error
+    try:
+        state.finish(builder, section)
+    except ValueError as error:
+        raise ModelFormatError(path, str(error)) from error
+    return _built(builder, path)
+
+
+class _LpExpression:
+    """
+        Terms of the objective or the constraint being read, fed with the tokens of the consecutive lines.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.label = None
+        self.terms: List[Tuple[int, float]] = []
+        self.coefficient = None
+        self.sign = 1.0
+        self.sense = None
+        self.started = False
+
+    def read(self, builder: ModelBuilder, section: str, line: str):
+        tokens = list(_lp_tokens(line))
+        for (i, (operator, sign, colon, number, name)) in enumerate(tokens):
+            if name and i + 1 < len(tokens) and tokens[i + 1][2]:
+                # a name followed by a colon is the label of the expression
+                if self.started:
+                    raise ValueError(f"unexpected label {name}")
+                self.label = name
+                continue
+            self.started = True
+            if colon:
+                if i == 0 or not tokens[i - 1][4]:
+                    raise ValueError("unexpected ':'")
+            elif sign:
+                self.sign *= -1.0 if sign == "-" else 1.0
+            elif operator:
+                if section != "st" or self.sense is not None:
+                    raise ValueError(f"unexpected '{operator}'")
+                self.sense = _lp_senses[operator]
+            elif number is not None and self.sense is not None:
+                self._finish_constraint(builder, self.sign * float(number))
+            elif number is not None:
+                self.coefficient = (1.0 if self.coefficient is None else self.coefficient) * float(number)
+            elif self.sense is not None:
+                raise ValueError(f"expected a number after the constraint sense, got: {name}")
+            else:
+                coefficient = self.sign * (1.0 if self.coefficient is None else self.coefficient)
+                self.terms.append((builder.column(name), coefficient))
+                self.coefficient, self.sign = None, 1.0
+
+    def _finish_constraint(self, builder: ModelBuilder, bound: float):
+        row = builder.row(self.label if self.label is not None else f"c{len(builder.rows)}", self.sense)
+        for (column, coefficient) in self.terms:
+            builder.add(row, column, coefficient)
+        builder.set_bound(row, bound)
+        self.reset()
+
+    def finish(self, builder: ModelBuilder, section: str):
+        if section in ("max", "min"):
+            if self.coefficient is not None:
+                raise ValueError("objective constants are not supported")
+            for (column, coefficient) in self.terms:
+                builder.add_cost(column, coefficient)
+        elif section == "st" and self.started:
+            raise ValueError("incomplete constraint at the end of the section")
+        self.reset()
+
+
+def _lp_tokens(line: str) -> Iterator[Tuple[str, str, str, str, str]]:
+    position, line = 0, line.rstrip()
+    while position < len(line):
+        match = _lp_token.match(line, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"unexpected text: {line[position:].strip()}")
+        position = match.end()
+        yield match.groups()
+
+
+def _lp_bound(builder: ModelBuilder, line: str):
+    fields = line.split()
+    if len(fields) == 2 and fields[1].lower() == "free":
+        raise ValueError(f"variable {fields[0]} has no finite lower bound, which is not supported")
+
+    # the bound is a sequence of the values, the senses and a single name, e.g. l <= x <= u
+    items, sign = [], 1.0
+    for (operator, token_sign, _, number, name) in _lp_tokens(line):
+        if token_sign:
+            sign *= -1.0 if token_sign == "-" else 1.0
+        elif operator:
+            items.append(_lp_senses[operator])
+        elif number is not None or name.lower() in ("inf", "infinity"):
+            items.append(sign * (math.inf if number is None else _finite_or_infinite(float(number))))
+            sign = 1.0
+        else:
+            items.append(name)
+    names = [i for (i, item) in enumerate(items) if isinstance(item, str)]
+    if len(names) != 1 or len(items) not in (3, 5) or (len(items) == 5 and names[0] != 2):
+        raise ValueError(f"invalid bound: {line.strip()}")
+
+    position = names[0]
+    name = items[position]
+    bounds = []
+    if position == 2:
+        # l <= x means x >= l
+        bounds.append((ssecon.ConstraintType(-items[1].value), items[0]))
+    if position + 2 < len(items):
+        bounds.append((items[position + 1], items[position + 2]))
+
+    column = builder.column(name)
+    for (sense, value) in bounds:
+        if not isinstance(sense, ssecon.ConstraintType) or isinstance(value, (str, ssecon.ConstraintType)):
+            raise ValueError(f"invalid bound: {line.strip()}")
+        if sense != ssecon.ConstraintType.LE:
+            if not math.isfinite(value):
+                raise ValueError(f"variable {name} has no finite lower bound, which is not supported")
+            builder.set_lower(column, value)
+        if sense != ssecon.ConstraintType.GE:
+            builder.set_upper(column, value)
+
+
+def _finite_or_infinite(value: float) -> float:
+    return value if abs(value) < infinity else math.copysign(math.inf, value)
+
+
+def _built(builder: ModelBuilder, path: str) -> ssmod.Model:
+    lower, upper = np.array(builder._lower), np.array(builder._upper)
+    invalid = np.flatnonzero(lower > upper)
+    if len(invalid) > 0:
+        index = invalid[0]
+        raise ModelFormatError(path, f"variable {builder.names[index]} has bounds [{lower[index]}, {upper[index]}]")
+    return builder.build()
+
+
+def write_mps(model: ssmod.Model, path: str):
+    """
+        Writes the model to the free MPS file, the constraints are named `c{index}` and the objective `obj`.
+    """
+    rows, cols, data = _nonzeros(model)
+    order = np.lexsort((rows, cols))
+    costs = _costs(model)
+    with open(path, "w") as file:
+        file.write(f"NAME {model.name}\n")
+        if model.objective is not None and model.objective.type == sseobj.ObjectiveType.MAX:
+            file.write("OBJSENSE\n    MAX\n")
+        file.write("ROWS\n N  obj\n")
+        for constraint in model.constraints:
+            file.write(f" {'LEG'[constraint.type.value + 1]}  c{constraint.index}\n")
+
+        file.write("COLUMNS\n")
+        entries = iter(zip(cols[order].tolist(), rows[order].tolist(), data[order].tolist()))
+        entry = next(entries, None)
+        for var in model.variables:
+            # every variable is written, even the ones absent from the objective and the constraints
+            if costs[var.index] != 0 or entry is None or entry[0] != var.index:
+                file.write(f"    {var.name}  obj  {_number(costs[var.index])}\n")
+            while entry is not None and entry[0] == var.index:
+                file.write(f"    {var.name}  c{entry[1]}  {_number(entry[2])}\n")
+                entry = next(entries, None)
+
+        file.write("RHS\n")
+        for constraint in model.constraints:
+            if constraint.bound != 0:
+                file.write(f"    RHS  c{constraint.index}  {_number(constraint.bound)}\n")
+
+        file.write("BOUNDS\n")
+        for var in model.variables:
+            if var.lower == var.upper:
+                file.write(f" FX BND  {var.name}  {_number(var.lower)}\n")
+                continue
+            if var.lower != 0:
+                file.write(f" LO BND  {var.name}  {_number(var.lower)}\n")
+            if math.isfinite(var.upper):
+                file.write(f" UP BND  {var.name}  {_number(var.upper)}\n")
+        file.write("ENDATA\n")
+
+
+def write_lp(model: ssmod.Model, path: str):
+    """
+        Writes the model to the CPLEX LP file, the constraints are named `c{index}` and the objective `obj`.
+    """
+    with open(path, "w") as file:
+        maximized = model.objective is not None and model.objective.type == sseobj.ObjectiveType.MAX
+        file.write("Maximize\n" if maximized else "Minimize\n")
+        # every variable is listed in the objective, so the variables are read back in the same order
+        costs = _costs(model)
+        _write_lp_expression(file, "obj", model, dict(enumerate(costs.tolist())))
+        file.write("\n")
+
+        file.write("Subject To\n")
+        for constraint in model.constraints:
+            _write_lp_expression(file, f"c{constraint.index}", model, constraint.expression.factors)
+            file.write(f" {constraint.type} {_number(constraint.bound)}\n")
+
+        file.write("Bounds\n")
+        for var in model.variables:
+            if var.lower == var.upper:
+                file.write(f" {var.name} = {_number(var.lower)}\n")
+            elif math.isfinite(var.upper):
+                file.write(f" {_number(var.lower)} <= {var.name} <= {_number(var.upper)}\n")
+            elif var.lower != 0:
+                file.write(f" {var.name} >= {_number(var.lower)}\n")
+        file.write("End\n")
+
+
+def _write_lp_expression(file: TextIO, label: str, model: ssmod.Model, factors: Dict[int, float]):
+    file.write(f" {label}:")
+    terms = [(index, factor) for (index, factor) in factors.items() if factor != 0 or label == "obj"]
+    if not terms:
+        # the lp format has no empty constraints
+        terms = [(0, 0.0)]
+    for (i, (index, factor)) in enumerate(terms):
+        if i > 0 and i % lp_terms_per_line == 0:
+            file.write("\n   ")
+        sign = "-" if factor < 0 else "+"
+        file.write(f" {sign} {_number(abs(factor))} {model.variables[index].name}")
+
+
+def _nonzeros(model: ssmod.Model) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rows, cols, data = array("l"), array("l"), array("d")
+    for constraint in model.constraints:
+        factors = constraint.expression.factors
+        rows.extend([constraint.index] * len(factors))
+        cols.extend(factors.keys())
+        data.extend(factors.values())
+    return np.array(rows, dtype=int), np.array(cols, dtype=int), np.array(data)
+
+
+def _costs(model: ssmod.Model) -> np.ndarray:
+    costs = np.zeros(len(model.variables))
+    if model.objective is not None:
+        factors = model.objective.expression.factors
+        costs[list(factors.keys())] = list(factors.values())
+    return costs
+
+
+def _number(value: float) -> str:
+    value = float(value)
+    return repr(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+from enum import Enum
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+class ScalingType(Enum):
+    """
+    An enum representing all the available scaling methods of the constraint matrix.
+    """
+    GEOMETRIC = "geometric"
+    EQUILIBRATION = "equilibration"
+
+
+class Scaling:
+    """
+        A class to represent scaling of the constraint matrix: row i is multiplied by row_scales[i]
+        and column j by column_scales[j], so the scaled problem is solved for x' = x / column_scales.
+        All the factors are powers of 2, so the scaling itself doesn't introduce any rounding errors.
+        Every column with a single coefficient (e.g. of a slack variable) ends up with the coefficient ±1.
+
+        Attributes
+        ----------
+        row_scales : numpy.Array
+            factors of the constraints
+        column_scales : numpy.Array
+            factors of the variables
+
+        Methods
+        -------
+        __init__(row_scales: array, column_scales: array) -> Scaling:
+            constructs a new scaling with the given factors
+        @staticmethod compute(rows: array, cols: array, data: array, shape: (int, int), scaling: ScalingType | str, passes: int = 4) -> Scaling:
+            computes factors of the matrix given by its nonzero coefficients (data[k] at rows[k], cols[k]):
+            - geometric: alternately divides rows and columns by the geometric mean of their largest and smallest coefficient
+            - equilibration: divides rows and then columns by their largest coefficient
+        scale(rows: array, cols: array, data: array) -> array:
+            returns the scaled nonzero coefficients
+        unscale(values: array) -> array:
+            maps values of the scaled variables back to the original ones
+    """
+    row_scales: ArrayLike
+    column_scales: ArrayLike
+
+    def __init__(self, row_scales: ArrayLike, column_scales: ArrayLike):
+        self.row_scales = row_scales
+        self.column_scales = column_scales
+
+    @staticmethod
+    def compute(rows: ArrayLike, cols: ArrayLike, data: ArrayLike, shape: Tuple[int, int],
+                scaling: ScalingType | str, passes: int = 4) -> Scaling:
+        rows, cols = np.asarray(rows, dtype=int), np.asarray(cols, dtype=int)
+        magnitudes = np.abs(np.asarray(data, dtype=float))
+        nonzero = magnitudes > 0
+        rows, cols, magnitudes = rows[nonzero], cols[nonzero], magnitudes[nonzero]
+
+        row_scales, column_scales = np.ones(shape[0]), np.ones(shape[1])
+        if ScalingType(scaling) == ScalingType.GEOMETRIC:
+            for _ in range(passes):
+                row_scales = _power_of_two(1.0 / _geometric_means(rows, magnitudes * column_scales[cols], shape[0]))
+                column_scales = _power_of_two(1.0 / _geometric_means(cols, magnitudes * row_scales[rows], shape[1]))
+        else:
+            row_scales = _power_of_two(1.0 / _largest(rows, magnitudes, shape[0]))
+            column_scales = _power_of_two(1.0 / _largest(cols, magnitudes * row_scales[rows], shape[1]))
+        return Scaling(row_scales, column_scales)
+
+    def scale(self, rows: ArrayLike, cols: ArrayLike, data: ArrayLike) -> ArrayLike:
+        return np.asarray(data, dtype=float) * self.row_scales[rows] * self.column_scales[cols]
+
+    def unscale(self, values: ArrayLike) -> ArrayLike:
+        values = np.array(values, dtype=float)
+        # columns added after the scaling (e.g. by the resolve) aren't scaled
+        scaled_n = min(len(values), len(self.column_scales))
+        values[:scaled_n] *= self.column_scales[:scaled_n]
+        return values
+
+
+def _largest(groups: ArrayLike, magnitudes: ArrayLike, groups_n: int) -> ArrayLike:
+    largest = np.ones(groups_n)
+    present = np.zeros(groups_n, dtype=bool)
+    present[groups] = True
+    largest[present] = 0.0
+    np.maximum.at(largest, groups, magnitudes)
+    return largest
+
+
+def _geometric_means(groups: ArrayLike, magnitudes: ArrayLike, groups_n: int) -> ArrayLike:
+    smallest = np.full(groups_n, np.inf)
+    np.minimum.at(smallest, groups, magnitudes)
+    smallest[np.isinf(smallest)] = 1.0
+    return np.sqrt(_largest(groups, magnitudes, groups_n) * smallest)
+
+
+def _power_of_two(scales: ArrayLike) -> ArrayLike:
+    return np.exp2(np.round(np.log2(scales)))
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from typing import Dict
+import struct
+import zipfile
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import saport.simplex.model as ssmod
+import saport.simplex.solution as sssol
+import saport.simplex.limits as sslim
+import saport.simplex.expressions.objective as sseobj
+from saport.simplex.exceptions import SnapshotError
+
+# version of the layout of the snapshot arrays, stored in every snapshot
+snapshot_version = 1
+
+# the local header of every zip member: its fixed part and the offsets of the name and extra field lengths in it
+_zip_header_size = 30
+_zip_lengths = slice(26, 30)
+
+
+def save_model(model: ssmod.Model, path: str):
+    """
+        Saves the model to the uncompressed npz file with the constraint matrix in the csr form
+        (indptr, indices, data), the bounds, senses, costs, variable bounds and names.
+    """
+    lengths = np.fromiter((len(c.expression.factors) for c in model.constraints), dtype=int, count=len(model.constraints))
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    indices, data = np.empty(indptr[-1], dtype=int), np.empty(indptr[-1])
+    for constraint in model.constraints:
+        span = slice(indptr[constraint.index], indptr[constraint.index + 1])
+        factors = constraint.expression.factors
+        indices[span] = list(factors.keys())
+        data[span] = list(factors.values())
+
+    costs = np.zeros(len(model.variables))
+    objective_type = 0
+    if model.objective is not None:
+        factors = model.objective.expression.factors
+        costs[list(factors.keys())] = list(factors.values())
+        objective_type = model.objective.type.value
+
+    with open(path, "wb") as file:
+        np.savez(file, kind="model", version=snapshot_version, name=model.name,
+                 names=np.array([var.name for var in model.variables], dtype=str),
+                 lower=np.array([var.lower for var in model.variables], dtype=float),
+                 upper=np.array([var.upper for var in model.variables], dtype=float),
+                 indptr=indptr, indices=indices, data=data,
+                 senses=np.array([c.type.value for c in model.constraints], dtype=int),
+                 bounds=np.array([c.bound for c in model.constraints], dtype=float),
+                 costs=costs, objective_type=objective_type)
+
+
+def load_model(path: str, mmap: bool = True) -> ssmod.Model:
+    """
+        Loads the model saved with save_model, with mmap the arrays are memory mapped instead of read into memory
+        (the model reads only the coefficients of the constraint being built).
+    """
+    arrays = _load(path, "model", mmap)
+    objective_type = int(arrays["objective_type"])
+    return ssmod.Model._from_rows(str(arrays["name"]), arrays["names"].tolist(), arrays["lower"], arrays["upper"],
+                                  arrays["indptr"], arrays["indices"], arrays["data"], arrays["senses"],
+                                  arrays["bounds"], arrays["costs"],
+                                  sseobj.ObjectiveType(objective_type) if objective_type != 0 else None)
+
+
+def save_solution(solution: sssol.Solution, path: str):
+    """
+        Saves the assignment, the status (with the limit which stopped the solve), the number of iterations
+        and the final basis of the solution to the npz file.
+    """
+    assignment = solution.assignment() if solution.has_assignment() else None
+    basis = solution.basis()
+    with open(path, "wb") as file:
+        np.savez(file, kind="solution", version=snapshot_version,
+                 assignment=np.array([] if assignment is None else assignment, dtype=float),
+                 has_assignment=assignment is not None,
+                 basis=np.array([] if basis is None else basis, dtype=int), has_basis=basis is not None,
+                 is_feasible=solution.is_feasible, is_bounded=solution.is_bounded, iterations=solution.iterations,
+                 limit="" if solution.limit is None else solution.limit.value)
+
+
+def load_solution(path: str, model: ssmod.Model, mmap: bool = True) -> sssol.Solution:
+    """
+        Loads the solution saved with save_solution as the solution of the given model, with the basis retained.
+    """
+    arrays = _load(path, "solution", mmap)
+    assignment = arrays["assignment"].tolist() if arrays["has_assignment"] else None
+    if assignment is not None and len(assignment) != len(model.variables):
+        raise SnapshotError(path, f"the solution has {len(assignment)} values, the model has {len(model.variables)} variables")
+    solution = sssol.Solution(model, assignment, None, None, bool(arrays["is_feasible"]), bool(arrays["is_bounded"]))
+    solution.iterations = int(arrays["iterations"])
+    solution._basis = arrays["basis"].tolist() if arrays["has_basis"] else None
+    # the snapshots saved before the limits were introduced have no limit
+    limit = str(arrays["limit"]) if "limit" in arrays else ""
+    solution.limit = sslim.LimitType(limit) if limit else None
+    return solution
+
+
+def _load(path: str, kind: str, mmap: bool) -> Dict[str, ArrayLike]:
+    try:
+        arrays = _memory_mapped(path) if mmap else _read(path)
+    except (OSError, ValueError, zipfile.BadZipFile) as error:
+        raise SnapshotError(path, str(error)) from error
+    if "kind" not in arrays or str(arrays["kind"]) != kind:
+        raise SnapshotError(path, f"it's not a {kind} snapshot")
+    if int(arrays["version"]) != snapshot_version:
+        raise SnapshotError(path, f"unsupported version {int(arrays['version'])}")
+    return arrays
+
+
+def _read(path: str) -> Dict[str, ArrayLike]:
+    with np.load(path) as archive:
+        return {name: archive[name] for name in archive.files}
+
+
+def _memory_mapped(path: str) -> Dict[str, ArrayLike]:
+    """
+        np.load doesn't map the members of the npz archives, so every uncompressed member
+        (an npy file stored as is) is mapped directly at its offset in the archive
+    """
+    arrays = dict()
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as file:
+        for info in archive.infolist():
+            name = info.filename[:-len(".npy")] if info.filename.endswith(".npy") else info.filename
+            file.seek(info.header_offset)
+            name_length, extra_length = struct.unpack("<HH", file.read(_zip_header_size)[_zip_lengths])
+            file.seek(info.header_offset + _zip_header_size + name_length + extra_length)
+            version = np.lib.format.read_magic(file)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            shape, fortran_order, dtype = read_header(file)
+
+            size = int(np.prod(shape))
+            if info.compress_type != zipfile.ZIP_STORED or dtype.hasobject or size == 0 or len(shape) == 0:
+                # scalars, empty arrays and the compressed members are small enough (or have to be) read
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+            arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=file.tell(), shape=shape,
+                                     order="F" if fortran_order else "C")
+    return arrays
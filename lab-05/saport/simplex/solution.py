@@ -1,9 +1,39 @@
 from __future__ import annotations
+from enum import Enum
 from typing import List
 
 import saport.simplex.model as ssmod
 import saport.simplex.tableau as sstab
 import saport.simplex.expressions.expression as sseexp
+import saport.simplex.sensitivity as sssen
+import saport.simplex.limits as sslim
+
+class RetentionType(Enum):
+    """
+    An enum representing how much of the solver state is kept in the solutions:
+    - NONE = only the assignment
+    - BASIS = the assignment and the final basis
+    - TABLEAUX = the assignment, the initial and the final tableau
+    """
+    NONE = "none"
+    BASIS = "basis"
+    TABLEAUX = "tableaux"
+
+
+class SolutionStatus(Enum):
+    """
+    An enum representing the outcome of a solve:
+    - OPTIMAL = the assignment is optimal
+    - INFEASIBLE = the model has no feasible assignment
+    - UNBOUNDED = the objective of the model is unbounded
+    - LIMIT_REACHED = the solve stopped at an iteration or time limit or was cancelled,
+                      the assignment (if any) is feasible, but not necessarily optimal
+    """
+    OPTIMAL = "optimal"
+    INFEASIBLE = "infeasible"
+    UNBOUNDED = "unbounded"
+    LIMIT_REACHED = "limit reached"
+
 
 class Solution:
     """
@@ -14,14 +44,27 @@ class Solution:
         ----------
         model : Model
             model corresponding to the solution
-        initial_tableau: Tableau
-            a simplex tableau corresponding to the first base solution
-        tableau: Tableau
-            a simplex tableau corresponding to the solution 
+        initial_tableau: Tableau | None
+            a simplex tableau corresponding to the first base solution, None if it wasn't retained
+        tableau: Tableau | None
+            a simplex tableau corresponding to the solution, None if it wasn't retained
         is_feasible: bool
             whether the problem is feasible
         is_bounded: bool
             whether the problem is bounded
+        iterations: int
+            number of simplex iterations performed to find the solution
+        presolved: PresolvedModel | None
+            the presolve result (with the numbers of removed rows and columns), None if the model wasn't presolved
+        scaling: Scaling | None
+            factors of the scaled model the tableaux correspond to, None if the model wasn't scaled
+        stats: SolveStats | None
+            per-phase iterations, wall times and objective trajectory of the solve
+        limit: LimitType | None
+            the limit which stopped the solve, None if the solve finished
+            the assignment is then the last basic solution of the second phase (None in the earlier phases),
+            the tableau and the basis are the last ones, is_feasible is False if no feasible assignment has been found yet
+            and is_optimal() is False either way
 
         Methods
         -------
@@ -38,6 +81,25 @@ class Solution:
             returns a value of the objective function if the model is feasible and bounded, otherwise None
         has_assignment() -> bool:
             helper method returning info if the model is feasible and bounded, only then there is an assignment available
+            (with the limit reached, the assignment may be available, but not optimal)
+        status() -> SolutionStatus:
+            returns the outcome of the solve: optimal, infeasible, unbounded or limit reached
+        is_optimal() -> bool:
+            helper method returning info if the assignment is proven optimal, False for the solves stopped by the limit
+        basis() -> List[int] | None:
+            returns indexes of the basic variables of the final tableau (e.g. to warm start another solve), None if it wasn't retained
+            basis[i] is the variable of the i-th constraint row, -1 marks a redundant row
+        retain(retention: RetentionType | str):
+            drops the parts of the solver state not covered by the given retention level
+        sensitivity() -> Sensitivity | None:
+            returns shadow prices, reduced costs and the ranges of the bounds and the objective coefficients
+            keeping the basis optimal, computed once from the final tableau
+            None if there is no assignment, the tableau wasn't retained or it doesn't match the model
+            (solutions of the presolved models and the resolved ones) or it isn't optimal (the limit has been reached)
+        save(path: str):
+            saves the assignment, the status, the number of iterations and the final basis to the binary npz file
+        @staticmethod load(path: str, model: Model, mmap: bool = True) -> Solution:
+            loads the solution of the given model saved to the npz file, the basis is retained
     
         Static Methods
         --------------
@@ -47,6 +109,8 @@ class Solution:
             helper method to create infeasible solutions
         unbounded(model, initial_tableau: sstab.Tableau, tableau: sstab.Tableau):
             helper method to create unbounded solutions
+        limit_reached(model: ssmod.Model, limit: LimitType, assignment: List[float] | None, tableau: sstab.Tableau | None):
+            helper method to create solutions of the solves stopped by the limit
     """
 
     def __init__(self, model: ssmod.Model, assignment: List[float], initial_tableau: sstab.Tableau, tableau: sstab.Tableau, is_feasible: bool, is_bounded: bool):
@@ -56,19 +120,67 @@ class Solution:
         self.tableau = tableau
         self.initial_tableau = initial_tableau
         self._assignment = assignment
+        self.iterations = 0
+        self.presolved = None
+        self.scaling = None
+        self.stats = None
+        self.limit = None
+        self._basis = None
+        self._augmented = None
+        self._row_factors = None
+        self._sensitivity = None
 
     def assignment(self, model: ssmod.Model = None):
         model = self.model if model is None else model
         return self._assignment[:len(model.variables)]
 
     def value(self, var: sseexp.Variable):
-        return None if self._assignment == None else self._assignment[var.index]
+        return None if self._assignment is None else self._assignment[var.index]
 
     def objective_value(self):
-        return None if self._assignment == None else self.model.objective.evaluate(self._assignment) 
+        return None if self._assignment is None else self.model.objective.evaluate(self._assignment) 
 
     def has_assignment(self):
-        return self._assignment == None
+        return self._assignment is not None
+
+    def status(self) -> SolutionStatus:
+        if self.limit is not None:
+            return SolutionStatus.LIMIT_REACHED
+        if not self.is_feasible:
+            return SolutionStatus.INFEASIBLE
+        return SolutionStatus.OPTIMAL if self.is_bounded else SolutionStatus.UNBOUNDED
+
+    def is_optimal(self) -> bool:
+        return self.status() == SolutionStatus.OPTIMAL
+
+    def basis(self):
+        return self._basis if self.tableau is None else self.tableau.extract_basis()
+
+    def retain(self, retention: RetentionType | str):
+        retention = RetentionType(retention)
+        if retention == RetentionType.TABLEAUX:
+            return
+        self._basis = self.basis() if retention == RetentionType.BASIS else None
+        self.initial_tableau = None
+        self.tableau = None
+        self._augmented = None
+
+    def sensitivity(self) -> sssen.Sensitivity | None:
+        if self._sensitivity is None and self.has_assignment() and self.limit is None and self.tableau is not None \
+                and self._augmented is not None:
+            self._sensitivity = sssen.Sensitivity.from_tableau(self.model, self.tableau, self._augmented,
+                                                               self._row_factors, self.scaling)
+        return self._sensitivity
+
+    def save(self, path: str):
+        # imported here, the snapshot module depends on the solution module
+        import saport.simplex.snapshot as sssnap
+        sssnap.save_solution(self, path)
+
+    @staticmethod
+    def load(path: str, model: ssmod.Model, mmap: bool = True) -> Solution:
+        import saport.simplex.snapshot as sssnap
+        return sssnap.load_solution(path, model, mmap)
 
     @staticmethod
     def with_assignment(model: ssmod.Model, assignment: List[float], initial_tableau: sstab.Tableau, tableau: sstab.Tableau):
@@ -82,13 +194,23 @@ class Solution:
     def unbounded(model, initial_tableau: sstab.Tableau, tableau: sstab.Tableau):
         return Solution(model, None, initial_tableau, tableau, True, False)
 
+    @staticmethod
+    def limit_reached(model: ssmod.Model, limit: sslim.LimitType, assignment: List[float], tableau: sstab.Tableau):
+        # without an assignment nothing feasible is known yet
+        solution = Solution(model, assignment, None, tableau, assignment is not None, True)
+        solution.limit = limit
+        return solution
+
     def __str__(self, model: ssmod.Model = None):
         model = self.model if model is None else model
         
         if not self.is_bounded:
             return "There is no optimal solution, the model is unbounded"
-            
-        text = f'- objective value: {self.objective_value()}\n'
+        if self.limit is not None and not self.has_assignment():
+            return f"There is no solution, the solve stopped ({self.limit.value}) before a feasible one was found"
+
+        text = '' if self.limit is None else f'- the solve stopped ({self.limit.value}), the solution may not be optimal\n'
+        text += f'- objective value: {self.objective_value()}\n'
         text += '- assignment:'
         for var in model.variables:
             text += f'\n\t- {var.name} = {"{:.3f}".format(self._assignment[var.index])}'
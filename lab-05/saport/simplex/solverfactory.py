@@ -0,0 +1,51 @@
+from __future__ import annotations
+from enum import Enum
+from typing import List
+import saport.simplex.solver as ssslv
+import saport.simplex.revised_solver as ssrev
+import saport.simplex.ipm_solver as ssipm
+import saport.simplex.pricing as sspri
+import saport.simplex.scaling as ssscl
+import saport.simplex.solution as sssol
+import saport.simplex.stats as ssstat
+import saport.simplex.limits as sslim
+
+
+class EngineType(Enum):
+    """
+    An enum representing all the available linear programming engines.
+    """
+    TABLEAU = "tableau"
+    REVISED = "revised"
+    INTERIOR_POINT = "ipm"
+
+
+class SolverFactory:
+    """
+    A factory class creating linear programming solver objects.
+
+    Static Methods:
+    ---------------
+    solver(engine: EngineType | str, pricing: PricingType | str | PricingRule = "dantzig", presolve: bool = False, scaling: ScalingType | str | None = None, retention: RetentionType | str = "tableaux", callbacks: List[SolverCallback] | None = None, start: StartType | str = "crash", crossover: bool = True, max_iterations: int | None = None, time_limit: float | None = None, cancellation: CancellationToken | None = None) -> Solver:
+        creates a new solver object based on the specified engine (or its name) using the given pricing rule,
+        optionally the presolve and scaling, keeping the solver state in the solutions according to the retention,
+        notifying the callbacks about the iterations, finding the starting basis in the given way
+        and stopping every solve at the given limits
+        crossover applies only to the interior point engine
+    """
+    @staticmethod
+    def solver(engine: EngineType | str, pricing: sspri.PricingType | str | sspri.PricingRule = "dantzig",
+               presolve: bool = False, scaling: ssscl.ScalingType | str | None = None,
+               retention: sssol.RetentionType | str = "tableaux",
+               callbacks: List[ssstat.SolverCallback] = None, start: ssslv.StartType | str = "crash",
+               crossover: bool = True, max_iterations: int = None, time_limit: float = None,
+               cancellation: sslim.CancellationToken = None) -> ssslv.Solver:
+        engine = EngineType(engine)
+        options = dict(crossover=crossover) if engine == EngineType.INTERIOR_POINT else dict()
+        return {
+            EngineType.TABLEAU: ssslv.Solver,
+            EngineType.REVISED: ssrev.RevisedSolver,
+            EngineType.INTERIOR_POINT: ssipm.InteriorPointSolver,
+        }[engine](pricing=pricing, presolve=presolve, scaling=scaling, retention=retention,
+                  callbacks=callbacks, start=start, max_iterations=max_iterations, time_limit=time_limit,
+                  cancellation=cancellation, **options)
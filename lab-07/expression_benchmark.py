@@ -0,0 +1,48 @@
+from saport.simplex import quicksum
+from saport.simplex.model import Model
+from saport.simplex.expressions.expression import Expression
+from typing import Callable, List
+import numpy as np
+import time
+# manipulate following parameters to customize the benchmark
+
+TERMS = 100_000
+BUILTIN_SUM_TERMS = 5_000
+SEED = 0
+
+
+def builtin_sum(terms: List) -> Expression:
+    """ the builtin sum copies the partial sum on every addition, kept as a reference point """
+    return sum(terms)
+
+
+def in_place_sum(terms: List) -> Expression:
+    total = terms[0]
+    for term in terms[1:]:
+        total += term
+    return total
+
+
+def objective_terms(terms_n: int) -> List:
+    rng = np.random.default_rng(SEED)
+    costs = rng.uniform(-10.0, 10.0, size=terms_n)
+    variables = Model("benchmark").create_variables(terms_n, "x")
+    return [float(c) * v for (c, v) in zip(costs, variables)]
+
+
+def build_time(build: Callable[[List], Expression], terms_n: int) -> float:
+    terms = objective_terms(terms_n)
+    start = time.perf_counter()
+    objective = build(terms)
+    elapsed = time.perf_counter() - start
+    assert len(objective.factors) == terms_n
+    return elapsed
+
+
+builtin = build_time(builtin_sum, BUILTIN_SUM_TERMS)
+in_place = build_time(in_place_sum, TERMS)
+quick = build_time(quicksum, TERMS)
+
+print(f"* builtin sum of {BUILTIN_SUM_TERMS} terms: {builtin:10.3f}s")
+print(f"* += of {TERMS} terms:          {in_place:10.3f}s")
+print(f"* quicksum of {TERMS} terms:    {quick:10.3f}s")
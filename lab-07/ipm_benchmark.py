@@ -0,0 +1,53 @@
+from saport.simplex.model import Model
+import numpy as np
+import time
+# manipulate following parameters to customize the benchmark
+
+SIZES = [25, 50, 100, 200]
+ENGINES = [
+    # (label, solve options)
+    ("tableau", dict(engine="tableau")),
+    ("ipm", dict(engine="ipm")),
+    ("ipm without crossover", dict(engine="ipm", crossover=False)),
+]
+SEED = 0
+
+
+def dense_model(size: int, rng: np.random.Generator) -> Model:
+    """ max c x, A x <= b with size rows and 2 * size columns """
+    model = Model(f"dense_{size}")
+    x = model.create_variables(2 * size, "x")
+    model.add_constraint(rng.uniform(0.0, 5.0, (size, 2 * size)) @ x <= rng.uniform(10.0, 50.0, size))
+    model.maximize(rng.uniform(1.0, 5.0, 2 * size) @ x)
+    return model
+
+
+def transportation_model(size: int, rng: np.random.Generator) -> Model:
+    """ min c x, size / 2 sources ship at most their supplies, size / 2 destinations get exactly their demands """
+    sources_n = destinations_n = max(2, size // 2)
+    model = Model(f"transportation_{size}")
+    x = model.create_variables((sources_n, destinations_n), "x")
+    supply = rng.uniform(10.0, 20.0, sources_n)
+    demand = rng.uniform(5.0, 10.0, destinations_n)
+    model.add_constraint(x.sum(axis=1) <= supply)
+    # the demands add up to 90% of the supplies, so the model is always feasible
+    model.add_constraint(x.sum(axis=0) == demand * supply.sum() / demand.sum() * 0.9)
+    model.minimize((rng.uniform(1.0, 10.0, (sources_n, destinations_n)) * x).sum())
+    return model
+
+
+def run(builder) -> None:
+    print(f"* {builder.__name__.replace('_model', '')}")
+    print(f"  {'rows':>6} {'engine':>22} {'iterations':>10} {'time [s]':>10} {'objective':>14}")
+    for size in SIZES:
+        model = builder(size, np.random.default_rng(SEED))
+        for (label, options) in ENGINES:
+            start = time.perf_counter()
+            solution = model.solve(retention="none", **options)
+            elapsed = time.perf_counter() - start
+            print(f"  {len(model.constraints):>6} {label:>22} {solution.iterations:>10} {elapsed:>10.3f} "
+                  f"{solution.objective_value():>14.6f}")
+
+
+run(dense_model)
+run(transportation_model)
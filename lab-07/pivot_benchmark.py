@@ -0,0 +1,61 @@
+from saport.simplex.tableau import Tableau
+from typing import Callable
+import numpy as np
+import time
+# manipulate following parameters to customize the benchmark
+
+ROWS = 300
+COLUMNS = 900
+NAIVE_PIVOTS = 5
+VECTORIZED_PIVOTS = 500
+SEED = 0
+
+
+def naive_pivot(tableau: Tableau, row: int, col: int):
+    """ the cell-by-cell pivot used before the rank-1 update, kept as a reference point """
+    rows_n, cols_n = tableau.table.shape
+    pivot_factor = tableau.table[row, col]
+
+    new_table = tableau.table.copy()
+    new_table[row] = tableau.table[row] / pivot_factor
+
+    new_table[:, col] = 0.0
+    new_table[row, col] = 1.0
+
+    for r in range(rows_n):
+        if r == row:
+            continue
+        for c in range(cols_n):
+            if c == col:
+                continue
+            new_table[r, c] = (-tableau.table[r, col]) * new_table[row, c] + tableau.table[r, c]
+
+    tableau.table = new_table
+
+
+def random_tableau(rng: np.random.Generator) -> Tableau:
+    # strictly positive entries keep every pivot element far from zero
+    return Tableau(None, rng.uniform(1.0, 2.0, size=(ROWS + 1, COLUMNS + 1)))
+
+
+def pivots_per_second(pivot: Callable[[Tableau, int, int], None], pivots: int) -> float:
+    rng = np.random.default_rng(SEED)
+    tableau = random_tableau(rng)
+    # every pivot uses a fresh column, so the pivot element is never an eliminated zero
+    rows = rng.integers(1, ROWS + 1, size=pivots)
+    columns = rng.permutation(COLUMNS)[:pivots]
+    positions = zip(rows, columns)
+
+    start = time.perf_counter()
+    for (row, col) in positions:
+        pivot(tableau, row, col)
+    return pivots / (time.perf_counter() - start)
+
+
+naive = pivots_per_second(naive_pivot, NAIVE_PIVOTS)
+vectorized = pivots_per_second(Tableau.pivot, VECTORIZED_PIVOTS)
+
+print(f"* tableau: {ROWS} x {COLUMNS}")
+print(f"* naive pivot:      {naive:12.2f} pivots/s")
+print(f"* vectorized pivot: {vectorized:12.2f} pivots/s")
+print(f"* speedup:          {vectorized / naive:12.2f}x")
@@ -82,7 +82,7 @@ class Solution:
         if solution is None:
             return None
         assignment = [round(v) for v in solution.assignment()] if solution.has_assignment() else None
-        return Solution(model, assignment, is_optimal, solution.is_feasible, solution.is_bounded)
+        return Solution(model, assignment, is_optimal and solution.is_optimal(), solution.is_feasible, solution.is_bounded)
 
     def __str__(self):
         if not self.is_bounded:
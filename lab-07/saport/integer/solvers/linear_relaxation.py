@@ -1,11 +1,10 @@
-from copy import deepcopy
 from saport.integer.solver import IntegerProgrammingSolver
 from saport.simplex import solver as lpsolver
-from saport.integer.model import Model
 from saport.integer.solution import Solution
 from saport.simplex.expressions import constraint as ssecon
 from saport.simplex.expressions import expression as sseexp
 from saport.simplex import solution as lpsolution
+from saport.simplex import tableau as lptableau
 import math
 
 class LinearRelaxationSolver(IntegerProgrammingSolver):
@@ -15,10 +14,12 @@ class LinearRelaxationSolver(IntegerProgrammingSolver):
     """  
 
     def _solving_routine(self):
-        self._branch_and_bound(self.model)
+        self._lpsolver = lpsolver.Solver()
+        self._limit_relaxation_time()
+        self._branch_and_bound(self._lpsolver.solve(self.model))
         self.best_solution = Solution.with_linear_solution(self.model, self.best_solution, not self.interrupted)
            
-    def _branch_and_bound(self, model: Model):
+    def _branch_and_bound(self, upper: lpsolution.Solution):
         # TODO: implement a branch and bound procedure analogically to the one in the knapsack solver
         #       1) use simplex[1] to find the upper bound[2]
         #       2) remember to handle infeasible and unbounded models[3]
@@ -29,14 +30,17 @@ class LinearRelaxationSolver(IntegerProgrammingSolver):
         #       6) branch on the variable with the float value:
         #          - every branch has a different model exluding the current float value[7]
         #                     
-        # [1] `lpsolver.Solver().solve(<model>)` 
+        # [1] `upper` is the simplex solution of the current node, children are re-optimized from it
         # [2] `solution.objective_value()`
         # [3] `solution.is_feasible`, `solution.is_bounded`, `solution.has_assignment()`
         # [4] `self._lower_bound()` inherited from the `Solver` class
         # [5] `self.find_float_assignment(<solution>)`
         # [6] `self.timeout()`
-        # [7] `self._model_with_new_constraint(<model>, <constraint>)`
-        upper = lpsolver.Solver().solve(model)
+        # [7] `self._solution_with_new_constraint(<solution>, <constraint>)`
+        if upper.limit is not None:
+            # the relaxation stopped before its optimum was found, so it's neither a valid bound nor a solution
+            self.interrupted = True
+            return
         if not upper.is_feasible or not upper.is_bounded or not upper.has_assignment():
             return
         upper_bound = upper.objective_value()
@@ -59,8 +63,8 @@ class LinearRelaxationSolver(IntegerProgrammingSolver):
         if self._lower_bound() >= upper_bound:
             return
 
-        self._branch_and_bound(self._model_with_new_constraint(model, flo >= sufit))
-        self._branch_and_bound(self._model_with_new_constraint(model, flo <= podloga))
+        self._branch_and_bound(self._solution_with_new_constraint(upper, flo >= sufit))
+        self._branch_and_bound(self._solution_with_new_constraint(upper, flo <= podloga))
 
 
 
@@ -77,11 +81,15 @@ class LinearRelaxationSolver(IntegerProgrammingSolver):
         variables = self.model.variables
 
         for i in variables:
-            if not math.isclose(solution.value(i), round(solution.value(i))):
+            if not math.isclose(solution.value(i), round(solution.value(i)), abs_tol=lptableau.eps):
                 return i
         return None
 
-    def _model_with_new_constraint(self, model: Model, constraint: ssecon.Constraint) -> Model:
-        new_model = deepcopy(model)
-        new_model.add_constraint(constraint)
-        return new_model
+    def _solution_with_new_constraint(self, solution: lpsolution.Solution, constraint: ssecon.Constraint) -> lpsolution.Solution:
+        # the dual simplex warm starts from the parent's optimal tableau instead of solving the child from scratch
+        self._limit_relaxation_time()
+        return self._lpsolver.resolve(solution, constraint)
+
+    def _limit_relaxation_time(self):
+        # the simplex gets only the time left, a relaxation it doesn't finish is stopped by the time limit
+        self._lpsolver.time_limit = max(0.0, self.timelimit - self.wall_time())
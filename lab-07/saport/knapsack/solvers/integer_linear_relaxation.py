@@ -3,7 +3,7 @@ from saport.knapsack.model import Problem, Solution, Item
 from typing import List
 from saport.integer.model import Model
 from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
-from saport.simplex.expressions.expression import Expression
+import numpy as np
 
 
 class IntegerLinearRelaxationSolver(Solver):
@@ -21,15 +21,12 @@ class IntegerLinearRelaxationSolver(Solver):
         # - variables: whether the item gets taken
         # - constraints: weights
         # - objective: values
-        variable_weights = []
-        variable_values = []
-        for i in self.problem.items:
-            m.add_constraint(m.create_variable(f'{i}') <= 1)
-            variable_weights.append(i.weight)
-            variable_values.append(i.value)
+        weights = np.array([i.weight for i in self.problem.items], dtype=float)
+        values = np.array([i.value for i in self.problem.items], dtype=float)
+        x = m.create_variables(len(self.problem.items), "x", upper=1)
 
-        m.add_constraint(Expression.from_vectors(m.variables, variable_weights) <= self.problem.capacity)
-        m.maximize(Expression.from_vectors(m.variables, variable_values))
+        m.add_constraint(weights @ x <= self.problem.capacity)
+        m.maximize(values @ x)
         return m
 
     def solve(self) -> Solution:
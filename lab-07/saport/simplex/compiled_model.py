@@ -0,0 +1,133 @@
+from __future__ import annotations
+from typing import List
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import saport.simplex.expressions.constraint as ssecon
+import saport.simplex.expressions.objective as sseobj
+import saport.simplex.scaling as ssscl
+
+
+class CompiledModel:
+    """
+        A class to represent a linear programming model compiled to the arrays:
+        objective -> c^T x, subject to A x (senses) b, lower <= x <= upper
+
+        Attributes
+        ----------
+        matrix : numpy.Array | scipy.sparse.csr_matrix
+            2d-array with the constraint coefficients, row i corresponds to the constraint with index i
+        bounds : numpy.Array
+            right hand sides of the constraints
+        senses : numpy.Array
+            types of the constraints stored as ConstraintType values (-1 for <=, 0 for =, 1 for >=)
+        costs : numpy.Array
+            coefficients of the objective expression
+        objective_type : ObjectiveType | None
+            whether the objective is maximized or minimized, None if the model has no objective
+        lower : numpy.Array
+            lower bounds of the variables
+        upper : numpy.Array
+            upper bounds of the variables
+        scaling : Scaling | None
+            factors the rows and columns have been multiplied by, None if the model isn't scaled
+            the arrays describe the scaled variables x' = x / scaling.column_scales
+
+        Methods
+        -------
+        __init__(matrix: array, bounds: array, senses: array, costs: array, objective_type: ObjectiveType | None, lower: array, upper: array, scaling: Scaling | None = None) -> CompiledModel:
+            constructs a new compiled model from the given arrays
+        @staticmethod from_model(model: Model, sparse: bool = False, scaling: ScalingType | str | None = None) -> CompiledModel:
+            compiles the model in a single pass over its expressions
+            the sparse form requires scipy
+            with scaling ("geometric" or "equilibration") the rows and columns are scaled during the compilation
+        scaled(scaling: ScalingType | str) -> CompiledModel:
+            returns the model with scaled rows and columns
+        add_columns(columns: array):
+            appends the given columns of variables bounded by [0, inf) and not appearing in the objective
+        sense(index: int) -> ConstraintType:
+            returns type of the constraint with the given index
+    """
+    matrix: ArrayLike
+    bounds: ArrayLike
+    senses: ArrayLike
+    costs: ArrayLike
+    objective_type: sseobj.ObjectiveType
+    lower: ArrayLike
+    upper: ArrayLike
+    scaling: ssscl.Scaling
+
+    def __init__(self, matrix: ArrayLike, bounds: ArrayLike, senses: ArrayLike, costs: ArrayLike,
+                 objective_type: sseobj.ObjectiveType, lower: ArrayLike, upper: ArrayLike, scaling: ssscl.Scaling = None):
+        self.matrix = matrix
+        self.bounds = bounds
+        self.senses = senses
+        self.costs = costs
+        self.objective_type = objective_type
+        self.lower = lower
+        self.upper = upper
+        self.scaling = scaling
+
+    @staticmethod
+    def from_model(model, sparse: bool = False, scaling: ssscl.ScalingType | str = None) -> CompiledModel:
+        rows_n, cols_n = len(model.constraints), len(model.variables)
+
+        rows: List[int] = []
+        cols: List[int] = []
+        data: List[float] = []
+        bounds = np.empty(rows_n)
+        senses = np.empty(rows_n, dtype=int)
+        for (row, constraint) in enumerate(model.constraints):
+            factors = constraint.expression.factors
+            rows.extend([row] * len(factors))
+            cols.extend(factors.keys())
+            data.extend(factors.values())
+            bounds[row] = constraint.bound
+            senses[row] = constraint.type.value
+
+        if sparse:
+            import scipy.sparse
+            matrix = scipy.sparse.csr_matrix((data, (rows, cols)), shape=(rows_n, cols_n), dtype=float)
+        else:
+            matrix = np.zeros((rows_n, cols_n))
+            matrix[rows, cols] = data
+
+        costs = np.zeros(cols_n)
+        objective_type = None
+        if model.objective is not None:
+            factors = model.objective.expression.factors
+            costs[list(factors.keys())] = list(factors.values())
+            objective_type = model.objective.type
+
+        lower = np.array([var.lower for var in model.variables], dtype=float)
+        upper = np.array([var.upper for var in model.variables], dtype=float)
+        compiled = CompiledModel(matrix, bounds, senses, costs, objective_type, lower, upper)
+        return compiled if scaling is None else compiled.scaled(scaling)
+
+    def scaled(self, scaling: ssscl.ScalingType | str) -> CompiledModel:
+        if isinstance(self.matrix, np.ndarray):
+            rows, cols = np.nonzero(self.matrix)
+            data = self.matrix[rows, cols]
+        else:
+            coo = self.matrix.tocoo()
+            rows, cols, data = coo.row, coo.col, coo.data
+        scales = ssscl.Scaling.compute(rows, cols, data, self.matrix.shape, scaling)
+
+        if isinstance(self.matrix, np.ndarray):
+            matrix = scales.row_scales[:, np.newaxis] * self.matrix * scales.column_scales
+        else:
+            import scipy.sparse
+            matrix = (scipy.sparse.diags(scales.row_scales) @ self.matrix @ scipy.sparse.diags(scales.column_scales)).tocsr()
+        return CompiledModel(matrix, self.bounds * scales.row_scales, self.senses.copy(), self.costs * scales.column_scales,
+                             self.objective_type, self.lower / scales.column_scales, self.upper / scales.column_scales, scales)
+
+    def add_columns(self, columns: ArrayLike):
+        added_n = columns.shape[1]
+        self.matrix = np.hstack([self.matrix, columns])
+        self.costs = np.concatenate([self.costs, np.zeros(added_n)])
+        self.lower = np.concatenate([self.lower, np.zeros(added_n)])
+        self.upper = np.concatenate([self.upper, np.full(added_n, np.inf)])
+
+    def sense(self, index: int) -> ssecon.ConstraintType:
+        return ssecon.ConstraintType(int(self.senses[index]))
@@ -54,7 +54,8 @@ class Constraint:
 
     def __init__(self, expression: sseexp.Expression, bound: float, type: ConstraintType = ConstraintType.GE, index: int = None):
         self.index = index
-        self.expression = expression
+        # atoms (and variables) are immutable, so the constraint gets its own expression
+        self.expression = sseexp.Expression(expression) if isinstance(expression, sseexp.Atom) else expression
         self.bound = bound
         self.type = type
 
@@ -51,7 +51,8 @@ class Objective:
     coefficient: float
 
     def __init__(self, expression: sseexp.Expression, type: ObjectiveType = ObjectiveType.MAX, factor: float = 1.0):
-        self.expression = expression
+        # atoms (and variables) are immutable, so the objective gets its own expression
+        self.expression = sseexp.Expression(expression) if isinstance(expression, sseexp.Atom) else expression
         self.type = type
         self.coefficient = factor
 
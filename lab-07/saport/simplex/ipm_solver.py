@@ -0,0 +1,254 @@
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+import time
+from numpy.typing import ArrayLike
+
+import saport.simplex.model as ssmod
+import saport.simplex.solver as ssslv
+import saport.simplex.solution as sssol
+import saport.simplex.tableau as sstab
+import saport.simplex.pricing as sspri
+import saport.simplex.scaling as ssscl
+import saport.simplex.stats as ssstat
+import saport.simplex.limits as sslim
+import saport.simplex.compiled_model as sscom
+
+# fraction of the step to the boundary taken in every iteration, keeps the iterates strictly interior
+step_fraction = 0.99
+# norm of the iterates considered diverging, the model is then most likely infeasible or unbounded
+divergence = 1e12
+
+
+class InteriorPointSolver(ssslv.Solver):
+    """
+        A class to represent a primal-dual interior point solver (Mehrotra's predictor-corrector method).
+        It works on the augmented arrays of the model (A x = b, 0 <= x <= u after the slacks are added),
+        every iteration solves the normal equations A D A^T dy = r with a dense factorization, so it costs O(m^2 n)
+        and the number of iterations barely grows with the size of the model.
+        The crossover turns the interior solution into a basic one: the columns farthest from their bounds
+        (relatively to their dual slacks) form the basis, the simplex then removes the remaining infeasibilities.
+        Without the crossover the solution has no tableau, so neither the basis nor the sensitivity is available.
+        Infeasible and unbounded models make the iterates diverge, they're handed over to the simplex,
+        which tells them apart.
+
+        Attributes
+        ----------
+        crossover: bool
+            whether the interior solution is turned into a basic one
+        tolerance: float
+            largest relative primal and dual residual and duality gap of the optimal solution
+        interior_iterations: int
+            number of the interior point iterations after which the model is handed over to the simplex
+
+        Methods
+        -------
+        __init__(crossover: bool = True, tolerance: float = 1e-8, interior_iterations: int = 100, pricing: PricingType | str | PricingRule = "dantzig", presolve: bool = False, scaling: ScalingType | str | None = None, retention: RetentionType | str = "tableaux", callbacks: List[SolverCallback] | None = None, start: StartType | str = "crash", max_iterations: int | None = None, time_limit: float | None = None, cancellation: CancellationToken | None = None) -> InteriorPointSolver:
+            constructs a new solver, the pricing rule and the start are used by the simplex after the crossover
+            (or when the interior point method fails), the limits cover the interior point and the simplex iterations
+        solve(model: Model) -> Solution:
+            solves the given model and returns the optimal solution (a basic one with the crossover)
+    """
+    crossover: bool
+    tolerance: float
+    interior_iterations: int
+
+    def __init__(self, crossover: bool = True, tolerance: float = 1e-8, interior_iterations: int = 100,
+                 pricing: sspri.PricingType | str | sspri.PricingRule = "dantzig", presolve: bool = False,
+                 scaling: ssscl.ScalingType | str | None = None, retention: sssol.RetentionType | str = "tableaux",
+                 callbacks: List[ssstat.SolverCallback] = None, start: ssslv.StartType | str = "crash",
+                 max_iterations: int = None, time_limit: float = None, cancellation: sslim.CancellationToken = None):
+        super().__init__(pricing, presolve, scaling, retention, callbacks, start, max_iterations, time_limit, cancellation)
+        self.crossover = crossover
+        self.tolerance = tolerance
+        self.interior_iterations = interior_iterations
+
+    def _solve(self, model: ssmod.Model):
+        start = time.perf_counter()
+        normal_model, compiled = self._augment_model(model)
+        self.stats.lap("augmentation", start)
+        if len(compiled.bounds) == 0:
+            return super()._solve(model)
+
+        values, duals = self._interior_point(compiled)
+        if values is None:
+            return super()._solve(model)
+        if not self.crossover:
+            return self._create_solution(values.tolist(), model, None, None)
+
+        start = time.perf_counter()
+        tableau = self._crossover_tableau(normal_model, compiled, values, duals)
+        self.stats.lap("crossover", start)
+        if tableau is None:
+            return super()._solve(model)
+
+        initial_tableau = tableau.copy() if self.retention == sssol.RetentionType.TABLEAUX else None
+        if tableau.choose_dual_leaving_variable() is not None:
+            if not tableau.is_optimal():
+                # the crossover basis is neither primal nor dual feasible, the simplex starts from scratch
+                return super()._solve(model)
+            if not self._dual_optimize(tableau):
+                return super()._solve(model)
+        if not self._optimize(tableau):
+            return super()._solve(model)
+        return self._create_solution(tableau.extract_assignment(), model, initial_tableau, tableau, compiled)
+
+    def _interior_point(self, compiled: sscom.CompiledModel) -> Tuple[ArrayLike | None, ArrayLike | None]:
+        """
+            _interior_point(compiled: CompiledModel) -> (array | None, array | None):
+                returns values of all the columns and their dual slacks (reduced costs) at the optimum,
+                (None, None) if the method doesn't converge
+        """
+        start = time.perf_counter()
+        matrix, bounds, upper = compiled.matrix, compiled.bounds, compiled.upper
+        # minimized costs, the augmented model is maximized
+        costs = -compiled.costs
+        cols_n = matrix.shape[1]
+        # fixed columns (lower == upper) have no interior, they stay at 0
+        movable = upper > sstab.eps
+        matrix, costs, upper = matrix[:, movable], costs[movable], upper[movable]
+        bounded = np.isfinite(upper)
+        upper_bounds = upper[bounded]
+
+        x = np.where(bounded, np.minimum(1.0, upper / 2), 1.0)
+        s = upper_bounds - x[bounded]
+        y = np.zeros(len(bounds))
+        z = np.ones(len(x))
+        w = np.ones(len(s))
+        pairs_n = len(x) + len(s)
+
+        self._start_phase(ssstat.SolvePhase.INTERIOR_POINT, -costs @ x)
+        converged = False
+        for _ in range(self.interior_iterations):
+            primal_residual = bounds - matrix @ x
+            upper_residual = upper_bounds - x[bounded] - s
+            dual_residual = costs - matrix.T @ y - z
+            dual_residual[bounded] += w
+            mu = (x @ z + s @ w) / pairs_n
+
+            primal_value, dual_value = costs @ x, bounds @ y - upper_bounds @ w
+            converged = np.linalg.norm(primal_residual) <= self.tolerance * (1 + np.linalg.norm(bounds)) and \
+                np.linalg.norm(upper_residual) <= self.tolerance * (1 + np.linalg.norm(upper_bounds)) and \
+                np.linalg.norm(dual_residual) <= self.tolerance * (1 + np.linalg.norm(costs)) and \
+                abs(primal_value - dual_value) <= self.tolerance * (1 + abs(primal_value))
+            if converged or max(np.abs(x).max(), np.abs(y).max(initial=0.0)) > divergence:
+                break
+            # the interior iterates aren't basic (nor feasible), so a stopped solve has no assignment
+            self._check_limits(ssstat.SolvePhase.INTERIOR_POINT, start)
+
+            inverse_scaling = z / x
+            inverse_scaling[bounded] += w / s
+            scaling = 1.0 / inverse_scaling
+            normal_matrix = (matrix * scaling) @ matrix.T
+
+            def direction(xz_residual: ArrayLike, sw_residual: ArrayLike) -> Tuple[ArrayLike, ...]:
+                residual = dual_residual - xz_residual / x
+                residual[bounded] += (sw_residual - w * upper_residual) / s
+                dy = _solve_normal_equations(normal_matrix, primal_residual + matrix @ (scaling * residual))
+                dx = scaling * (matrix.T @ dy - residual)
+                dz = (xz_residual - z * dx) / x
+                ds = upper_residual - dx[bounded]
+                dw = (sw_residual - w * ds) / s
+                return dx, dy, dz, ds, dw
+
+            # predictor: the affine scaling direction
+            dx, dy, dz, ds, dw = direction(-x * z, -s * w)
+            primal_step, dual_step = _max_step([x, s], [dx, ds]), _max_step([z, w], [dz, dw])
+            affine_mu = ((x + primal_step * dx) @ (z + dual_step * dz) +
+                         (s + primal_step * ds) @ (w + dual_step * dw)) / pairs_n
+            centering = (affine_mu / mu) ** 3
+
+            # corrector: centered direction compensating the second order terms of the predictor
+            dx, dy, dz, ds, dw = direction(centering * mu - x * z - dx * dz, centering * mu - s * w - ds * dw)
+            primal_step = min(1.0, step_fraction * _max_step([x, s], [dx, ds], np.inf))
+            dual_step = min(1.0, step_fraction * _max_step([z, w], [dz, dw], np.inf))
+            x, s = x + primal_step * dx, s + primal_step * ds
+            y, z, w = y + dual_step * dy, z + dual_step * dz, w + dual_step * dw
+            self._finish_iteration(ssstat.SolvePhase.INTERIOR_POINT, -1, None, -costs @ x)
+        self._end_phase(ssstat.SolvePhase.INTERIOR_POINT, start)
+
+        if not converged:
+            return None, None
+        values, reduced_costs = np.zeros(cols_n), np.zeros(cols_n)
+        values[movable] = x
+        reduced_costs[np.flatnonzero(movable)] = z
+        reduced_costs[np.flatnonzero(movable)[bounded]] -= w
+        return values, reduced_costs
+
+    def _crossover_tableau(self, model: ssmod.Model, compiled: sscom.CompiledModel, values: ArrayLike,
+                           reduced_costs: ArrayLike) -> sstab.Tableau | None:
+        """
+            _crossover_tableau(model: Model, compiled: CompiledModel, values: array, reduced_costs: array) -> Tableau | None:
+                returns the tableau of the basis made of the columns most likely basic in the interior solution:
+                the ones with the largest distance to their nearest bound relatively to their reduced cost,
+                the nonbasic columns closer to their upper bounds are flipped,
+                None if the columns don't span all the rows (the model has redundant constraints)
+        """
+        matrix, upper = compiled.matrix, compiled.upper
+        distances = np.minimum(values, upper - values)
+        scores = distances / (distances + np.abs(reduced_costs) + sstab.eps)
+        basis = _independent_columns(matrix, np.argsort(-scores, kind="stable"))
+        if len(basis) < matrix.shape[0]:
+            return None
+
+        table = np.vstack([np.zeros(matrix.shape[1] + 1),
+                           np.linalg.solve(matrix[:, basis], np.hstack([matrix, compiled.bounds[:, np.newaxis]]))])
+        tableau = sstab.Tableau(model, table, upper, basis=basis)
+        # the basic columns are unit ones up to the rounding errors
+        tableau.table[1:, basis] = np.eye(len(basis))
+        self._set_objective_row(tableau, compiled.costs)
+        self._fix_objective_row_to_the_basis(tableau, tableau.basis)
+
+        nonbasic = np.ones(len(upper), dtype=bool)
+        nonbasic[basis] = False
+        for col in np.flatnonzero(nonbasic & np.isfinite(upper) & (values > upper / 2)):
+            tableau.flip(col)
+        return tableau
+
+
+def _solve_normal_equations(normal_matrix: ArrayLike, rhs: ArrayLike) -> ArrayLike:
+    try:
+        return np.linalg.solve(normal_matrix, rhs)
+    except np.linalg.LinAlgError:
+        # redundant constraints make the normal matrix singular
+        return np.linalg.lstsq(normal_matrix, rhs, rcond=None)[0]
+
+
+def _max_step(values: List[ArrayLike], directions: List[ArrayLike], limit: float = 1.0) -> float:
+    """ returns the longest step (at most the limit) keeping all the values nonnegative """
+    step = limit
+    for (value, direction) in zip(values, directions):
+        decreasing = direction < 0
+        if decreasing.any():
+            # the iterates of the infeasible and unbounded models diverge, the overflowing steps are just infinite
+            with np.errstate(over="ignore", divide="ignore"):
+                step = min(step, (-value[decreasing] / direction[decreasing]).min())
+    return step
+
+
+def _independent_columns(matrix: ArrayLike, order: ArrayLike) -> List[int]:
+    """
+        returns the first (in the given order) linearly independent columns of the matrix spanning its rows,
+        the columns are orthogonalized one by one against the already chosen ones (Gram-Schmidt)
+    """
+    rows_n = matrix.shape[0]
+    orthonormal = np.zeros((rows_n, rows_n))
+    chosen = []
+    for col in order:
+        column = matrix[:, col]
+        norm = np.linalg.norm(column)
+        if norm <= sstab.eps:
+            continue
+        k = len(chosen)
+        # orthogonalized twice, a single pass loses the orthogonality for nearly dependent columns
+        residual = column - orthonormal[:, :k] @ (orthonormal[:, :k].T @ column)
+        residual -= orthonormal[:, :k] @ (orthonormal[:, :k].T @ residual)
+        residual_norm = np.linalg.norm(residual)
+        if residual_norm <= 1e-7 * norm:
+            continue
+        orthonormal[:, k] = residual / residual_norm
+        chosen.append(int(col))
+        if len(chosen) == rows_n:
+            break
+    return chosen
@@ -0,0 +1,40 @@
+from __future__ import annotations
+from enum import Enum
+import threading
+
+
+class LimitType(Enum):
+    """
+    An enum representing the limits stopping a solve before it's finished:
+    - ITERATIONS = the solve performed max_iterations iterations
+    - TIME = the solve took longer than time_limit seconds
+    - CANCELLED = the cancellation token has been cancelled
+    """
+    ITERATIONS = "iterations"
+    TIME = "time"
+    CANCELLED = "cancelled"
+
+
+class CancellationToken:
+    """
+        A class to represent a request to stop the solves it's given to, e.g. from another thread.
+        The solver checks the token before every iteration and stops with the best basis found so far.
+
+        Methods
+        -------
+        __init__() -> CancellationToken:
+            constructs a new token, not cancelled yet
+        cancel():
+            requests the solves using the token to stop
+        is_cancelled() -> bool:
+            returns whether the token has been cancelled
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
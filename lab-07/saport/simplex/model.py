@@ -1,12 +1,20 @@
 from __future__ import annotations
-from typing import List
-from saport.simplex.exceptions import DuplicateVariableError, EmptyModelError, MissingObjectiveError
+from typing import List, Set, Tuple
+import itertools
+import math
+import numpy as np
+from numpy.typing import ArrayLike
+from saport.simplex.exceptions import DuplicateVariableError, EmptyModelError, InvalidBoundsError, MissingObjectiveError
 
 import saport.simplex.expressions.objective as sseobj
 import saport.simplex.expressions.constraint as ssecon
 import saport.simplex.solver as ssslv
 import saport.simplex.expressions.expression as sseexp
+import saport.simplex.expressions.variable_array as ssearr
 import saport.simplex.solution as sssol
+import saport.simplex.compiled_model as sscom
+import saport.simplex.stats as ssstat
+import saport.simplex.limits as sslim
 
 class Model:
     """
@@ -22,47 +30,121 @@ class Model:
             list containing problem constraints
         objective : Objective
             object representing the objective function
+        _names : Set[str]
+            names of the variables, used to detect duplicates in O(1)
 
         Methods
         -------
         __init__(name: str):
             constructs new model with a specified name
-        create_variable(name: str) -> Variable
+        create_variable(name: str, lower: float = 0.0, upper: float = inf) -> Variable
             returns a new variable with a specified named, the variable is automatically indexed and added to the variables list
-        add_constraint(constraint: Constraint)
-            add a new constraint to the model
+            the bounds are handled natively by the solver, they never become constraints
+        create_variables(shape: int | Tuple[int, ...], prefix: str, lower: float | array = 0.0, upper: float | array = inf) -> VariableArray
+            returns array of the given shape with new variables named `prefix_i_j...` after their positions
+            the array supports matrix-style modelling, e.g. `A @ x <= b`, `x.sum(axis=0) == 1`, `c @ x`
+            the variables are indexed and added to the variables list in the row-major order
+            bounds may be given per variable as arrays broadcastable to the shape
+        set_bounds(variable: Variable, lower: float = 0.0, upper: float = inf)
+            changes bounds of the variable
+        add_constraint(constraint: Constraint | ConstraintArray)
+            add a new constraint (or a block of constraints, one per row) to the model
         maximize(expression: Expression)
             sets objective to maximize the specified Expression
         minimize(expression: Expression)
             sets objective to minimize the specified Expression
         simplify():
             simplifies all the expressions used in the model
-        solve() -> Solution
+        compile(sparse: bool = False, scaling: str | None = None) -> CompiledModel
+            returns arrays A, b, c, senses and bounds of the model built in one pass over the expressions
+            with sparse=True the constraint matrix is a scipy.sparse csr matrix
+            scaling ("geometric" or "equilibration") scales the rows and columns of the arrays
+        solve(engine: str = "tableau", pricing: str = "dantzig", presolve: bool = False, scaling: str | None = None, retention: str = "tableaux", callbacks: List[SolverCallback] | None = None, start: str = "crash", crossover: bool = True, max_iterations: int | None = None, time_limit: float | None = None, cancellation: CancellationToken | None = None) -> Solution
             solves the current model using Simplex solver and returns the result
+            engine selects the implementation: "tableau" (dense tableau), "revised" (factorized basis)
+            or "ipm" (primal-dual interior point method, with crossover to a basic solution unless crossover=False)
+            pricing selects the entering variable rule: "dantzig", "bland", "partial", "steepest_edge" or "devex"
+            presolve removes empty, singleton and duplicate rows and fixed variables before solving
+            scaling ("geometric" or "equilibration") improves the numerical behaviour on badly scaled models
+            retention selects what the solution keeps besides the assignment: "none", "basis" or "tableaux"
+            callbacks are notified about the phases and iterations, the statistics are kept in solution.stats
+            start selects how the rows without a slack get a basic variable: "two_phase", "crash" or "big_m"
+            max_iterations, time_limit (in seconds) and the cancellation token stop the solve before it's finished,
+            the solution has then the "limit reached" status and keeps the last basis (and the last feasible assignment)
             when called, the model should already contain at least one variable and objective
+        @staticmethod from_compiled(compiled: CompiledModel, names: List[str] | None = None, name: str = "model") -> Model:
+            returns a new model with the variables, constraints and objective given by the (unscaled) compiled arrays
+            the variables are named after the names, `x_i` by default
+        @staticmethod from_mps(path: str) -> Model:
+            reads the model from the MPS file, streaming it into the compiled form
+        @staticmethod from_lp(path: str) -> Model:
+            reads the model from the CPLEX LP file, streaming it into the compiled form
+        write_mps(path: str):
+            writes the model to the MPS file
+        write_lp(path: str):
+            writes the model to the CPLEX LP file
+        save(path: str):
+            saves the model (its csr matrix, bounds, senses, costs, variable bounds and names) to the binary npz file
+        @staticmethod load(path: str, mmap: bool = True) -> Model:
+            loads the model saved to the npz file, with mmap the arrays are memory mapped instead of read at once
     """
     name: str
     variables: List[sseexp.Variable]
     constraints: List[ssecon.Constraint]
     objective: sseobj.Objective
+    _names: Set[str]
     
     def __init__(self, name: str):
         self.name = name
         self.variables = []
         self.constraints = []
         self.objective = None
+        self._names = set()
 
-    def create_variable(self, name: str) -> sseexp.Variable:
-        for var in self.variables:
-            if (var.name == name):
-                raise DuplicateVariableError(name)
+    def create_variable(self, name: str, lower: float = 0.0, upper: float = math.inf) -> sseexp.Variable:
+        if name in self._names:
+            raise DuplicateVariableError(name)
 
         new_index = len(self.variables)
         variable = sseexp.Variable(name, new_index)
+        self.set_bounds(variable, lower, upper)
         self.variables.append(variable)
+        self._names.add(name)
         return variable 
 
-    def add_constraint(self, constraint: ssecon.Constraint):
+    def create_variables(self, shape: int | Tuple[int, ...], prefix: str, lower: float | ArrayLike = 0.0,
+                         upper: float | ArrayLike = math.inf) -> ssearr.VariableArray:
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        lower = np.broadcast_to(np.asarray(lower, dtype=float), shape).ravel()
+        upper = np.broadcast_to(np.asarray(upper, dtype=float), shape).ravel()
+        invalid = np.flatnonzero(~np.isfinite(lower) | (lower > upper))
+
+        positions = itertools.product(*[[str(i) for i in range(n)] for n in shape])
+        names = [f"{prefix}_{'_'.join(position)}" for position in positions]
+        if len(invalid) > 0:
+            raise InvalidBoundsError(names[invalid[0]], lower[invalid[0]], upper[invalid[0]])
+        if not self._names.isdisjoint(names):
+            raise DuplicateVariableError(next(name for name in names if name in self._names))
+
+        first_index = len(self.variables)
+        variables = [sseexp.Variable(name, first_index + i, l, u)
+                     for (i, (name, l, u)) in enumerate(zip(names, lower.tolist(), upper.tolist()))]
+        self.variables.extend(variables)
+        self._names.update(names)
+        return ssearr.VariableArray(self, np.arange(first_index, first_index + len(variables)).reshape(shape))
+
+    def set_bounds(self, variable: sseexp.Variable, lower: float = 0.0, upper: float = math.inf):
+        if not math.isfinite(lower) or lower > upper:
+            raise InvalidBoundsError(variable.name, lower, upper)
+        variable.lower = float(lower)
+        variable.upper = float(upper)
+
+    def add_constraint(self, constraint: ssecon.Constraint | ssearr.ConstraintArray):
+        if isinstance(constraint, ssearr.ConstraintArray):
+            for c in constraint.constraints():
+                self.add_constraint(c)
+            return
+
         constraint.index = len(self.constraints)
         self.constraints.append(constraint)
          
@@ -79,22 +161,102 @@ class Model:
         if self.objective is not None:
             self.objective.simplify()
 
-    def solve(self) -> sssol.Solution:
+    def compile(self, sparse: bool = False, scaling: str = None) -> sscom.CompiledModel:
+        return sscom.CompiledModel.from_model(self, sparse, scaling)
+
+    @staticmethod
+    def from_compiled(compiled: sscom.CompiledModel, names: List[str] = None, name: str = "model") -> Model:
+        matrix = compiled.matrix
+        if hasattr(matrix, "indptr"):
+            indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+        else:
+            rows, indices = np.nonzero(matrix)
+            data = matrix[rows, indices]
+            indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=matrix.shape[0]))])
+        names = [f"x_{i}" for i in range(matrix.shape[1])] if names is None else names
+        return Model._from_rows(name, names, compiled.lower, compiled.upper, indptr, indices, data,
+                                compiled.senses, compiled.bounds, compiled.costs, compiled.objective_type)
+
+    @staticmethod
+    def from_mps(path: str) -> Model:
+        # imported here, the formats module depends on the model module
+        import saport.simplex.formats as ssfmt
+        return ssfmt.read_mps(path)
+
+    @staticmethod
+    def from_lp(path: str) -> Model:
+        import saport.simplex.formats as ssfmt
+        return ssfmt.read_lp(path)
+
+    def write_mps(self, path: str):
+        import saport.simplex.formats as ssfmt
+        ssfmt.write_mps(self, path)
+
+    def write_lp(self, path: str):
+        import saport.simplex.formats as ssfmt
+        ssfmt.write_lp(self, path)
+
+    def save(self, path: str):
+        import saport.simplex.snapshot as sssnap
+        sssnap.save_model(self, path)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> Model:
+        import saport.simplex.snapshot as sssnap
+        return sssnap.load_model(path, mmap)
+
+    @staticmethod
+    def _from_rows(name: str, names: List[str], lower: ArrayLike, upper: ArrayLike, indptr: ArrayLike,
+                   indices: ArrayLike, data: ArrayLike, senses: ArrayLike, bounds: ArrayLike, costs: ArrayLike,
+                   objective_type: sseobj.ObjectiveType) -> Model:
+        """ builds the model from the constraint matrix given row by row: row i has data[indptr[i]:indptr[i + 1]] at the indices """
+        model = Model(name)
+        variables = [model.create_variable(n, l, u) for (n, l, u) in zip(names, np.asarray(lower).tolist(),
+                                                                          np.asarray(upper).tolist())]
+        indptr = np.asarray(indptr).tolist()
+        for row in range(len(indptr) - 1):
+            cols = np.asarray(indices[indptr[row]:indptr[row + 1]]).tolist()
+            factors = np.asarray(data[indptr[row]:indptr[row + 1]]).tolist()
+            expression = sseexp.Expression._from_factors(dict(zip(cols, factors)), {i: variables[i] for i in cols})
+            constraint_type = ssecon.ConstraintType(int(senses[row]))
+            model.add_constraint(ssecon.Constraint(expression, float(bounds[row]), constraint_type))
+
+        if objective_type is not None:
+            costs = np.asarray(costs)
+            cols = np.flatnonzero(costs).tolist()
+            expression = sseexp.Expression._from_factors(dict(zip(cols, costs[cols].tolist())),
+                                                         {i: variables[i] for i in cols})
+            model.objective = sseobj.Objective(expression, objective_type)
+        return model
+
+    def solve(self, engine: str = "tableau", pricing: str = "dantzig", presolve: bool = False,
+              scaling: str = None, retention: str = "tableaux",
+              callbacks: List[ssstat.SolverCallback] = None, start: str = "crash",
+              crossover: bool = True, max_iterations: int = None, time_limit: float = None,
+              cancellation: sslim.CancellationToken = None) -> sssol.Solution:
+        # imported here, the solver modules depend on the model module
+        import saport.simplex.solverfactory as ssfac
+
         if len(self.variables) == 0:
             raise EmptyModelError()
 
         if self.objective is None:
             raise MissingObjectiveError()
 
-        solver = ssslv.Solver()
+        solver = ssfac.SolverFactory.solver(engine, pricing, presolve, scaling, retention, callbacks, start, crossover,
+                                            max_iterations, time_limit, cancellation)
         return solver.solve(self)
 
     def __str__(self) -> str:
         separator = '\n\t'
         text = f'''- name: {self.name}
-- variables:{separator}{separator.join([f"{v.name} >= 0" for v in self.variables])}
+- variables:{separator}{separator.join([self._bounds_str(v) for v in self.variables])}
 - constraints:{separator}{separator.join([str(c) for c in self.constraints])}
 - objective:{separator}{self.objective}
 '''
         return text
-        
\ No newline at end of file
+
+    def _bounds_str(self, variable: sseexp.Variable) -> str:
+        if math.isinf(variable.upper):
+            return f"{variable.name} >= {variable.lower:g}"
+        return f"{variable.lower:g} <= {variable.name} <= {variable.upper:g}"
@@ -0,0 +1,262 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import saport.simplex.model as ssmod
+import saport.simplex.expressions.constraint as ssecon
+import saport.simplex.expressions.expression as sseexp
+import saport.simplex.expressions.objective as sseobj
+import saport.simplex.solution as sssol
+import saport.simplex.tableau as sstab
+
+
+class PresolvedModel:
+    """
+        A class to represent a model reduced by the presolve, together with the information needed to map
+        solutions of the reduced model back to the original one.
+
+        Attributes
+        ----------
+        original : Model
+            the model given to the presolve
+        model : Model | None
+            the reduced model, None if the presolve proved the original model infeasible
+        columns : numpy.Array
+            index of the original variable of every variable in the reduced model
+        values : numpy.Array
+            values of all the original variables removed by the presolve
+        removed_rows : int
+            how many constraints have been removed
+        removed_columns : int
+            how many variables have been removed
+        is_infeasible : bool
+            whether the presolve detected the model is infeasible
+
+        Methods
+        -------
+        __init__(original: Model, model: Model | None, columns: array, values: array, removed_rows: int, removed_columns: int) -> PresolvedModel:
+            constructs a new presolved model
+        postsolve(assignment: List[float]) -> List[float]:
+            maps the assignment of the reduced model to the variables of the original one
+        postsolve_solution(solution: Solution) -> Solution:
+            maps the solution of the reduced model to the solution of the original one
+    """
+    original: ssmod.Model
+    model: ssmod.Model
+    columns: ArrayLike
+    values: ArrayLike
+    removed_rows: int
+    removed_columns: int
+
+    def __init__(self, original: ssmod.Model, model: ssmod.Model, columns: ArrayLike, values: ArrayLike,
+                 removed_rows: int, removed_columns: int):
+        self.original = original
+        self.model = model
+        self.columns = columns
+        self.values = values
+        self.removed_rows = removed_rows
+        self.removed_columns = removed_columns
+
+    @property
+    def is_infeasible(self) -> bool:
+        return self.model is None
+
+    def postsolve(self, assignment: List[float]) -> List[float]:
+        values = np.array(self.values)
+        values[self.columns] = assignment[:len(self.columns)]
+        return values.tolist()
+
+    def postsolve_solution(self, solution: sssol.Solution) -> sssol.Solution:
+        assignment = self.postsolve(solution.assignment()) if solution.has_assignment() else None
+        original_solution = sssol.Solution(self.original, assignment, solution.initial_tableau, solution.tableau,
+                                           solution.is_feasible, solution.is_bounded)
+        original_solution.presolved = self
+        original_solution.limit = solution.limit
+        return original_solution
+
+
+class Presolver:
+    """
+        A class to represent the presolve, which shrinks the model before it's given to the simplex.
+        It works on the compiled arrays and repeats the following reductions until none of them applies:
+        - fixed variables (lower == upper) are substituted into the constraints,
+        - empty rows are checked for feasibility and removed,
+        - singleton rows (a * x (sense) b) become bounds of their variables,
+        - variables absent from all the constraints are fixed at their best finite bound,
+        - duplicate rows (equal up to a scale) are merged, so the ">= b" and "<= b" pairs become equalities.
+        Bounds crossing each other and violated empty or duplicate rows prove the model infeasible.
+
+        Methods
+        -------
+        presolve(model: Model) -> PresolvedModel:
+            returns the reduced model, the solution of which can be mapped back to the given one
+    """
+
+    def presolve(self, model: ssmod.Model) -> PresolvedModel:
+        compiled = model.compile()
+        self._matrix = np.array(compiled.matrix, dtype=float)
+        self._bounds = np.array(compiled.bounds, dtype=float)
+        self._senses = np.array(compiled.senses)
+        self._lower = np.array(compiled.lower)
+        self._upper = np.array(compiled.upper)
+        self._objective_costs = compiled.costs
+        # maximized objective, so the best bound of an empty column is given by the sign of its cost
+        self._costs = compiled.costs * compiled.objective_type.value
+        self._values = np.zeros(len(model.variables))
+        self._rows = np.ones(len(model.constraints), dtype=bool)
+        self._cols = np.ones(len(model.variables), dtype=bool)
+
+        reductions = [self._remove_fixed_columns, self._remove_empty_rows, self._remove_singleton_rows,
+                      self._remove_empty_columns, self._merge_duplicate_rows]
+        feasible, changed = True, True
+        while feasible and changed:
+            changed = False
+            for reduction in reductions:
+                reduced, feasible = reduction()
+                changed = changed or reduced
+                if not feasible:
+                    break
+
+        removed_rows = int((~self._rows).sum())
+        removed_columns = int((~self._cols).sum())
+        columns = np.flatnonzero(self._cols)
+        reduced_model = self._reduced_model(model, columns) if feasible else None
+        return PresolvedModel(model, reduced_model, columns, self._values, removed_rows, removed_columns)
+
+    def _active_matrix(self) -> Tuple[ArrayLike, ArrayLike]:
+        rows, cols = np.flatnonzero(self._rows), np.flatnonzero(self._cols)
+        return self._matrix[np.ix_(rows, cols)], rows
+
+    def _remove_fixed_columns(self) -> Tuple[bool, bool]:
+        fixed = self._cols & (self._upper - self._lower <= sstab.eps)
+        if not fixed.any():
+            return False, True
+        self._fix_columns(fixed, self._lower[fixed])
+        return True, True
+
+    def _fix_columns(self, columns: ArrayLike, values: ArrayLike):
+        self._values[columns] = values
+        self._bounds -= self._matrix[:, columns] @ values
+        self._cols[columns] = False
+
+    def _remove_empty_rows(self) -> Tuple[bool, bool]:
+        matrix, rows = self._active_matrix()
+        empty = rows[~np.any(matrix != 0, axis=1)]
+        if len(empty) == 0:
+            return False, True
+        bounds, senses = self._bounds[empty], self._senses[empty]
+        # 0 (sense) b, i.e. b has to have the sign allowed by the sense
+        violated = np.where(senses == ssecon.ConstraintType.EQ.value, np.abs(bounds) > sstab.eps, senses * bounds > sstab.eps)
+        self._rows[empty] = False
+        return True, not violated.any()
+
+    def _remove_singleton_rows(self) -> Tuple[bool, bool]:
+        matrix, rows = self._active_matrix()
+        singletons = np.flatnonzero(np.count_nonzero(matrix, axis=1) == 1)
+        if len(singletons) == 0:
+            return False, True
+
+        cols = np.flatnonzero(self._cols)
+        for row in singletons:
+            col = cols[np.flatnonzero(matrix[row])[0]]
+            original_row = rows[row]
+            factor = self._matrix[original_row, col]
+            bound = self._bounds[original_row] / factor
+            # dividing by a negative factor inverts the constraint
+            sense = self._senses[original_row] * np.sign(factor)
+            if sense <= ssecon.ConstraintType.EQ.value:
+                self._upper[col] = min(self._upper[col], bound)
+            if sense >= ssecon.ConstraintType.EQ.value:
+                self._lower[col] = max(self._lower[col], bound)
+            self._rows[original_row] = False
+
+            if self._lower[col] > self._upper[col] + sstab.eps:
+                return True, False
+            self._upper[col] = max(self._upper[col], self._lower[col])
+        return True, True
+
+    def _remove_empty_columns(self) -> Tuple[bool, bool]:
+        matrix, _ = self._active_matrix()
+        cols = np.flatnonzero(self._cols)
+        empty = cols[~np.any(matrix != 0, axis=0)]
+        costs = self._costs[empty]
+        # a column improving the objective without a bound is left to the simplex, which reports the unboundedness
+        best = np.where(costs > 0, self._upper[empty], self._lower[empty])
+        fixable = np.isfinite(best)
+        if not fixable.any():
+            return False, True
+        self._fix_columns(empty[fixable], best[fixable])
+        return True, True
+
+    def _merge_duplicate_rows(self) -> Tuple[bool, bool]:
+        matrix, rows = self._active_matrix()
+        groups: Dict[bytes, List[int]] = dict()
+        scales = np.ones(len(rows))
+        for (row, factors) in enumerate(matrix):
+            nonzero = np.flatnonzero(factors)
+            if len(nonzero) < 2:
+                continue
+            scales[row] = factors[nonzero[0]]
+            # adding 0.0 turns -0.0 into 0.0, so both have the same key
+            key = (np.round(factors / scales[row], 9) + 0.0).tobytes()
+            groups.setdefault(key, []).append(row)
+
+        changed = False
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            lowest, highest = -np.inf, np.inf
+            for row in group:
+                original_row = rows[row]
+                bound = self._bounds[original_row] / scales[row]
+                sense = self._senses[original_row] * np.sign(scales[row])
+                if sense <= ssecon.ConstraintType.EQ.value:
+                    highest = min(highest, bound)
+                if sense >= ssecon.ConstraintType.EQ.value:
+                    lowest = max(lowest, bound)
+            if lowest > highest + sstab.eps:
+                return True, False
+
+            kept = [rows[row] for row in group[:2]]
+            self._rows[rows[group]] = False
+            self._rows[kept] = True
+            self._matrix[kept] = self._matrix[kept[0]] / scales[group[0]]
+            if highest - lowest <= sstab.eps:
+                self._set_row(kept[0], ssecon.ConstraintType.EQ, lowest)
+                self._rows[kept[1]] = False
+            elif np.isfinite(lowest) and np.isfinite(highest):
+                self._set_row(kept[0], ssecon.ConstraintType.GE, lowest)
+                self._set_row(kept[1], ssecon.ConstraintType.LE, highest)
+            else:
+                sense = ssecon.ConstraintType.GE if np.isfinite(lowest) else ssecon.ConstraintType.LE
+                self._set_row(kept[0], sense, lowest if np.isfinite(lowest) else highest)
+                self._rows[kept[1]] = False
+            # a pair bounding the row from both sides stays as it is
+            changed = changed or self._rows[rows[group]].sum() < len(group)
+        return changed, True
+
+    def _set_row(self, row: int, sense: ssecon.ConstraintType, bound: float):
+        self._senses[row] = sense.value
+        self._bounds[row] = bound
+
+    def _reduced_model(self, model: ssmod.Model, columns: ArrayLike) -> ssmod.Model:
+        reduced = ssmod.Model(model.name)
+        variables = [reduced.create_variable(model.variables[col].name, self._lower[col], self._upper[col])
+                     for col in columns]
+
+        for row in np.flatnonzero(self._rows):
+            factors = self._matrix[row, columns]
+            nonzero = np.flatnonzero(factors)
+            expression = sseexp.Expression._from_factors(dict(zip(nonzero.tolist(), factors[nonzero].tolist())),
+                                                         {i: variables[i] for i in nonzero.tolist()})
+            constraint_type = ssecon.ConstraintType(int(self._senses[row]))
+            reduced.add_constraint(ssecon.Constraint(expression, float(self._bounds[row]), constraint_type))
+
+        costs = self._objective_costs[columns]
+        nonzero = np.flatnonzero(costs)
+        objective = sseexp.Expression._from_factors(dict(zip(nonzero.tolist(), costs[nonzero].tolist())),
+                                                    {i: variables[i] for i in nonzero.tolist()})
+        reduced.objective = sseobj.Objective(objective, model.objective.type)
+        return reduced
@@ -0,0 +1,343 @@
+from __future__ import annotations
+from typing import List, Tuple
+
+import saport.simplex.model as ssmod
+import saport.simplex.solver as ssslv
+import saport.simplex.solution as sssol
+import saport.simplex.tableau as sstab
+import saport.simplex.pricing as sspri
+import saport.simplex.scaling as ssscl
+import saport.simplex.stats as ssstat
+import saport.simplex.limits as sslim
+import saport.simplex.compiled_model as sscom
+import numpy as np
+import time
+from numpy.typing import ArrayLike
+
+
+class Basis:
+    """
+        A class to represent a factorized simplex basis kept in the product form of the inverse.
+
+        Attributes
+        ----------
+        matrix : numpy.Array
+            2d-array with all the columns of the problem (the basis is a subset of them)
+        columns : List[int]
+            indices of the basic columns, basic variable of the i-th row is columns[i]
+        refactorization_period : int
+            how many product-form updates are kept before the basis is factorized from scratch
+        factor : numpy.Array
+            inverse of the basis matrix computed during the last refactorization
+        etas : List[Tuple[int, numpy.Array]]
+            eta columns (with their rows) of the elementary matrices applied after the last refactorization
+
+        Methods
+        -------
+        __init__(matrix: array, columns: List[int], refactorization_period: int) -> Basis:
+            constructs and factorizes a basis made of the given columns
+        refactorize():
+            computes the factor from the current basic columns and drops the eta file
+        ftran(vector: array) -> array:
+            solves B y = vector
+        btran(vector: array) -> array:
+            solves y B = vector
+        replace(row: int, col: int, alpha: array):
+            replaces basic variable of the given row with the given column, alpha = ftran(matrix[:, col])
+        negate(row: int):
+            updates the factor after the basic column of the given row has been multiplied by -1
+    """
+    matrix: ArrayLike
+    columns: List[int]
+    refactorization_period: int
+    factor: ArrayLike
+    etas: List[Tuple[int, ArrayLike]]
+
+    def __init__(self, matrix: ArrayLike, columns: List[int], refactorization_period: int):
+        self.matrix = matrix
+        self.columns = list(columns)
+        self.refactorization_period = refactorization_period
+        self.refactorize()
+
+    def refactorize(self):
+        self.factor = np.linalg.inv(self.matrix[:, self.columns])
+        self.etas = []
+
+    def ftran(self, vector: ArrayLike) -> ArrayLike:
+        y = self.factor @ vector
+        for (row, eta) in self.etas:
+            pivot_value = y[row]
+            y += eta * pivot_value
+            y[row] = eta[row] * pivot_value
+        return y
+
+    def btran(self, vector: ArrayLike) -> ArrayLike:
+        y = np.array(vector, dtype=float)
+        for (row, eta) in reversed(self.etas):
+            y[row] = y @ eta
+        return y @ self.factor
+
+    def replace(self, row: int, col: int, alpha: ArrayLike):
+        self.columns[row] = col
+        if len(self.etas) >= self.refactorization_period:
+            self.refactorize()
+            return
+
+        eta = -alpha / alpha[row]
+        eta[row] = 1.0 / alpha[row]
+        self.etas.append((row, eta))
+
+    def negate(self, row: int):
+        eta = np.zeros(len(self.columns))
+        eta[row] = -1.0
+        self.etas.append((row, eta))
+
+
+class RevisedSolver(ssslv.Solver):
+    """
+        A class to represent a revised simplex solver.
+        Instead of updating the whole tableau, it keeps only a factorized basis and prices the columns
+        against the original constraint matrix, so every iteration costs O(m^2 + m*n) instead of O(m*n) writes.
+        The factor is an explicit inverse of the basis matrix, updated with eta columns (product form)
+        and recomputed every `refactorization_period` iterations to limit the error accumulation.
+        Upper bounds are handled like in the tableau: a variable reaching its bound is replaced by its complement.
+
+        Attributes
+        ----------
+        refactorization_period: int
+            how many iterations may pass between two refactorizations of the basis
+        _bounds: numpy.Array
+            right hand sides of the constraints in the currently solved model
+        _costs: numpy.Array
+            phase two objective coefficients of all the columns (artificial ones have 0)
+        _upper_bounds: numpy.Array
+            upper bounds of all the columns
+        _flipped: numpy.Array
+            whether the column represents the complement of its variable
+
+        Methods
+        -------
+        __init__(refactorization_period: int = 50, pricing: PricingType | str | PricingRule = "dantzig", presolve: bool = False, scaling: ScalingType | str | None = None, retention: RetentionType | str = "tableaux", callbacks: List[SolverCallback] | None = None, start: StartType | str = "crash", max_iterations: int | None = None, time_limit: float | None = None, cancellation: CancellationToken | None = None) -> RevisedSolver:
+            constructs a new solver with the given refactorization period, pricing rule, presolve, scaling and retention settings,
+            the callbacks, the way of finding the starting basis and the limits of every solve
+        solve(model: Model) -> Solution:
+            solves the given model and returns the first optimal solution
+    """
+    refactorization_period: int
+    _bounds: ArrayLike
+    _costs: ArrayLike
+    _upper_bounds: ArrayLike
+    _flipped: ArrayLike
+
+    def __init__(self, refactorization_period: int = 50, pricing: sspri.PricingType | str | sspri.PricingRule = "dantzig",
+                 presolve: bool = False, scaling: ssscl.ScalingType | str | None = None,
+                 retention: sssol.RetentionType | str = "tableaux", callbacks: List[ssstat.SolverCallback] = None,
+                 start: ssslv.StartType | str = "crash", max_iterations: int = None, time_limit: float = None,
+                 cancellation: sslim.CancellationToken = None):
+        super().__init__(pricing, presolve, scaling, retention, callbacks, start, max_iterations, time_limit, cancellation)
+        self.refactorization_period = refactorization_period
+
+    def _solve(self, model: ssmod.Model):
+        start = time.perf_counter()
+        normal_model, compiled = self._augment_model(model)
+        start = self.stats.lap("augmentation", start)
+        # the flips update the right hand sides in place, the compiled model keeps the original ones
+        matrix, self._bounds = compiled.matrix, compiled.bounds.copy()
+        rows_n, cols_n = matrix.shape
+
+        slack_rows = {row: col for (col, row) in {**self._slacks, **self._crashed}.items()}
+        artificial_rows = [r for r in range(rows_n) if r not in slack_rows]
+
+        artificial_columns = np.zeros((rows_n, len(artificial_rows)))
+        artificial_columns[artificial_rows, range(len(artificial_rows))] = 1.0
+        matrix = np.hstack([matrix, artificial_columns])
+        self._costs = np.concatenate([compiled.costs, np.zeros(len(artificial_rows))])
+        self._upper_bounds = np.concatenate([compiled.upper, np.full(len(artificial_rows), np.inf)])
+        self._flipped = np.zeros(matrix.shape[1], dtype=bool)
+
+        columns = []
+        for r in range(rows_n):
+            columns.append(slack_rows[r] if r in slack_rows else cols_n + artificial_rows.index(r))
+        basis = Basis(matrix, columns, self.refactorization_period)
+        self.stats.lap("tableau", start)
+
+        # artificial variables may leave the basis, but never enter it
+        allowed = np.arange(matrix.shape[1]) < cols_n
+        try:
+            return self._solve_from_basis(model, normal_model, compiled, basis, allowed, artificial_rows)
+        except ssslv._LimitReached as reached:
+            # the dense tableau is built only if the solution keeps it
+            if self.retention != sssol.RetentionType.NONE:
+                reached.tableau = self._basis_tableau(normal_model, basis, cols_n)
+            if reached.phase == ssstat.SolvePhase.PHASE_TWO:
+                reached.assignment = self._assignment(basis, basis.ftran(self._bounds), cols_n)
+            raise
+
+    def _solve_from_basis(self, model: ssmod.Model, normal_model: ssmod.Model, compiled: sscom.CompiledModel,
+                          basis: Basis, allowed: ArrayLike, artificial_rows: List[int]) -> sssol.Solution:
+        """
+            _solve_from_basis(model: Model, normal_model: Model, compiled: CompiledModel, basis: Basis, allowed: array, artificial_rows: List[int]) -> Solution:
+                runs the phases of the simplex starting from the slack (and artificial) basis
+        """
+        matrix = basis.matrix
+        cols_n = compiled.matrix.shape[1]
+        if len(artificial_rows) > 0:
+            # structural columns cost nothing in the first phase, so their flips don't affect it
+            phase_one_costs = np.where(allowed, 0.0, -1.0)
+            feasible = False
+            if self.start == ssslv.StartType.BIG_M:
+                composite_costs = np.where(allowed, self._costs, -self._big_m_weight(compiled))
+                values, bounded = self._iterate(basis, composite_costs, allowed, ssstat.SolvePhase.COMPOSITE)
+                # the penalty may be too small to tell an infeasible model from the unbounded or optimal one
+                feasible = bounded and phase_one_costs[basis.columns] @ values >= -sstab.eps
+            if not feasible:
+                values, _ = self._iterate(basis, phase_one_costs, np.ones(matrix.shape[1], dtype=bool),
+                                          ssstat.SolvePhase.PHASE_ONE)
+            if phase_one_costs[basis.columns] @ values < -sstab.eps:
+                tableau = self._basis_tableau(normal_model, basis, cols_n)
+                return sssol.Solution.infeasible(model, tableau, tableau)
+            self._drive_out_artificial_variables(basis, cols_n)
+
+        # the tableaux are dense, they're built only if the solution keeps them
+        retained = self.retention == sssol.RetentionType.TABLEAUX
+        initial_tableau = self._basis_tableau(normal_model, basis, cols_n) if retained else None
+        values, bounded = self._iterate(basis, self._costs, allowed, ssstat.SolvePhase.PHASE_TWO)
+        keeps_basis = self.retention != sssol.RetentionType.NONE
+        tableau = self._basis_tableau(normal_model, basis, cols_n) if keeps_basis else None
+
+        if not bounded:
+            return sssol.Solution.unbounded(model, initial_tableau, tableau)
+
+        return self._create_solution(self._assignment(basis, values, cols_n), model, initial_tableau, tableau,
+                                     compiled)
+
+    def _iterate(self, basis: Basis, costs: ArrayLike, allowed: ArrayLike,
+                 phase: ssstat.SolvePhase) -> Tuple[ArrayLike, bool]:
+        """
+            _iterate(basis: Basis, costs: array, allowed: array, phase: SolvePhase) -> (array, bool):
+                performs simplex iterations until optimality, updating the basis in place
+                returns values of the basic variables and whether the problem is bounded
+        """
+        start = time.perf_counter()
+        self.pricing.start(basis.matrix.shape[1], lambda: self._column_norms(basis))
+        values = basis.ftran(self._bounds)
+        self._start_phase(phase, self._objective_value(basis, costs, values))
+        bounded = True
+        now = time.perf_counter()
+        while True:
+            duals = basis.btran(costs[basis.columns])
+            # the same sign convention as in the cost row of the tableau, the rule decides which columns get priced
+            col = self.pricing.price(len(allowed), lambda columns: np.where(
+                allowed[columns], duals @ basis.matrix[:, columns] - costs[columns], np.inf))
+            if col is None:
+                self.stats.lap("pricing", now)
+                break
+            self._check_limits(phase, start)
+            now = self.stats.lap("pricing", now)
+
+            alpha = basis.ftran(basis.matrix[:, col])
+            quotients = self._leaving_quotients(basis, values, alpha)
+            if np.isinf(quotients).all() and np.isinf(self._upper_bounds[col]):
+                bounded = False
+                break
+
+            row = self.pricing.choose_leaving_row(quotients, basis.columns) if len(quotients) > 0 else None
+            now = self.stats.lap("ratio test", now)
+            if row is None or self._upper_bounds[col] < quotients[row]:
+                self._flip(basis, col, costs)
+                row = None
+            else:
+                if alpha[row] < 0:
+                    self._flip(basis, basis.columns[row], costs)
+                    alpha[row] *= -1
+                if self.pricing.needs_edge_information:
+                    unit = np.zeros(len(basis.columns))
+                    unit[row] = 1.0
+                    pivot_row = basis.btran(unit) @ basis.matrix
+                    self.pricing.update(row, col, basis.columns[row], alpha, pivot_row, lambda: basis.btran(alpha) @ basis.matrix)
+                basis.replace(row, col, alpha)
+            values = basis.ftran(self._bounds)
+            self.stats.lap("pivoting", now)
+            self._finish_iteration(phase, col, row, self._objective_value(basis, costs, values))
+            now = time.perf_counter()
+        self._end_phase(phase, start)
+        return values, bounded
+
+    def _objective_value(self, basis: Basis, costs: ArrayLike, values: ArrayLike) -> float:
+        """
+            _objective_value(basis: Basis, costs: array, values: array) -> float:
+                returns value of the given costs in the current basic solution,
+                flipped columns contribute their upper bounds (cost * (upper bound - complement))
+        """
+        return costs[basis.columns] @ values - costs[self._flipped] @ self._upper_bounds[self._flipped]
+
+    def _column_norms(self, basis: Basis) -> ArrayLike:
+        """
+            _column_norms(basis: Basis) -> array:
+                returns squared norms of the columns expressed in the given basis (the tableau columns)
+        """
+        basis.refactorize()
+        return ((basis.factor @ basis.matrix) ** 2).sum(axis=0)
+
+    def _leaving_quotients(self, basis: Basis, values: ArrayLike, alpha: ArrayLike) -> ArrayLike:
+        quotients = np.full(len(alpha), np.inf)
+        decreasing = alpha > sstab.eps
+        quotients[decreasing] = values[decreasing] / alpha[decreasing]
+
+        basic_upper_bounds = self._upper_bounds[basis.columns]
+        increasing = (alpha < -sstab.eps) & np.isfinite(basic_upper_bounds)
+        quotients[increasing] = (basic_upper_bounds[increasing] - values[increasing]) / -alpha[increasing]
+        return quotients
+
+    def _flip(self, basis: Basis, col: int, costs: ArrayLike):
+        """
+            _flip(basis: Basis, col: int, costs: array):
+                substitutes the variable of the given column with its complement (upper bound - variable)
+        """
+        self._bounds -= self._upper_bounds[col] * basis.matrix[:, col]
+        basis.matrix[:, col] *= -1
+        self._costs[col] *= -1
+        if costs is not self._costs:
+            costs[col] *= -1
+        self._flipped[col] = not self._flipped[col]
+        if col in basis.columns:
+            basis.negate(basis.columns.index(col))
+
+    def _assignment(self, basis: Basis, values: ArrayLike, cols_n: int) -> List[float]:
+        assignment = np.zeros(cols_n)
+        for (row, col) in enumerate(basis.columns):
+            if col < cols_n:
+                assignment[col] = values[row]
+        flipped = self._flipped[:cols_n]
+        assignment[flipped] = self._upper_bounds[:cols_n][flipped] - assignment[flipped]
+        return assignment.tolist()
+
+    def _drive_out_artificial_variables(self, basis: Basis, cols_n: int):
+        for (row, col) in enumerate(basis.columns):
+            if col < cols_n:
+                continue
+            unit = np.zeros(len(basis.columns))
+            unit[row] = 1.0
+            row_factors = basis.btran(unit) @ basis.matrix[:, :cols_n]
+            candidates = np.flatnonzero(np.abs(row_factors) > sstab.eps)
+            # when there is no candidate, the constraint is redundant and the artificial variable stays at 0
+            if len(candidates) > 0:
+                entering = candidates[0]
+                basis.replace(row, entering, basis.ftran(basis.matrix[:, entering]))
+
+    def _basis_tableau(self, model: ssmod.Model, basis: Basis, cols_n: int) -> sstab.Tableau:
+        """
+            _basis_tableau(model: Model, basis: Basis, cols_n: int) -> Tableau:
+                returns a tableau corresponding to the given basis, without the artificial columns
+        """
+        basis.refactorize()
+        body = basis.factor @ np.hstack([basis.matrix[:, :cols_n], self._bounds[:, np.newaxis]])
+        costs = self._costs[:cols_n]
+        flipped = self._flipped[:cols_n]
+        objective_row = self._costs[basis.columns] @ body
+        objective_row[:-1] -= costs
+        objective_row[-1] -= costs[flipped] @ self._upper_bounds[:cols_n][flipped]
+        table = np.vstack([objective_row, body])
+        # artificial variables left in the basis mark the redundant rows, which have no basic variable in the tableau
+        tableau_basis = [col if col < cols_n else -1 for col in basis.columns]
+        return sstab.Tableau(model, table, self._upper_bounds[:cols_n], flipped, tableau_basis)
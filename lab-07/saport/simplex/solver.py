@@ -1,15 +1,59 @@
 from __future__ import annotations
 import sys
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-from copy import deepcopy
+from copy import copy
+from enum import Enum
+from numpy.typing import ArrayLike
+from saport.simplex.exceptions import BatchSizeError
 import saport.simplex.model as ssmod
 import saport.simplex.expressions.objective as sseobj
 import saport.simplex.expressions.constraint as ssecon
 import saport.simplex.expressions.expression as sseexp
 import saport.simplex.solution as sssol
 import saport.simplex.tableau as sstab
+import saport.simplex.pricing as sspri
+import saport.simplex.compiled_model as sscom
+import saport.simplex.presolve as ssprs
+import saport.simplex.scaling as ssscl
+import saport.simplex.stats as ssstat
+import saport.simplex.limits as sslim
 import numpy as np
+import time
+
+# weight of the artificial variables in the composite objective, relative to the largest cost
+big_m = 1000.0
+
+
+class StartType(Enum):
+    """
+    An enum representing the ways of finding the starting basis for the rows without a slack variable:
+    - TWO_PHASE = every such row gets an artificial variable removed in the first phase
+    - CRASH = columns with a single coefficient become basic in their rows if it keeps them feasible,
+              only the remaining rows get the artificial variables
+    - BIG_M = the crash basis, the remaining artificial variables are penalized in a composite objective
+              optimized in a single phase, the first phase runs only if the penalty doesn't remove them
+    """
+    TWO_PHASE = "two_phase"
+    CRASH = "crash"
+    BIG_M = "big_m"
+
+
+class _LimitReached(Exception):
+    """
+        Raised inside the solver when a limit stops the iterations, it carries the state the solution is made of:
+        the phase, the current tableau (if the engine has one) and the assignment of all the columns
+        (if the engine computes it without the tableau), it never leaves the solver
+    """
+
+    def __init__(self, limit: sslim.LimitType, phase: ssstat.SolvePhase, tableau: sstab.Tableau = None,
+                 assignment: List[float] = None):
+        super().__init__(limit.value)
+        self.limit = limit
+        self.phase = phase
+        self.tableau = tableau
+        self.assignment = assignment
+
 
 class Solver:
     """
@@ -17,186 +61,782 @@ class Solver:
 
         Attributes:
         ______
-        _slacks: Dict[Variable, Constraint]:
-            contains mapping from slack variables to their corresponding constraints
-        _surpluses: Dict[Variable, Constraint]:
-            contains mapping from surplus variables to their corresponding constraints
-        _artificial: Dict[Variable, Constraint]:
-            contains mapping from artificial variables to their corresponding constraints
+        pricing: PricingRule
+            rule choosing the variables entering the basis
+        presolve: bool
+            whether the model is reduced by the presolve before it's solved
+        scaling: ScalingType | str | None
+            how the rows and columns of the augmented model are scaled, None disables the scaling
+        retention: RetentionType
+            how much of the solver state is kept in the solutions: nothing, the final basis or both tableaux
+        start: StartType
+            how the starting basis is found for the rows without a slack variable
+        callbacks: List[SolverCallback]
+            hooks notified about the phases and iterations of the simplex
+        max_iterations: int | None
+            number of iterations after which the solve stops, None for no limit
+        time_limit: float | None
+            wall time in seconds after which the solve stops, None for no limit
+        cancellation: CancellationToken | None
+            token stopping the solve once it's cancelled
+        iterations: int
+            number of iterations performed by the last solve (pivots and bound flips of all the phases)
+        stats: SolveStats
+            statistics of the last solve, the same object is attached to its solution
+        _slacks: Dict[int, int]:
+            contains mapping from columns of the slack variables to the rows of their constraints
+        _surpluses: Dict[int, int]:
+            contains mapping from columns of the surplus variables to the rows of their constraints
+        _crashed: Dict[int, int]:
+            contains mapping from columns basic in the crash basis to the rows they're basic in
+        _artificial: Dict[int, int]:
+            contains mapping from columns of the artificial variables to the rows of their constraints
+        _row_factors: numpy.Array
+            factors the rows of the compiled model have been multiplied by during the augmentation
+        _warm_tableau: Tableau | None
+            the last optimal tableau of the batch, the next scenario starts from it
 
         Methods
         -------
-        solve(model: Model) -> Tableau:
+        __init__(pricing: PricingType | str | PricingRule = "dantzig", presolve: bool = False, scaling: ScalingType | str | None = None, retention: RetentionType | str = "tableaux", callbacks: List[SolverCallback] | None = None, start: StartType | str = "crash", max_iterations: int | None = None, time_limit: float | None = None, cancellation: CancellationToken | None = None) -> Solver:
+            constructs a new solver using the given pricing rule (or its name), presolve, scaling and retention settings,
+            the callbacks, the way of finding the starting basis and the limits of every solve
+        solve(model: Model) -> Solution:
             solves the given model and return the first solution
+            with the presolve, tableaux of the solution correspond to the reduced model
+            with the scaling, tableaux of the solution correspond to the scaled model, the assignment is unscaled
+            the limits are checked before every iteration, a solve stopped by one of them returns a solution
+            with the "limit reached" status, the last basis and, in the second phase, the last (feasible) assignment
+        resolve(solution: Solution, constraint: Constraint) -> Solution:
+            solves the model of the given solution extended with the new constraint
+            starts from the optimal tableau of the solution and restores feasibility with the dual simplex
+            solutions of the presolved models, stopped by a limit or without the retained tableau are solved again from scratch
+        solve_batch(model: Model, rhs_list: List[array] | None = None, cost_list: List[array] | None = None) -> List[Solution]:
+            solves the scenarios of the model differing only in the right hand sides and/or the objective coefficients
+            every scenario starts from the optimal tableau of the previous one: the dual simplex restores feasibility
+            after the right hand sides change, the primal one optimality after the costs change
+            the scenarios are solved from scratch only if neither is possible, the presolve is never used
     """
-    _slacks: Dict[sseexp.Variable, ssecon.Constraint]
-    _surpluses: Dict[sseexp.Variable, ssecon.Constraint]
-    _artificial: Dict[sseexp.Variable, ssecon.Constraint]
+    _slacks: Dict[int, int]
+    _surpluses: Dict[int, int]
+    _crashed: Dict[int, int]
+    _artificial: Dict[int, int]
+    _row_factors: ArrayLike
+    _warm_tableau: sstab.Tableau
+    pricing: sspri.PricingRule
+    presolve: bool
+    scaling: ssscl.ScalingType | str | None
+    retention: sssol.RetentionType
+    start: StartType
+    callbacks: List[ssstat.SolverCallback]
+    max_iterations: int | None
+    time_limit: float | None
+    cancellation: sslim.CancellationToken | None
+    iterations: int
+    stats: ssstat.SolveStats
+
+    def __init__(self, pricing: sspri.PricingType | str | sspri.PricingRule = "dantzig", presolve: bool = False,
+                 scaling: ssscl.ScalingType | str | None = None, retention: sssol.RetentionType | str = "tableaux",
+                 callbacks: List[ssstat.SolverCallback] = None, start: StartType | str = "crash",
+                 max_iterations: int = None, time_limit: float = None, cancellation: sslim.CancellationToken = None):
+        self.pricing = sspri.PricingFactory.rule(pricing)
+        self.presolve = presolve
+        self.scaling = scaling
+        self.retention = sssol.RetentionType(retention)
+        self.start = StartType(start)
+        self.callbacks = [] if callbacks is None else list(callbacks)
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
+        self.cancellation = cancellation
+        self.iterations = 0
+        self.stats = ssstat.SolveStats()
+        self._scaling = None
+        self._started = 0.0
 
     def solve(self, model: ssmod.Model):
-        normal_model = self._augment_model(model)
-        if len(self._slacks) < len(normal_model.constraints):
-            tableau, success = self._presolve(normal_model)
+        return self._run(lambda: self._solve_model(model))
+
+    def resolve(self, solution: sssol.Solution, constraint: ssecon.Constraint):
+        return self._run(lambda: self._resolve(solution, constraint))
+
+    def solve_batch(self, model: ssmod.Model, rhs_list: List[ArrayLike] = None,
+                    cost_list: List[ArrayLike] = None) -> List[sssol.Solution]:
+        sizes = [len(values) for values in [rhs_list, cost_list] if values is not None]
+        if len(set(sizes)) > 1:
+            raise BatchSizeError(*sizes)
+
+        # the lower bounds are shifted the same way in every scenario
+        compiled = model.compile()
+        shifts = compiled.matrix @ compiled.lower
+        retention = self.retention
+        # warm starts need the final tableaux, the solutions get the requested retention afterwards
+        self.retention = sssol.RetentionType.TABLEAUX
+        self._warm_tableau = None
+        solutions = []
+        try:
+            for scenario in range(sizes[0] if len(sizes) > 0 else 0):
+                bounds = None if rhs_list is None else np.asarray(rhs_list[scenario], dtype=float)
+                costs = None if cost_list is None else np.asarray(cost_list[scenario], dtype=float)
+                scenario_model = self._scenario_model(model, bounds, costs)
+                shifted_bounds = None if bounds is None else bounds - shifts
+                solution = self._run(lambda: self._solve_scenario(scenario_model, shifted_bounds, costs))
+                solution.retain(retention)
+                solutions.append(solution)
+        finally:
+            self.retention = retention
+            self._warm_tableau = None
+        return solutions
+
+    def _scenario_model(self, model: ssmod.Model, bounds: ArrayLike | None, costs: ArrayLike | None) -> ssmod.Model:
+        """
+            _scenario_model(model: Model, bounds: array | None, costs: array | None) -> Model:
+                returns a shallow copy of the model with the given right hand sides and objective coefficients
+                sharing the variables and the expressions of the constraints
+        """
+        scenario = copy(model)
+        if bounds is not None:
+            scenario.constraints = [copy(constraint) for constraint in model.constraints]
+            for (constraint, bound) in zip(scenario.constraints, bounds.tolist()):
+                constraint.bound = bound
+        if costs is not None:
+            nonzero = np.flatnonzero(costs).tolist()
+            expression = sseexp.Expression._from_factors(dict(zip(nonzero, costs[nonzero].tolist())),
+                                                         {i: model.variables[i] for i in nonzero})
+            scenario.objective = sseobj.Objective(expression, model.objective.type)
+        return scenario
+
+    def _solve_scenario(self, model: ssmod.Model, bounds: ArrayLike | None, costs: ArrayLike | None) -> sssol.Solution:
+        """
+            _solve_scenario(model: Model, bounds: array | None, costs: array | None) -> Solution:
+                solves the scenario of the batch, bounds are its right hand sides with the lower bounds shifted,
+                None marks the values shared with the scenario of the warm tableau
+        """
+        try:
+            solution = None if self._warm_tableau is None else self._warm_solve(model, bounds, costs)
+        except _LimitReached as reached:
+            return self._limit_solution(model, reached)
+        if solution is None:
+            solution = self._solve_within_limits(model)
+            # the next scenarios have to match the augmentation of the last solved from scratch
+            self._warm_tableau = solution.tableau if solution.has_assignment() else None
+        elif solution.has_assignment():
+            self._warm_tableau = solution.tableau
+        return solution
+
+    def _warm_solve(self, model: ssmod.Model, bounds: ArrayLike | None, costs: ArrayLike | None) -> sssol.Solution | None:
+        """
+            _warm_solve(model: Model, bounds: array | None, costs: array | None) -> Solution | None:
+                solves the scenario starting from the warm tableau, updated with the new right hand sides and costs
+                returns None if the basis of the tableau is neither primal nor dual feasible for the scenario
+        """
+        start = time.perf_counter()
+        warm_tableau = self._warm_tableau
+        tableau = warm_tableau.copy()
+        tableau.model = copy(warm_tableau.model)
+        tableau.model.constraints = model.constraints
+        self._track_objective(model)
+        if bounds is not None and not self._set_basic_values(tableau, bounds):
+            return None
+        if costs is not None:
+            augmented_costs = costs * model.objective.type.value
+            if self._scaling is not None:
+                augmented_costs = augmented_costs * self._scaling.column_scales[:len(costs)]
+            augmented_costs = np.pad(augmented_costs, (0, len(tableau.upper_bounds) - len(costs)))
+            tableau.model.objective = copy(model.objective)
+            if tableau.model.objective.type == sseobj.ObjectiveType.MIN:
+                tableau.model.objective.invert()
+        else:
+            augmented_costs = self._compiled.costs
+        augmented = copy(self._compiled)
+        augmented.costs = augmented_costs
+        self._set_objective_row(tableau, augmented_costs)
+        self._fix_objective_row_to_the_basis(tableau, tableau.basis)
+        self.stats.lap("tableau", start)
+
+        if tableau.choose_dual_leaving_variable() is not None:
+            if not tableau.is_optimal():
+                return None
+            if not self._dual_optimize(tableau):
+                return sssol.Solution.infeasible(model, warm_tableau, tableau)
+        if not self._optimize(tableau):
+            return sssol.Solution.unbounded(model, warm_tableau, tableau)
+        return self._create_solution(tableau.extract_assignment(), model, warm_tableau, tableau, augmented)
+
+    def _set_basic_values(self, tableau: sstab.Tableau, bounds: ArrayLike) -> bool:
+        """
+            _set_basic_values(tableau: Tableau, bounds: array) -> bool:
+                replaces the right hand side of the tableau with the basic values for the given (shifted) bounds,
+                returns False if the tableau lost its redundant rows, so the values can't be computed
+        """
+        basis = np.asarray(tableau.basis)
+        if len(basis) != len(bounds) or (basis < 0).any():
+            return False
+        matrix, flipped = self._compiled.matrix, tableau.flipped
+        bounds = self._row_factors * bounds - matrix[:, flipped] @ tableau.upper_bounds[flipped]
+        basic_matrix = matrix[:, basis] * np.where(flipped[basis], -1.0, 1.0)
+        tableau.table[1:, -1] = np.linalg.solve(basic_matrix, bounds)
+        return True
+
+    def _run(self, solve) -> sssol.Solution:
+        """
+            _run(solve: Callable[[], Solution]) -> Solution:
+                runs the solve with fresh statistics and attaches them (with the iterations) to the returned solution
+        """
+        self.iterations = 0
+        self.stats = ssstat.SolveStats()
+        start = self._started = time.perf_counter()
+        solution = solve()
+        self.stats.lap("total", start)
+        solution.iterations = self.iterations
+        solution.stats = self.stats
+        solution.retain(self.retention)
+        return solution
+
+    def _solve_model(self, model: ssmod.Model):
+        return self._solve_presolved(model) if self.presolve else self._solve_within_limits(model)
+
+    def _solve_presolved(self, model: ssmod.Model):
+        start = time.perf_counter()
+        presolved = ssprs.Presolver().presolve(model)
+        self.stats.lap("presolve", start)
+        if presolved.is_infeasible:
+            reduced_solution = sssol.Solution.infeasible(presolved.model, None, None)
+        elif len(presolved.model.variables) == 0:
+            # every variable got fixed, there is nothing left to optimize
+            reduced_solution = sssol.Solution.with_assignment(presolved.model, [], None, None)
+        else:
+            reduced_solution = self._solve_within_limits(presolved.model)
+        return presolved.postsolve_solution(reduced_solution)
+
+    def _solve_within_limits(self, model: ssmod.Model) -> sssol.Solution:
+        """
+            _solve_within_limits(model: Model) -> Solution:
+                solves the model, returns the solution of the state the solve stopped in if a limit is reached
+        """
+        try:
+            return self._solve(model)
+        except _LimitReached as reached:
+            return self._limit_solution(model, reached)
+
+    def _limit_solution(self, model: ssmod.Model, reached: _LimitReached) -> sssol.Solution:
+        """
+            _limit_solution(model: Model, reached: _LimitReached) -> Solution:
+                returns the solution with the "limit reached" status, the basic solution of the second phase is feasible,
+                so it becomes the assignment, the earlier phases give no assignment
+        """
+        assignment = reached.assignment
+        if assignment is None and reached.tableau is not None and reached.phase == ssstat.SolvePhase.PHASE_TWO:
+            assignment = reached.tableau.extract_assignment()
+        if assignment is None:
+            return sssol.Solution.limit_reached(model, reached.limit, None, reached.tableau)
+        solution = self._create_solution(list(assignment), model, None, reached.tableau)
+        solution.limit = reached.limit
+        return solution
+
+    def _solve(self, model: ssmod.Model):
+        start = time.perf_counter()
+        normal_model, compiled = self._augment_model(model)
+        start = self.stats.lap("augmentation", start)
+        if len(self._slacks) + len(self._crashed) < len(normal_model.constraints):
+            tableau, success = self._presolve(normal_model, compiled)
             if not success:
                 return sssol.Solution.infeasible(model, tableau, tableau)
         else:
-            tableau = self._basic_initial_tableau(normal_model)
+            tableau = self._basic_initial_tableau(normal_model, compiled)
+            self.stats.lap("tableau", start)
 
-        initial_tableau = deepcopy(tableau)
+        initial_tableau = tableau.copy() if self.retention == sssol.RetentionType.TABLEAUX else None
         if self._optimize(tableau) == False:
             return sssol.Solution.unbounded(model, initial_tableau, tableau)
 
         assignment = tableau.extract_assignment()
-        return self._create_solution(assignment, model, initial_tableau, tableau)
+        return self._create_solution(assignment, model, initial_tableau, tableau, self._compiled)
+
+    def _resolve(self, solution: sssol.Solution, constraint: ssecon.Constraint):
+        model = copy(solution.model)
+        model.constraints = list(model.constraints)
+        model.add_constraint(constraint)
+
+        if solution.limit is not None:
+            # the tableau of a stopped solve isn't optimal, so the dual simplex can't start from it
+            return self._solve_model(model)
+        if not solution.is_feasible:
+            return sssol.Solution.infeasible(model, solution.initial_tableau, solution.tableau)
+        if not solution.has_assignment() or solution.presolved is not None or solution.tableau is None:
+            # an unbounded model has no optimal tableau to start from
+            # and the tableau of a presolved one doesn't match the model
+            return self._solve_model(model)
+
+        tableau = solution.tableau
+        self._scaling = solution.scaling
+        self._track_objective(solution.model)
+        for (name, coefficients, bound) in self._tableau_rows(constraint, solution.model, tableau):
+            augmented_model = copy(tableau.model)
+            augmented_model.variables = tableau.model.variables + [sseexp.Variable(name, len(tableau.model.variables))]
+            # slacks of the previously added rows don't appear in the constraint
+            coefficients = np.pad(coefficients, (0, len(tableau.upper_bounds) - len(coefficients)))
+            tableau = tableau.with_constraint(augmented_model, coefficients, bound)
+
+        try:
+            feasible = self._dual_optimize(tableau)
+        except _LimitReached as reached:
+            return self._limit_solution(model, reached)
+        if not feasible:
+            return sssol.Solution.infeasible(model, solution.tableau, tableau)
 
-    def _optimize(self, tableau: sstab.Tableau):
-        while not tableau.is_optimal():
-            pivot_col = tableau.choose_entering_variable()
-            if tableau.is_unbounded(pivot_col):
-                return False
-            pivot_row = tableau.choose_leaving_variable(pivot_col)
+        assignment = tableau.extract_assignment()
+        return self._create_solution(assignment, model, solution.tableau, tableau)
 
+    def _tableau_rows(self, constraint: ssecon.Constraint, model: ssmod.Model, tableau: sstab.Tableau):
+        """
+            _tableau_rows(constraint: Constraint, model: Model, tableau: Tableau) -> List[(str, array, float)]:
+                returns the constraint as "less than or equal" rows over the tableau columns (with the names of their slacks),
+                taking into account the shifted lower bounds and the flipped columns
+        """
+        original_coefficients = np.array(constraint.expression.coefficients(model))
+        coefficients = np.zeros(len(tableau.upper_bounds))
+        coefficients[:len(original_coefficients)] = original_coefficients
+        bound = constraint.bound - original_coefficients @ np.array([var.lower for var in model.variables])
+        if self._scaling is not None:
+            # the tableau columns correspond to the scaled variables
+            coefficients[:len(original_coefficients)] *= self._scaling.column_scales[:len(original_coefficients)]
+
+        flipped = tableau.flipped
+        bound -= coefficients[flipped] @ tableau.upper_bounds[flipped]
+        coefficients[flipped] *= -1
+
+        name = f"s{constraint.index}"
+        return {
+            ssecon.ConstraintType.LE: [(name, coefficients, bound)],
+            ssecon.ConstraintType.GE: [(name, -coefficients, -bound)],
+            ssecon.ConstraintType.EQ: [(f"{name}+", coefficients, bound), (f"{name}-", -coefficients, -bound)]
+        }[constraint.type]
+
+    def _dual_optimize(self, tableau: sstab.Tableau):
+        """
+            _dual_optimize(tableau: Tableau) -> bool:
+                restores the primal feasibility of the dual feasible tableau, returns False if the problem is infeasible
+        """
+        start = time.perf_counter()
+        self._start_phase(ssstat.SolvePhase.DUAL, tableau.objective_value())
+        feasible = True
+        now = time.perf_counter()
+        while True:
+            pivot_row = tableau.choose_dual_leaving_variable()
+            now = self.stats.lap("pricing", now)
+            if pivot_row is None:
+                break
+            self._check_limits(ssstat.SolvePhase.DUAL, start, tableau)
+
+            if tableau.table[pivot_row, -1] > 0:
+                # the basic variable exceeds its upper bound, so its complement is negative instead
+                tableau.flip(tableau.basis[pivot_row - 1])
+            pivot_col = tableau.choose_dual_entering_variable(pivot_row)
+            now = self.stats.lap("ratio test", now)
+            if pivot_col is None:
+                feasible = False
+                break
             tableau.pivot(pivot_row, pivot_col)
-        return True
-
-    def _presolve(self, model: ssmod.Model):
+            self.stats.lap("pivoting", now)
+            self._finish_iteration(ssstat.SolvePhase.DUAL, pivot_col, pivot_row - 1, tableau.objective_value())
+            now = time.perf_counter()
+        self._end_phase(ssstat.SolvePhase.DUAL, start)
+        return feasible
+
+    def _optimize(self, tableau: sstab.Tableau, phase: ssstat.SolvePhase = ssstat.SolvePhase.PHASE_TWO):
+        start = time.perf_counter()
+        self.pricing.start(len(tableau.upper_bounds), lambda: (tableau.table[1:, :-1] ** 2).sum(axis=0))
+        self._start_phase(phase, tableau.objective_value())
+        bounded = True
+        now = time.perf_counter()
+        while True:
+            # the pivots keep the whole cost row up to date, the rule may scan just a part of it
+            cost_row = tableau.objective_factors()
+            pivot_col = self.pricing.price(len(cost_row), lambda columns: cost_row[columns])
+            if pivot_col is None:
+                break
+            self._check_limits(phase, start, tableau)
+            now = self.stats.lap("pricing", now)
+            if tableau.is_unbounded(pivot_col):
+                bounded = False
+                break
+            pivot_row = tableau.choose_leaving_variable(pivot_col, self.pricing)
+            now = self.stats.lap("ratio test", now)
+            if pivot_row is None:
+                # the entering variable reaches its upper bound before any basic variable hits a bound
+                tableau.flip(pivot_col)
+            else:
+                if tableau.table[pivot_row, pivot_col] < 0:
+                    # the leaving variable reaches its upper bound, so its complement leaves at 0 instead
+                    tableau.flip(tableau.basis[pivot_row - 1])
+                if self.pricing.needs_edge_information:
+                    pivot_column = tableau.table[1:, pivot_col]
+                    self.pricing.update(pivot_row - 1, pivot_col, tableau.basis[pivot_row - 1], pivot_column,
+                                        tableau.table[pivot_row, :-1], lambda: pivot_column @ tableau.table[1:, :-1])
+                tableau.pivot(pivot_row, pivot_col)
+            self.stats.lap("pivoting", now)
+            leaving = None if pivot_row is None else pivot_row - 1
+            self._finish_iteration(phase, pivot_col, leaving, tableau.objective_value())
+            now = time.perf_counter()
+        if bounded:
+            # the last optimality check
+            self.stats.lap("pricing", now)
+        self._end_phase(phase, start)
+        return bounded
+
+    def _track_objective(self, model: ssmod.Model):
+        """
+            _track_objective(model: Model):
+                remembers how the objective of the augmented model (maximized, with lower bounds shifted to 0)
+                maps to the objective of the given model, the objective is invariant to the scaling
+        """
+        self._objective_sign = model.objective.type.value
+        self._objective_offset = model.objective.evaluate([var.lower for var in model.variables])
+
+    def _start_phase(self, phase: ssstat.SolvePhase, objective: float):
+        objective = self._phase_objective(phase, objective)
+        self.stats.record(phase, objective)
+        for callback in self.callbacks:
+            callback.on_phase_start(phase, objective)
+
+    def _finish_iteration(self, phase: ssstat.SolvePhase, entering: int, leaving: int | None, objective: float):
+        self.iterations += 1
+        self.stats.iterations[phase] += 1
+        objective = self._phase_objective(phase, objective)
+        self.stats.record(phase, objective)
+        for callback in self.callbacks:
+            callback.on_iteration(phase, self.stats.iterations[phase], int(entering), leaving, objective)
+
+    def _end_phase(self, phase: ssstat.SolvePhase, start: float):
+        self.stats.lap(phase.value, start)
+        for callback in self.callbacks:
+            callback.on_phase_end(phase, self.stats.iterations[phase])
+
+    def _check_limits(self, phase: ssstat.SolvePhase, start: float, tableau: sstab.Tableau = None):
+        """
+            _check_limits(phase: SolvePhase, start: float, tableau: Tableau | None):
+                called before every iteration, if any limit is reached it ends the phase (started at start)
+                and raises _LimitReached with the current tableau
+        """
+        limit = None
+        if self.cancellation is not None and self.cancellation.is_cancelled():
+            limit = sslim.LimitType.CANCELLED
+        elif self.max_iterations is not None and self.iterations >= self.max_iterations:
+            limit = sslim.LimitType.ITERATIONS
+        elif self.time_limit is not None and time.perf_counter() - self._started >= self.time_limit:
+            limit = sslim.LimitType.TIME
+        if limit is not None:
+            self._end_phase(phase, start)
+            raise _LimitReached(limit, phase, tableau)
+
+    def _phase_objective(self, phase: ssstat.SolvePhase, objective: float) -> float:
+        if phase in [ssstat.SolvePhase.PHASE_ONE, ssstat.SolvePhase.COMPOSITE]:
+            return objective
+        return self._objective_sign * objective + self._objective_offset
+
+    def _presolve(self, model: ssmod.Model, compiled: sscom.CompiledModel):
         """
-            _presolve(model: Model) -> Tableau:
+            _presolve(model: Model, compiled: CompiledModel) -> Tableau:
                 returns a initial tableau for the second phase of simplex
         """
-        presolve_model = self._create_presolve_model(model)
-        tableau = self._presolve_initial_tableau(presolve_model)
-
-        self._optimize(tableau)
+        start = time.perf_counter()
+        presolve_model = self._create_presolve_model(model, compiled)
+        weight = self._big_m_weight(compiled) if self.start == StartType.BIG_M else None
+        tableau = self._presolve_initial_tableau(presolve_model, compiled, weight)
+        self.stats.lap("tableau", start)
+
+        if weight is None:
+            self._optimize(tableau, ssstat.SolvePhase.PHASE_ONE)
+        elif not self._optimize(tableau, ssstat.SolvePhase.COMPOSITE) or self._artifical_variables_are_positive(tableau):
+            # the penalty may be too small to tell an infeasible model from the unbounded or optimal one
+            self._set_phase_one_objective_row(tableau)
+            self._optimize(tableau, ssstat.SolvePhase.PHASE_ONE)
 
         if self._artifical_variables_are_positive(tableau):
             return (tableau, False)
 
-        tableau = self._restore_initial_tableau(tableau, model)
+        start = time.perf_counter()
+        tableau = self._restore_initial_tableau(tableau, model, compiled)
+        self.stats.lap("tableau", start)
         return (tableau, True)
 
-    def _augment_model(self, original_model: ssmod.Model):
+    def _augment_model(self, original_model: ssmod.Model) -> Tuple[ssmod.Model, sscom.CompiledModel]:
         """
-            _augment_model(model: Model) -> Model:
-                returns an augmented version of the given model
+            _augment_model(model: Model) -> (Model, CompiledModel):
+                returns the augmented version of the given model: its compiled arrays in the standard form
+                (maximized objective, lower bounds shifted to 0, nonnegative bounds, slack and surplus columns)
+                and a lightweight view of the model naming all the columns, the given model is never modified
         """
-        model = deepcopy(original_model)
-        model.simplify()
-        self._change_objective_to_max(model)
-        self._change_constraints_bounds_to_nonnegative(model)
-        self._slacks = self._add_slack_variables(model)
-        self._surpluses = self._add_surplus_variables(model)
-        return model
-
-    def _create_presolve_model(self, augmented_model: ssmod.Model):
-        presolve_model = deepcopy(augmented_model)
-        self._artificial = self._add_artificial_variables(presolve_model)
+        compiled = original_model.compile()
+        self._track_objective(original_model)
+        self._row_factors = np.ones(len(compiled.bounds))
+        self._change_objective_to_max(compiled)
+        self._shift_lower_bounds_to_zero(compiled)
+        self._change_constraints_bounds_to_nonnegative(compiled)
+        self._slacks = self._add_slack_variables(compiled)
+        self._surpluses = self._add_surplus_variables(compiled)
+        compiled = self._scale(compiled)
+        self._crashed = self._crash_basis(compiled)
+        self._compiled = compiled
+        return self._augmented_view(original_model, compiled), compiled
+
+    def _augmented_view(self, model: ssmod.Model, compiled: sscom.CompiledModel) -> ssmod.Model:
+        """
+            _augmented_view(model: Model, compiled: CompiledModel) -> Model:
+                returns a shallow copy of the model sharing its variables and constraints,
+                extended with the slack and surplus variables and the maximized objective
+        """
+        view = copy(model)
+        added = sorted({**self._slacks, **self._surpluses}.items())
+        view.variables = model.variables + [sseexp.Variable(f"s{row}", col) for (col, row) in added]
+        view.objective = copy(model.objective)
+        if view.objective.type == sseobj.ObjectiveType.MIN:
+            view.objective.invert()
+        return view
+
+    def _create_presolve_model(self, augmented_model: ssmod.Model, compiled: sscom.CompiledModel) -> ssmod.Model:
+        self._artificial = self._add_artificial_variables(compiled)
+        presolve_model = copy(augmented_model)
+        presolve_model.variables = augmented_model.variables + \
+            [sseexp.Variable(f"R{row}", col) for (col, row) in self._artificial.items()]
         return presolve_model
 
-    def _change_objective_to_max(self, model: ssmod.Model):
-        if model.objective.type == sseobj.ObjectiveType.MIN:
-            model.objective.invert()
-
-
-    def _change_constraints_bounds_to_nonnegative(self, model: ssmod.Model):
-        for constraint in model.constraints:
-            if constraint.bound < 0:
-                constraint.invert()
-
-    def _add_slack_variables(self, model: ssmod.Model) -> List[sseexp.Variable]:
-        slacks: Dict[sseexp.Variable, ssecon.Constraint] = dict()
-
-        for constraint in model.constraints:
-            if constraint.type == ssecon.ConstraintType.LE:
-                slack_var = model.create_variable(f"s{constraint.index}")
-                slacks[slack_var] = constraint
-                constraint.expression += slack_var
-                constraint.type = ssecon.ConstraintType.EQ
-        return slacks
-
-    def _add_surplus_variables(self, model: ssmod.Model) -> List[sseexp.Variable]:
-        surpluses: Dict[sseexp.Variable, ssecon.Constraint] = dict()
-        for constraint in model.constraints:
-            if constraint.type == ssecon.ConstraintType.GE:
-                surplus_var = model.create_variable(f"s{constraint.index}")
-                surpluses[surplus_var] = constraint
-                constraint.expression -= surplus_var
-                constraint.type = ssecon.ConstraintType.EQ
-        return surpluses
-
-    def _add_artificial_variables(self, model: ssmod.Model):
-        artificial_variables: Dict[sseexp.Variable, ssecon.Constraint] = dict()
-        for constraint in model.constraints.copy():
-            if len([c for c in self._slacks.values() if c.index == constraint.index]) > 0:
-                continue
-            artificial_var = model.create_variable(f"R{constraint.index}")
-            artificial_variables[artificial_var] = constraint
-            constraint.expression += artificial_var
-        return artificial_variables
+    def _change_objective_to_max(self, compiled: sscom.CompiledModel):
+        compiled.costs = compiled.costs * compiled.objective_type.value
+        compiled.objective_type = sseobj.ObjectiveType.MAX
 
-    def _presolve_initial_tableau(self, model: ssmod.Model):
-        objective_row = np.array([0.0 for _ in model.variables] + [0.0])
+    def _shift_lower_bounds_to_zero(self, compiled: sscom.CompiledModel):
+        """
+            substitutes every variable x with x' + lower, so all the variables are bounded from below by 0
+            the substitution is reverted when the solution is created
+        """
+        compiled.bounds = compiled.bounds - compiled.matrix @ compiled.lower
+        compiled.upper = compiled.upper - compiled.lower
+        compiled.lower = np.zeros(len(compiled.lower))
 
-        for var in self._artificial.keys():
-            objective_row[var.index] = 1.0
+    def _change_constraints_bounds_to_nonnegative(self, compiled: sscom.CompiledModel):
+        negative = compiled.bounds < 0
+        self._row_factors[negative] *= -1
+        compiled.matrix[negative] *= -1
+        compiled.bounds[negative] *= -1
+        compiled.senses[negative] *= -1
 
-        table = np.array([objective_row] + [c.expression.coefficients(model) + [c.bound] for c in model.constraints])
+    def _add_slack_variables(self, compiled: sscom.CompiledModel) -> Dict[int, int]:
+        return self._add_unit_columns(compiled, ssecon.ConstraintType.LE, 1.0)
 
-        for c in self._artificial.values():
-            constraint = model.constraints[c.index]
-            factors_row = np.array(constraint.expression.coefficients(model) + [constraint.bound])
-            objective_row -= factors_row
+    def _add_surplus_variables(self, compiled: sscom.CompiledModel) -> Dict[int, int]:
+        return self._add_unit_columns(compiled, ssecon.ConstraintType.GE, -1.0)
 
-        table = np.array([objective_row] + [c.expression.coefficients(model) + [c.bound] for c in model.constraints])
-        return sstab.Tableau(model, table)
+    def _add_unit_columns(self, compiled: sscom.CompiledModel, sense: ssecon.ConstraintType, sign: float) -> Dict[int, int]:
+        """
+            _add_unit_columns(compiled: CompiledModel, sense: ConstraintType, sign: float) -> Dict[int, int]:
+                turns the rows of the given type into equalities with the new (signed) unit columns,
+                returns mapping from the new columns to their rows
+        """
+        rows = np.flatnonzero(compiled.senses == sense.value)
+        rows_n, cols_n = compiled.matrix.shape
+        columns = np.zeros((rows_n, len(rows)))
+        columns[rows, np.arange(len(rows))] = sign
+        compiled.add_columns(columns)
+        compiled.senses[rows] = ssecon.ConstraintType.EQ.value
+        return dict(zip(range(cols_n, cols_n + len(rows)), rows.tolist()))
+
+    def _crash_basis(self, compiled: sscom.CompiledModel) -> Dict[int, int]:
+        """
+            _crash_basis(compiled: CompiledModel) -> Dict[int, int]:
+                finds basic columns for the rows without a slack variable: a column with a single coefficient
+                can be basic in its row if the value it gets (bound / coefficient) is within its bounds
+                the rows are divided by the coefficients, so the basic columns become unit ones
+                returns mapping from the chosen columns to their rows
+        """
+        if self.start == StartType.TWO_PHASE:
+            return dict()
+
+        matrix, bounds = compiled.matrix, compiled.bounds
+        covered = np.zeros(matrix.shape[0], dtype=bool)
+        covered[list(self._slacks.values())] = True
+        if covered.all():
+            return dict()
+        singletons = np.flatnonzero(np.count_nonzero(matrix, axis=0) == 1)
+        rows = np.argmax(matrix[:, singletons] != 0, axis=0)
+        factors = matrix[rows, singletons]
+        # all the bounds are nonnegative, so a negative coefficient works only for a zero bound
+        values = bounds[rows] / factors
+        feasible = (values >= 0) & (values <= compiled.upper[singletons])
+
+        crashed = dict()
+        for (col, row, factor) in zip(singletons[feasible], rows[feasible], factors[feasible]):
+            if covered[row]:
+                continue
+            covered[row] = True
+            matrix[row] /= factor
+            bounds[row] /= factor
+            self._row_factors[row] /= factor
+            crashed[int(col)] = int(row)
+        return crashed
+
+    def _add_artificial_variables(self, compiled: sscom.CompiledModel) -> Dict[int, int]:
+        """
+            _add_artificial_variables(compiled: CompiledModel) -> Dict[int, int]:
+                returns mapping from the artificial columns (following the compiled ones) to the rows
+                without a slack or a crashed basic column
+        """
+        rows_n, cols_n = compiled.matrix.shape
+        basic_rows = set(self._slacks.values()) | set(self._crashed.values())
+        rows = [row for row in range(rows_n) if row not in basic_rows]
+        return dict(zip(range(cols_n, cols_n + len(rows)), rows))
+
+    def _big_m_weight(self, compiled: sscom.CompiledModel) -> float:
+        return big_m * max(1.0, np.abs(compiled.costs).max(initial=0.0))
+
+    def _scale(self, compiled: sscom.CompiledModel) -> sscom.CompiledModel:
+        compiled = compiled if self.scaling is None else compiled.scaled(self.scaling)
+        self._scaling = compiled.scaling
+        if self._scaling is not None:
+            self._row_factors = self._row_factors * self._scaling.row_scales
+        return compiled
+
+    def _presolve_initial_tableau(self, model: ssmod.Model, compiled: sscom.CompiledModel, weight: float = None):
+        """
+            _presolve_initial_tableau(model: Model, compiled: CompiledModel, weight: float | None) -> Tableau:
+                returns the first phase tableau of the presolve model,
+                built from the compiled augmented model and the identity columns of the artificial variables
+                with the weight, the objective is the composite one: the original objective minus the weighted artificials
+        """
+        rows_n, cols_n = compiled.matrix.shape
+        artificial_columns = np.zeros((rows_n, len(self._artificial)))
+        for (col, row) in self._artificial.items():
+            artificial_columns[row, col - cols_n] = 1.0
+        body = np.hstack([compiled.matrix, artificial_columns, compiled.bounds[:, np.newaxis]])
+
+        objective_row = np.zeros(body.shape[1])
+        if weight is None:
+            objective_row[cols_n:-1] = 1.0
+        else:
+            objective_row[:cols_n] = -compiled.costs
+            objective_row[cols_n:-1] = weight
+
+        table = np.vstack([objective_row, body])
+        upper_bounds = np.concatenate([compiled.upper, np.full(len(self._artificial), np.inf)])
+        basis = self._initial_basis(model, {**self._slacks, **self._crashed, **self._artificial})
+        tableau = sstab.Tableau(model, table, upper_bounds, basis=basis)
+        return self._fix_objective_row_to_the_basis(tableau, tableau.basis)
+
+    def _basic_initial_tableau(self, model: ssmod.Model, compiled: sscom.CompiledModel):
+        objective_row = np.concatenate([-compiled.costs, [0.0]])
+        table = np.vstack([objective_row, np.hstack([compiled.matrix, compiled.bounds[:, np.newaxis]])])
+        basis = self._initial_basis(model, {**self._slacks, **self._crashed})
+        tableau = sstab.Tableau(model, table, compiled.upper, basis=basis)
+        return self._fix_objective_row_to_the_basis(tableau, tableau.basis)
+
+    def _set_phase_one_objective_row(self, tableau: sstab.Tableau):
+        """
+            _set_phase_one_objective_row(tableau: Tableau):
+                replaces the objective of the tableau with minimization of the artificial variables
+        """
+        tableau.table[0] = 0.0
+        tableau.table[0, list(self._artificial.keys())] = 1.0
+        self._fix_objective_row_to_the_basis(tableau, tableau.basis)
 
-    def _basic_initial_tableau(self, model: ssmod.Model):
-        objective_row = np.array((-1 * model.objective.expression).coefficients(model) + [0.0])
-        table = np.array([objective_row] + [c.expression.coefficients(model) + [c.bound] for c in model.constraints])
-        return sstab.Tableau(model, table)
+    def _initial_basis(self, model: ssmod.Model, basic_variables: Dict[int, int]) -> List[int]:
+        """
+            _initial_basis(model: Model, basic_variables: Dict[int, int]) -> List[int]:
+                returns the basis made of the given columns, each basic in the row of its constraint
+        """
+        basis = [-1 for _ in model.constraints]
+        for (col, row) in basic_variables.items():
+            basis[row] = col
+        return basis
 
     def _artifical_variables_are_positive(self, tableau: sstab.Tableau): 
         assignment = tableau.extract_assignment()
-        for variable in self._artificial:
-            if assignment[variable.index] > sstab.eps:
+        for col in self._artificial:
+            if assignment[col] > sstab.eps:
                 return True
         return False
 
 
-    def _restore_initial_tableau(self, tableau, model):
-        basis = tableau.extract_basis()
+    def _restore_initial_tableau(self, tableau, model, compiled):
+        self._drive_out_artificial_variables(tableau)
         tableau = self._remove_artificial_variables(tableau)
-        tableau = self._restore_original_objective_row(tableau, model)
-        tableau = self._fix_objective_row_to_the_basis(tableau, basis)
+        tableau = self._restore_original_objective_row(tableau, model, compiled)
+        tableau = self._fix_objective_row_to_the_basis(tableau, tableau.basis)
         return tableau
 
-    def _remove_artificial_variables(self, tableau: sstab.Tableau):
-        columns_to_remove = [var.index for var in self._artificial.keys()]
-        table = np.delete(tableau.table, columns_to_remove, 1)
-        return sstab.Tableau(tableau.model, table)
+    def _drive_out_artificial_variables(self, tableau: sstab.Tableau):
+        """
+            _drive_out_artificial_variables(tableau: Tableau):
+                replaces artificial variables left in the basis (at the zero level) with the original ones,
+                rows where it's impossible are redundant and get removed
+        """
+        artificial = np.zeros(len(tableau.upper_bounds), dtype=bool)
+        artificial[list(self._artificial.keys())] = True
 
-    def _restore_original_objective_row(self, tableau: sstab.Tableau, model: ssmod.Model):
-        objective_row = np.array((-1 * model.objective.expression).coefficients(model) + [0.0])
-        new_table = np.array(tableau.table)
-        new_table[0] = objective_row
-        return sstab.Tableau(model, new_table)
+        redundant_rows = []
+        for (constr_index, col) in enumerate(tableau.basis):
+            if not artificial[col]:
+                continue
+            row = constr_index + 1
+            candidates = np.flatnonzero(~artificial & (np.abs(tableau.table[row, :-1]) > sstab.eps))
+            if len(candidates) == 0:
+                redundant_rows.append(row)
+            else:
+                tableau.pivot(row, candidates[0])
+        tableau.remove_rows(redundant_rows)
 
-    def _fix_objective_row_to_the_basis(self, tableau: sstab.Tableau, basis: List[int]):
-        objective_row = tableau.table[0].copy()
+    def _remove_artificial_variables(self, tableau: sstab.Tableau):
+        columns_to_remove = list(self._artificial.keys())
+        tableau.remove_columns(columns_to_remove)
+        return tableau
 
-        for (constr_index, col) in enumerate(basis):
-            if col >= len(objective_row) - 1:
-                continue
+    def _restore_original_objective_row(self, tableau: sstab.Tableau, model: ssmod.Model, compiled: sscom.CompiledModel):
+        """
+            _restore_original_objective_row(tableau: Tableau, model: Model, compiled: CompiledModel) -> Tableau:
+                replaces the first phase objective with the objective of the model in place
+        """
+        self._set_objective_row(tableau, compiled.costs)
+        tableau.model = model
+        return tableau
 
-            row = constr_index + 1
-            objective_factor = objective_row[col]
-            if objective_factor == 0:
-                continue
-            objective_row -= objective_factor * tableau.table[row]
+    def _set_objective_row(self, tableau: sstab.Tableau, costs: ArrayLike):
+        """
+            _set_objective_row(tableau: Tableau, costs: array):
+                sets the objective row of the given (maximized) costs, taking into account the flipped columns
+                the row still has to be fixed to the basis
+        """
+        objective_row = tableau.table[0]
+        objective_row[:-1] = -costs
+        flipped = tableau.flipped
+        objective_row[-1] = -tableau.upper_bounds[flipped] @ objective_row[:-1][flipped]
+        objective_row[:-1][flipped] *= -1
 
-        new_table = np.array(tableau.table)
-        new_table[0] = objective_row
-        return sstab.Tableau(tableau.model, new_table)
+    def _fix_objective_row_to_the_basis(self, tableau: sstab.Tableau, basis: List[int]):
+        """
+            _fix_objective_row_to_the_basis(tableau: Tableau, basis: List[int]) -> Tableau:
+                zeroes the objective factors of the basic columns in place, subtracting multiples of their rows
+                the basic columns are unit ones, so the rows can be subtracted all at once
+        """
+        basis = np.asarray(basis)
+        cols_n = tableau.table.shape[1] - 1
+        rows = np.flatnonzero((basis >= 0) & (basis < cols_n))
+        factors = tableau.table[0, basis[rows]]
+        tableau.table[0] -= factors @ tableau.table[rows + 1]
+        return tableau
 
-    def _create_solution(self, assignment: List[float], model: ssmod.Model, initial_tableau: sstab.Tableau, tableau: sstab.Tableau):
-        return sssol.Solution.with_assignment(model, assignment, initial_tableau, tableau)
\ No newline at end of file
+    def _create_solution(self, assignment: List[float], model: ssmod.Model, initial_tableau: sstab.Tableau,
+                         tableau: sstab.Tableau, augmented: sscom.CompiledModel = None):
+        """
+            _create_solution(assignment: List[float], model: Model, initial_tableau: Tableau, tableau: Tableau, augmented: CompiledModel | None) -> Solution:
+                returns the solution with the unscaled assignment with the lower bounds restored
+                augmented are the compiled arrays the tableau corresponds to, needed for the sensitivity analysis
+        """
+        if self._scaling is not None:
+            assignment = self._scaling.unscale(assignment).tolist()
+        for var in model.variables:
+            assignment[var.index] += var.lower
+        solution = sssol.Solution.with_assignment(model, assignment, initial_tableau, tableau)
+        solution.scaling = self._scaling
+        if augmented is not None:
+            solution._augmented = augmented
+            solution._row_factors = self._row_factors
+        return solution
\ No newline at end of file
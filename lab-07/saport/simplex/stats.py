@@ -0,0 +1,104 @@
+from __future__ import annotations
+from enum import Enum
+from typing import Dict, List
+import time
+
+
+class SolvePhase(Enum):
+    """
+    An enum representing the phases of the simplex method:
+    - PHASE_ONE = looking for a feasible basis, the objective is minus the sum of the artificial variables
+    - COMPOSITE = single phase Big-M start, the objective is the maximized one minus the penalized artificial variables
+    - PHASE_TWO = optimizing the model objective
+    - DUAL = restoring feasibility with the dual simplex after a constraint is added
+    - INTERIOR_POINT = iterations of the interior point method, the objective is the model objective
+    """
+    PHASE_ONE = "phase one"
+    COMPOSITE = "composite"
+    PHASE_TWO = "phase two"
+    DUAL = "dual"
+    INTERIOR_POINT = "interior point"
+
+
+class SolveStats:
+    """
+        A class to represent statistics of a single solve (or resolve).
+
+        Attributes
+        ----------
+        iterations : Dict[SolvePhase, int]
+            number of iterations (pivots and bound flips) performed in every phase
+        objectives : Dict[SolvePhase, List[float]]
+            objective value at the start and after every iteration of every phase
+            phase two values are the values of the model objective
+        times : Dict[str, float]
+            wall time in seconds spent in every stage:
+            "presolve", "augmentation", "tableau", "pricing", "ratio test", "pivoting" and the phases by their names
+            and "total" for the whole solve, the phases include their pricing, ratio tests and pivots
+
+        Methods
+        -------
+        __init__() -> SolveStats:
+            constructs empty statistics
+        lap(stage: str, start: float) -> float:
+            adds the time elapsed since the start (a time.perf_counter() value) to the stage, returns the current time
+        record(phase: SolvePhase, objective: float):
+            appends the objective value to the trajectory of the phase
+        total_iterations() -> int:
+            returns number of iterations of all the phases
+    """
+    iterations: Dict[SolvePhase, int]
+    objectives: Dict[SolvePhase, List[float]]
+    times: Dict[str, float]
+
+    def __init__(self):
+        self.iterations = {phase: 0 for phase in SolvePhase}
+        self.objectives = {phase: [] for phase in SolvePhase}
+        self.times = dict()
+
+    def lap(self, stage: str, start: float) -> float:
+        now = time.perf_counter()
+        self.times[stage] = self.times.get(stage, 0.0) + now - start
+        return now
+
+    def record(self, phase: SolvePhase, objective: float):
+        self.objectives[phase].append(float(objective))
+
+    def total_iterations(self) -> int:
+        return sum(self.iterations.values())
+
+    def __str__(self) -> str:
+        text = "- iterations:"
+        for (phase, iterations) in self.iterations.items():
+            text += f"\n\t- {phase.value}: {iterations}"
+        text += "\n- times:"
+        for (stage, elapsed) in self.times.items():
+            text += f"\n\t- {stage}: {elapsed:.6f}s"
+        return text
+
+
+class SolverCallback:
+    """
+        A base class of the solver hooks, every method does nothing by default.
+        Callbacks are registered in the `callbacks` list of the solver.
+
+        Methods
+        -------
+        on_phase_start(phase: SolvePhase, objective: float):
+            called before the first iteration of the phase with the starting objective value
+        on_iteration(phase: SolvePhase, iteration: int, entering: int, leaving: int | None, objective: float):
+            called after every iteration with the entering column and the row of the leaving variable
+            leaving is None if the entering variable only moved to its bound (a bound flip)
+            the interior point iterations have no entering variable (-1) nor leaving one (None)
+        on_phase_end(phase: SolvePhase, iterations: int):
+            called after the phase ends (optimal, unbounded or infeasible) with the number of its iterations
+    """
+
+    def on_phase_start(self, phase: SolvePhase, objective: float):
+        pass
+
+    def on_iteration(self, phase: SolvePhase, iteration: int, entering: int, leaving: int | None, objective: float):
+        pass
+
+    def on_phase_end(self, phase: SolvePhase, iterations: int):
+        pass
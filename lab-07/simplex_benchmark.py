@@ -0,0 +1,247 @@
+from __future__ import annotations
+from saport.simplex.model import Model
+from saport.simplex.stats import SolvePhase
+from saport.simplex.expressions.variable_array import ExpressionArray, VariableArray
+from typing import Callable, Dict, List
+import json
+import multiprocessing
+import multiprocessing.connection
+import platform
+import sys
+import time
+import numpy as np
+try:
+    import resource
+except ImportError:
+    # not available on windows, the peak memory isn't measured there
+    resource = None
+# manipulate following parameters to customize the benchmark
+
+SIZES = [10, 100, 1000, 5000]
+CONFIGURATIONS = [
+    # (label, solve options)
+    ("tableau", dict(engine="tableau")),
+    ("tableau devex", dict(engine="tableau", pricing="devex")),
+    ("tableau presolve scaling", dict(engine="tableau", presolve=True, scaling="geometric")),
+    ("revised", dict(engine="revised")),
+    ("ipm", dict(engine="ipm")),
+]
+# seconds after which a single solve is stopped and reported as "timeout"
+TIME_LIMIT = 60.0
+SEED = 0
+OUTPUT = "simplex_benchmark.json"
+# path to the json written by an earlier run, the solve times are compared with it (None to skip the comparison)
+BASELINE = None
+
+# nonzeros in every row of the sparse families
+ROW_NONZEROS = 5
+# random destinations of every source of the transportation models (besides its own one)
+SOURCE_ROUTES = 10
+# random arcs leaving every node of the max-flow networks (besides the path through all the nodes)
+NODE_ARCS = 3
+
+
+def dense_model(size: int, rng: np.random.Generator) -> Model:
+    """ max c x, A x <= b with size rows and 2 * size columns, every coefficient is nonzero """
+    model = Model(f"dense_{size}")
+    x = model.create_variables(2 * size, "x")
+    model.add_constraint(rng.uniform(0.0, 5.0, (size, 2 * size)) @ x <= rng.uniform(10.0, 50.0, size))
+    model.maximize(rng.uniform(1.0, 5.0, 2 * size) @ x)
+    return model
+
+
+def sparse_model(size: int, rng: np.random.Generator) -> Model:
+    """ max c x, A x <= b, 0 <= x <= 10 with size rows and 2 * size columns, ROW_NONZEROS coefficients in every row """
+    model = Model(f"sparse_{size}")
+    x = model.create_variables(2 * size, "x", upper=10.0)
+    model.add_constraint(sparse_rows(x, size, rng, 0.0, 5.0) <= rng.uniform(10.0, 50.0, size))
+    model.maximize(rng.uniform(1.0, 5.0, 2 * size) @ x)
+    return model
+
+
+def degenerate_model(size: int, rng: np.random.Generator) -> Model:
+    """ like the sparse one, but half of the rows have mixed signs and bound 0, so all of them are tight at the origin """
+    model = Model(f"degenerate_{size}")
+    x = model.create_variables(2 * size, "x", upper=10.0)
+    tight_n = size // 2
+    model.add_constraint(sparse_rows(x, tight_n, rng, -1.0, 1.0) <= 0.0)
+    model.add_constraint(sparse_rows(x, size - tight_n, rng, 0.0, 5.0) <= rng.uniform(10.0, 50.0, size - tight_n))
+    model.maximize(rng.uniform(1.0, 5.0, 2 * size) @ x)
+    return model
+
+
+def transportation_model(size: int, rng: np.random.Generator) -> Model:
+    """
+        min c x, size / 2 sources ship at most their supplies, size / 2 destinations get exactly their demands,
+        every source ships to its own destination and SOURCE_ROUTES random ones
+    """
+    sources_n = destinations_n = max(2, size // 2)
+    sources = np.repeat(np.arange(sources_n), SOURCE_ROUTES + 1)
+    destinations = rng.integers(0, destinations_n, (sources_n, SOURCE_ROUTES + 1))
+    destinations[:, 0] = np.arange(sources_n)
+    # repeated routes are merged, so the routes are unique variables
+    routes = np.unique(sources * destinations_n + destinations.ravel())
+    sources, destinations = np.divmod(routes, destinations_n)
+
+    model = Model(f"transportation_{size}")
+    x = model.create_variables(len(routes), "x")
+    # every supply covers the demand of its own destination, so the model is always feasible
+    supply = rng.uniform(10.0, 20.0, sources_n)
+    demand = rng.uniform(5.0, 10.0, destinations_n)
+    ones = np.ones(len(routes))
+    model.add_constraint(ExpressionArray(model, (sources_n,), sources, x.indices, ones) <= supply)
+    model.add_constraint(ExpressionArray(model, (destinations_n,), destinations, x.indices, ones) == demand)
+    model.minimize(rng.uniform(1.0, 10.0, len(routes)) @ x)
+    return model
+
+
+def max_flow_model(size: int, rng: np.random.Generator) -> Model:
+    """
+        max flow from the node 0 to the node size + 1 of a random network,
+        every inner node has a flow conservation row, every arc is a variable bounded by its capacity
+    """
+    nodes_n = size + 2
+    # the path through all the nodes makes the sink reachable, the random arcs make the network interesting
+    path = np.arange(nodes_n - 1)
+    tails = np.concatenate([path, rng.integers(0, nodes_n, NODE_ARCS * nodes_n)])
+    heads = np.concatenate([path + 1, rng.integers(0, nodes_n, NODE_ARCS * nodes_n)])
+    arcs = tails != heads
+    tails, heads = tails[arcs], heads[arcs]
+
+    model = Model(f"max_flow_{size}")
+    x = model.create_variables(len(tails), "x", upper=rng.uniform(1.0, 10.0, len(tails)))
+    # +1 for the arcs entering a node, -1 for the leaving ones, the source and the sink have no rows
+    nodes = np.concatenate([heads, tails])
+    factors = np.concatenate([np.ones(len(heads)), -np.ones(len(tails))])
+    inner = (nodes != 0) & (nodes != nodes_n - 1)
+    arc_columns = np.concatenate([x.indices, x.indices])
+    model.add_constraint(ExpressionArray(model, (size,), nodes[inner] - 1, arc_columns[inner], factors[inner]) == 0.0)
+    model.maximize(((tails == 0).astype(float) - (heads == 0).astype(float)) @ x)
+    return model
+
+
+def sparse_rows(x: VariableArray, rows_n: int, rng: np.random.Generator, low: float, high: float) -> ExpressionArray:
+    """ rows_n expressions with ROW_NONZEROS random coefficients from [low, high) each (repeated variables are summed) """
+    rows = np.repeat(np.arange(rows_n), ROW_NONZEROS)
+    columns = x.indices[rng.integers(0, len(x.indices), len(rows))]
+    return ExpressionArray(x.model, (rows_n,), rows, columns, rng.uniform(low, high, len(rows)))
+
+
+FAMILIES: Dict[str, Callable[[int, np.random.Generator], Model]] = {
+    "dense": dense_model,
+    "sparse": sparse_model,
+    "degenerate": degenerate_model,
+    "transportation": transportation_model,
+    "max_flow": max_flow_model,
+}
+
+
+def peak_memory() -> float | None:
+    """ returns the peak resident memory of the process in megabytes """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macos
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def measure(family: str, size: int, options: Dict[str, object]) -> Dict[str, object]:
+    """ builds and solves a single model, returns the measurements """
+    memory = peak_memory()
+    start = time.perf_counter()
+    model = FAMILIES[family](size, np.random.default_rng([SEED, size]))
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solution = model.solve(retention="none", **options)
+    solve_time = time.perf_counter() - start
+
+    interior_point = solution.stats.iterations[SolvePhase.INTERIOR_POINT]
+    pivots = solution.stats.total_iterations() - interior_point
+    return dict(
+        status=solution.status().value,
+        rows=len(model.constraints),
+        columns=len(model.variables),
+        nonzeros=sum(len(c.expression.factors) for c in model.constraints),
+        objective=solution.objective_value() if solution.has_assignment() else None,
+        build_time=build_time,
+        solve_time=solve_time,
+        pivots=pivots,
+        interior_point_iterations=interior_point,
+        pivots_per_second=pivots / solve_time if solve_time > 0 else None,
+        peak_memory_mb=peak_memory() - memory if memory is not None else None,
+    )
+
+
+def _measure_in_child(connection: multiprocessing.connection.Connection, family: str, size: int,
+                      options: Dict[str, object]):
+    try:
+        # the first solve imports the engines and warms numpy up, it's left out of the measurements
+        measure(family, 2, options)
+        connection.send(measure(family, size, options))
+    except Exception as error:
+        connection.send(dict(status="failed", error=f"{type(error).__name__}: {error}"))
+
+
+def measure_isolated(family: str, size: int, options: Dict[str, object]) -> Dict[str, object]:
+    """
+        runs the measurement in a fresh process, so the peak memory belongs to this model only
+        and a solve exceeding the TIME_LIMIT can be stopped
+    """
+    connection, child = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_measure_in_child, args=(child, family, size, options), daemon=True)
+    process.start()
+    child.close()
+    try:
+        if not connection.poll(TIME_LIMIT):
+            return dict(status="timeout")
+        return connection.recv()
+    except EOFError:
+        return dict(status="failed", error=f"the process exited with code {process.exitcode}")
+    finally:
+        process.terminate()
+        process.join()
+        connection.close()
+
+
+def baseline_times(path: str | None) -> Dict[tuple, float]:
+    """ returns the solve times of the earlier run keyed by (family, size, configuration) """
+    if path is None:
+        return dict()
+    with open(path) as file:
+        results = json.load(file)["results"]
+    return {(r["family"], r["size"], r["configuration"]): r["solve_time"]
+            for r in results if "solve_time" in r}
+
+
+def run() -> List[Dict[str, object]]:
+    baseline = baseline_times(BASELINE)
+    results = []
+    print(f"  {'family':>14} {'rows':>6} {'configuration':>26} {'status':>10} {'build [s]':>10} {'solve [s]':>10} "
+          f"{'pivots':>8} {'pivots/s':>10} {'memory [MB]':>12}" + (f" {'vs baseline':>12}" if baseline else ""))
+    for family in FAMILIES:
+        for size in SIZES:
+            for (label, options) in CONFIGURATIONS:
+                result = dict(family=family, size=size, configuration=label, options=options)
+                result.update(measure_isolated(family, size, options))
+                results.append(result)
+
+                line = f"  {family:>14} {result.get('rows', size):>6} {label:>26} {result['status']:>10}"
+                if result["status"] in ["timeout", "failed"]:
+                    print(line + f" {result.get('error', '')}")
+                    continue
+                line += f" {result['build_time']:>10.3f} {result['solve_time']:>10.3f} {result['pivots']:>8}" +\
+                        f" {result['pivots_per_second'] or 0.0:>10.1f} {result['peak_memory_mb'] or 0.0:>12.1f}"
+                previous = baseline.get((family, size, label))
+                if previous is not None:
+                    line += f" {result['solve_time'] / previous:>11.2f}x"
+                print(line)
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+    with open(OUTPUT, "w") as file:
+        json.dump(dict(seed=SEED, time_limit=TIME_LIMIT, python=platform.python_version(), numpy=np.__version__,
+                       machine=platform.machine(), results=results), file, indent=2)
+    print(f"* results written to {OUTPUT}")
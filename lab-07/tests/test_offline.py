@@ -10,6 +10,8 @@ from saport.simplex.expressions.expression import Expression
 from saport.simplex.expressions.objective import ObjectiveType
 import saport.simplex.model as lpmodel
 import saport.simplex.solution as lpsol
+import saport.simplex.solver as lpsolver
+from saport.simplex.limits import LimitType
 from saport.knapsack.model import Problem
 from saport.knapsack.solvers.integer_linear_relaxation import IntegerLinearRelaxationSolver
 
@@ -35,9 +37,9 @@ def _create_test_model(obj_coeffs, cstr_coeffs, cstr_bounds, model_builder = Mod
 class TestLinearRelaxation:
 
     @pytest.mark.parametrize("problem_name, obj_coeffs, cstr_coeffs, cstr_bounds", [
-        ("ks_lecture_dp_1", [5.0, 6.0, 3.0], [[4.0, 5.0, 2.0], [1.0, 0, 0], [0, 1.0, 0], [0, 0, 1.0]], [9, 1, 1, 1]),
-        ("ks_lecture_dp_2", [16.0, 19.0, 23.0, 28.0], [[2.0, 3.0, 4.0, 5.0], [1.0, 0, 0, 0], [0, 1.0, 0, 0], [0, 0, 1.0, 0], [0, 0, 0, 1.0]], [7, 1, 1, 1, 1]),
-        ("ks_4_0", [8.0, 10.0, 15.0, 4.0], [[4.0, 5.0, 8.0, 3.0], [1.0, 0, 0, 0], [0, 1.0, 0, 0], [0, 0, 1.0, 0], [0, 0, 0, 1.0]], [11, 1, 1, 1, 1])
+        ("ks_lecture_dp_1", [5.0, 6.0, 3.0], [[4.0, 5.0, 2.0]], [9]),
+        ("ks_lecture_dp_2", [16.0, 19.0, 23.0, 28.0], [[2.0, 3.0, 4.0, 5.0]], [7]),
+        ("ks_4_0", [8.0, 10.0, 15.0, 4.0], [[4.0, 5.0, 8.0, 3.0]], [11])
     ])
     def test_knapsack_model_for_linear_relaxation_should_be_correct(self, problems, problem_name, obj_coeffs, cstr_coeffs, cstr_bounds):
         problem = problems[problem_name]
@@ -47,6 +49,10 @@ class TestLinearRelaxation:
         assert len(model.variables) == len(obj_coeffs), f"knapsack model for linear relaxation has incorrect number of variables (problem `{problem_name}`):" +\
             f"\n- got: {len(model.variables)}" +\
             f"\n- expected: {len(obj_coeffs)}" 
+        for var in model.variables:
+            assert (var.lower, var.upper) == (0.0, 1.0), f"knapsack model for linear relaxation has incorrectly bounded variable (problem `{problem_name}`):" +\
+                f"\n- got: {var.name} in [{var.lower}, {var.upper}]" +\
+                f"\n- expected: {var.name} in [0.0, 1.0]"
         assert model.objective is not None, f"knapsack model for linear relaxation is missing an objective (problem `{problem_name}`)"
         assert model.objective.type == ObjectiveType.MAX, f"knapsack model for linear relaxation has incorrect objective type {model.objective.type} (problem `{problem_name}`)"
         got_obj_coeffs = model.objective.expression.coefficients(model)
@@ -130,6 +136,20 @@ class TestLinearRelaxation:
             f"\n- correct implementation would be called just {bnb_calls} times" +\
             f"\n- model: \n{indented_string(str(model))}"
 
+    def test_linear_relaxation_should_never_use_relaxations_stopped_by_limit(self, mocker: MockerFixture):
+        solver = LinearRelaxationSolver()
+        model = _create_test_model([5.0, 6.0, 3.0], [[4.0, 5.0, 2.0], [1.0, 0, 0], [0, 1.0, 0], [0, 0, 1.0]], [9, 1, 1, 1])
+        # integer and better than the optimum, but the simplex stopped before proving it
+        stopped = lambda solution, constraint: lpsol.Solution.limit_reached(solution.model, LimitType.ITERATIONS, [1.0, 1.0, 1.0], None)
+        mocker.patch.object(lpsolver.Solver, "resolve", side_effect=stopped)
+
+        got_solution = solver.solve(model, TIMEOUT)
+
+        assert got_solution is None, f"solution of the stopped relaxation has been accepted:" +\
+                f"\n- got: {got_solution.assignment}" +\
+                f"\n- model: \n{indented_string(str(model))}"
+        assert solver.interrupted, "branch and bound with a stopped relaxation should be interrupted"
+
     
 
 
@@ -0,0 +1,1530 @@
+import numpy as np
+import pytest
+from copy import deepcopy
+from saport.simplex.model import Model
+from saport.simplex.exceptions import BatchSizeError, DuplicateVariableError, ModelFormatError, ShapeMismatchError, \
+    SnapshotError, SolveFailedError, SolveTimeoutError
+from saport.simplex.expressions.constraint import ConstraintType
+from saport.simplex.expressions.objective import ObjectiveType
+from saport.simplex.solver import Solver
+from saport.simplex.solution import Solution, SolutionStatus
+from saport.simplex.limits import LimitType
+from saport.simplex.solverfactory import SolverFactory
+from saport.simplex.tableau import Tableau
+from saport.simplex.pricing import PricingFactory
+from saport.simplex.presolve import Presolver
+from saport.simplex.stats import SolvePhase, SolverCallback
+from saport.simplex.ipm_solver import _max_step
+from saport.simplex import CancellationToken, quicksum, solve_many
+
+
+ENGINES = ["tableau", "revised", "ipm"]
+# engines going through the simplex phases from the start
+SIMPLEX_ENGINES = ["tableau", "revised"]
+SCALINGS = ["geometric", "equilibration"]
+STARTS = ["two_phase", "crash", "big_m"]
+PRICINGS = ["dantzig", "bland", "partial", "steepest_edge", "devex"]
+
+
+def indented_string(s: str, ident: str = '    '):
+    return '\n'.join([ident + l for l in s.splitlines()])
+
+
+def model_solvable():
+    model = Model("solvable")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    model.add_constraint(x1 <= 150)
+    model.add_constraint(x2 <= 250)
+    model.add_constraint(2 * x1 + x2 <= 500)
+    model.maximize(8 * x1 + 5 * x2)
+    return model
+
+
+def model_solvable_with_artificial_variables():
+    model = Model("solvable_with_artificial_variables")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    x3 = model.create_variable("x3")
+    model.add_constraint(x1 + x2 + x3 >= 2)
+    model.add_constraint(x1 - x3 == 1)
+    model.add_constraint(x1 + 2 * x2 <= 6)
+    model.minimize(3 * x1 + 2 * x2 + 4 * x3)
+    return model
+
+
+def model_with_variable_bounds():
+    model = Model("with_variable_bounds")
+    x1 = model.create_variable("x1", lower=1, upper=3)
+    x2 = model.create_variable("x2", upper=2)
+    model.add_constraint(x1 + x2 <= 4)
+    model.maximize(3 * x1 + 2 * x2)
+    return model
+
+
+def model_with_lower_bounds():
+    model = Model("with_lower_bounds")
+    x1 = model.create_variable("x1", lower=1, upper=3)
+    x2 = model.create_variable("x2", lower=2, upper=5)
+    model.add_constraint(x1 + x2 >= 2)
+    model.minimize(x1 + x2)
+    return model
+
+
+def model_with_redundant_constraint():
+    model = Model("with_redundant_constraint")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    model.add_constraint(x1 + x2 == 2)
+    model.add_constraint(2 * x1 + 2 * x2 == 4)
+    model.maximize(x1 + 2 * x2)
+    return model
+
+
+def model_degenerate():
+    # Beale's example, cycling with the textbook Dantzig rule
+    model = Model("degenerate")
+    x4 = model.create_variable("x4")
+    x5 = model.create_variable("x5")
+    x6 = model.create_variable("x6")
+    x7 = model.create_variable("x7")
+    model.add_constraint(0.25 * x4 - 8 * x5 - x6 + 9 * x7 <= 0)
+    model.add_constraint(0.5 * x4 - 12 * x5 - 0.5 * x6 + 3 * x7 <= 0)
+    model.add_constraint(x6 <= 1)
+    model.maximize(0.75 * x4 - 20 * x5 + 0.5 * x6 - 6 * x7)
+    return model
+
+
+def model_unbounded():
+    model = Model("unbounded")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    x3 = model.create_variable("x3")
+    model.add_constraint(x1 - 3 * x2 + 2 * x3 >= 10)
+    model.add_constraint(x1 + 5 * x2 - 1 * x3 <= -7)
+    model.maximize(5 * x1 + 8 * x2)
+    return model
+
+
+def model_infeasible():
+    model = Model("infeasible")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    model.add_constraint(x1 + x2 <= 3)
+    model.add_constraint(x1 + x2 >= 4)
+    model.maximize(x1 + 3 * x2)
+    return model
+
+
+def model_with_singleton_columns():
+    model = Model("with_singleton_columns")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    y1 = model.create_variable("y1")
+    y2 = model.create_variable("y2", upper=5)
+    model.add_constraint(x1 + x2 + 2 * y1 >= 6)
+    model.add_constraint(x1 - x2 + y2 == 1)
+    model.add_constraint(x1 + 2 * x2 <= 8)
+    model.minimize(2 * x1 + 3 * x2 + 4 * y1 + y2)
+    return model
+
+
+def model_badly_scaled():
+    model = Model("badly_scaled")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2", upper=5000)
+    x3 = model.create_variable("x3")
+    model.add_constraint(0.0003 * x1 + 10372 * x2 - 0.3 * x3 <= 20000)
+    model.add_constraint(2500 * x1 + 0.01 * x3 >= 0.5)
+    model.add_constraint(0.002 * x1 + 0.7 * x2 + 0.0001 * x3 <= 3.1)
+    model.maximize(0.01 * x1 + 900 * x2 + 0.002 * x3)
+    return model
+
+
+def model_with_presolve_reductions():
+    model = Model("with_presolve_reductions")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2", lower=2, upper=2)
+    x3 = model.create_variable("x3")
+    model.add_constraint(x1 + x3 >= 4)
+    model.add_constraint(x1 + x3 <= 4)
+    model.add_constraint(2 * x1 + 2 * x3 <= 10)
+    model.add_constraint(x1 <= 3)
+    model.add_constraint(x2 + x3 <= 5)
+    model.maximize(3 * x1 + x2 + 2 * x3)
+    return model
+
+
+class TestExpression:
+
+    def test_expression_should_reduce_repeated_variables(self):
+        model = Model("test")
+        x1 = model.create_variable("x1")
+        x2 = model.create_variable("x2")
+
+        expression = 2 * x1 + x2 - x1 + 3 * x2
+
+        assert expression.coefficients(model) == [1.0, 4.0], "expression has incorrect coefficients:" +\
+            f"\n- got: {expression.coefficients(model)}" +\
+            f"\n- expected: {[1.0, 4.0]}"
+        assert len(expression.atoms) == 2, f"expression should keep one atom per variable, got: {expression}"
+
+    def test_set_coefficient_should_update_expression(self):
+        model = Model("test")
+        x1 = model.create_variable("x1")
+        x2 = model.create_variable("x2")
+        x3 = model.create_variable("x3")
+        expression = 2 * x1 + x2
+
+        expression.set_coefficient(x1, -5)
+        expression.set_coefficient(x2, 0.0)
+        expression.set_coefficient(x3, 4)
+
+        assert expression.coefficients(model) == [-5.0, 0.0, 4.0], "expression has incorrect coefficients:" +\
+            f"\n- got: {expression.coefficients(model)}" +\
+            f"\n- expected: {[-5.0, 0.0, 4.0]}"
+        assert [expression.get_coefficient(v) for v in model.variables] == [-5.0, 0.0, 4.0], \
+            f"get_coefficient doesn't match the coefficients of expression: {expression}"
+        assert x2 not in [a.var for a in expression.atoms], "variable with zero coefficient should be removed from expression"
+
+    def test_in_place_addition_should_not_modify_variables(self):
+        model = Model("test")
+        x1 = model.create_variable("x1")
+        x2 = model.create_variable("x2")
+
+        expression = x1
+        expression += x2
+        expression += 3 * x1
+
+        assert expression.coefficients(model) == [4.0, 1.0], "expression has incorrect coefficients:" +\
+            f"\n- got: {expression.coefficients(model)}" +\
+            f"\n- expected: {[4.0, 1.0]}"
+        assert x1.coefficients(model) == [1.0, 0.0], f"in place addition modified the variable: {x1}"
+
+    def test_quicksum_should_match_builtin_sum(self):
+        model = Model("test")
+        variables = [model.create_variable(f"x{i}") for i in range(5)]
+        terms = [(i + 1) * v for (i, v) in enumerate(variables)] + [-v for v in variables]
+
+        expected = sum(terms)
+        got = quicksum(terms)
+
+        assert got.coefficients(model) == expected.coefficients(model), "quicksum returned incorrect expression:" +\
+            f"\n- got: {got}" +\
+            f"\n- expected: {expected}"
+
+
+class TestModel:
+
+    def test_create_variables_should_index_variables_in_row_major_order(self):
+        model = Model("test")
+        y = model.create_variable("y")
+        x = model.create_variables((2, 3), "x", upper=[1, 2, 3])
+
+        assert x.shape == (2, 3), f"variables array has incorrect shape: {x.shape}"
+        assert [v.index for v in x.ravel()] == list(range(1, 7)), "variables have incorrect indices:" +\
+            f"\n- got: {[v.index for v in x.ravel()]}" +\
+            f"\n- expected: {list(range(1, 7))}"
+        assert model.variables == [y] + list(x.ravel()), "variables should be added to the model in the row-major order"
+        assert x[1, 2].name == "x_1_2" and x[1, 2].upper == 3.0, f"variable has incorrect name or bounds: {x[1, 2]}"
+
+    @pytest.mark.parametrize("create", [
+        lambda model: model.create_variable("x_1"),
+        lambda model: model.create_variables(3, "x"),
+    ])
+    def test_model_should_reject_duplicate_variable_names(self, create):
+        model = Model("test")
+        model.create_variables(2, "x")
+
+        with pytest.raises(DuplicateVariableError):
+            create(model)
+
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_degenerate
+    ])
+    def test_compile_should_match_model_expressions(self, model_builder):
+        model = model_builder()
+        compiled = model.compile()
+
+        expected_matrix = np.array([c.expression.coefficients(model) for c in model.constraints])
+        expected_costs = np.array(model.objective.expression.coefficients(model))
+        assert np.allclose(compiled.matrix, expected_matrix), "compiled model has incorrect constraint matrix:" +\
+            f"\n- got:\n{indented_string(str(compiled.matrix))}" +\
+            f"\n- expected:\n{indented_string(str(expected_matrix))}" +\
+            f"\n- for model:\n{indented_string(str(model))}"
+        assert np.allclose(compiled.costs, expected_costs), "compiled model has incorrect objective:" +\
+            f"\n- got: {compiled.costs}" +\
+            f"\n- expected: {expected_costs}"
+        assert list(compiled.bounds) == [c.bound for c in model.constraints], "compiled model has incorrect bounds"
+        assert [compiled.sense(c.index) for c in model.constraints] == [c.type for c in model.constraints], \
+            "compiled model has incorrect constraint types"
+        assert list(compiled.upper) == [v.upper for v in model.variables], "compiled model has incorrect upper bounds"
+
+    @pytest.mark.parametrize("scaling", SCALINGS)
+    def test_compile_should_scale_rows_and_columns(self, scaling):
+        model = model_badly_scaled()
+        compiled = model.compile()
+
+        scaled = model.compile(scaling=scaling)
+        rows, cols = scaled.scaling.row_scales, scaled.scaling.column_scales
+
+        expected_matrix = rows[:, np.newaxis] * compiled.matrix * cols
+        assert np.allclose(scaled.matrix, expected_matrix), "scaled matrix should equal R A S:" +\
+            f"\n- got:\n{indented_string(str(scaled.matrix))}" +\
+            f"\n- expected:\n{indented_string(str(expected_matrix))}"
+        assert np.allclose(scaled.bounds, rows * compiled.bounds), "scaled bounds should equal R b"
+        assert np.allclose(scaled.costs, compiled.costs * cols), "scaled costs should equal S c"
+        assert np.allclose(scaled.upper, compiled.upper / cols), "scaled upper bounds should equal S^-1 u"
+        assert np.all(np.log2(np.concatenate([rows, cols])) % 1 == 0), "scales should be powers of 2"
+        spread = lambda matrix: np.abs(matrix[matrix != 0]).max() / np.abs(matrix[matrix != 0]).min()
+        assert spread(scaled.matrix) < spread(compiled.matrix), "scaling should reduce the spread of the coefficients:" +\
+            f"\n- got: {spread(scaled.matrix)}" +\
+            f"\n- original: {spread(compiled.matrix)}"
+
+    def test_compile_should_create_sparse_matrix(self):
+        pytest.importorskip("scipy")
+        model = model_solvable_with_artificial_variables()
+
+        dense = model.compile().matrix
+        sparse = model.compile(sparse=True).matrix
+
+        assert sparse.nnz == np.count_nonzero(dense), "sparse matrix should store only the nonzero coefficients"
+        assert np.allclose(sparse.toarray(), dense), "sparse matrix should match the dense one:" +\
+            f"\n- got:\n{indented_string(str(sparse.toarray()))}" +\
+            f"\n- expected:\n{indented_string(str(dense))}"
+
+    @pytest.mark.parametrize("sparse", [False, True])
+    @pytest.mark.parametrize("model_builder", [model_solvable_with_artificial_variables, model_with_variable_bounds])
+    def test_model_from_compiled_should_compile_back_to_the_same_arrays(self, model_builder, sparse):
+        if sparse:
+            pytest.importorskip("scipy")
+        model = model_builder()
+        compiled = model.compile(sparse=sparse)
+
+        rebuilt = Model.from_compiled(compiled, [v.name for v in model.variables], model.name)
+        recompiled = rebuilt.compile()
+
+        assert [v.name for v in rebuilt.variables] == [v.name for v in model.variables], "rebuilt model should keep the names"
+        assert np.allclose(recompiled.matrix, model.compile().matrix), "rebuilt model has incorrect matrix:" +\
+            f"\n- got:\n{indented_string(str(rebuilt))}" +\
+            f"\n- expected:\n{indented_string(str(model))}"
+        assert np.allclose(recompiled.bounds, compiled.bounds), "rebuilt model has incorrect bounds"
+        assert list(recompiled.senses) == list(compiled.senses), "rebuilt model has incorrect constraint types"
+        assert np.allclose(recompiled.costs, compiled.costs), "rebuilt model has incorrect objective"
+        assert recompiled.objective_type == compiled.objective_type, "rebuilt model has incorrect objective type"
+        assert list(recompiled.lower) == list(compiled.lower), "rebuilt model has incorrect lower bounds"
+        assert list(recompiled.upper) == list(compiled.upper), "rebuilt model has incorrect upper bounds"
+
+
+class TestVariableArray:
+
+    def test_matrix_constraints_should_match_expression_constraints(self):
+        a = np.array([[2.0, 0.0, 1.0], [1.0, 3.0, 0.0]])
+        b = np.array([4.0, 6.0])
+        c = np.array([1.0, 2.0, 0.5])
+
+        model = Model("matrix")
+        x = model.create_variables(3, "x", upper=3)
+        model.add_constraint(a @ x <= b)
+        model.maximize(c @ x)
+
+        expected = Model("expressions")
+        y = expected.create_variables(3, "x", upper=3)
+        for (row, bound) in zip(a, b):
+            expected.add_constraint(quicksum(float(f) * v for (f, v) in zip(row, y) if f != 0) <= bound)
+        expected.maximize(quicksum(float(f) * v for (f, v) in zip(c, y)))
+
+        assert np.allclose(model.compile().matrix, expected.compile().matrix), "A @ x <= b produced incorrect rows:" +\
+            f"\n- got:\n{indented_string(str(model))}" +\
+            f"\n- expected:\n{indented_string(str(expected))}"
+        got, wanted = model.solve(), expected.solve()
+        assert np.isclose(got.objective_value(), wanted.objective_value()), "matrix model has incorrect objective:" +\
+            f"\n- got: {got.objective_value()}" +\
+            f"\n- expected: {wanted.objective_value()}"
+
+    def test_sum_along_axis_should_create_constraint_per_column(self):
+        model = Model("assignment")
+        x = model.create_variables((2, 3), "x", upper=1)
+        model.add_constraint(x.sum(axis=0) == 1)
+
+        assert len(model.constraints) == 3, f"expected 3 constraints, got:\n{indented_string(str(model))}"
+        for (j, constraint) in enumerate(model.constraints):
+            assert sorted(constraint.expression.factors) == [x[0, j].index, x[1, j].index], \
+                f"constraint {j} should sum the column {j}: {constraint}"
+            assert constraint.bound == 1, f"constraint {j} has incorrect bound: {constraint}"
+
+    def test_matrix_product_should_follow_numpy_shapes(self):
+        model = Model("shapes")
+        x = model.create_variables((3, 2), "x")
+        a = np.ones((4, 3))
+
+        assert (a @ x).shape == (4, 2), f"A @ X has incorrect shape: {(a @ x).shape}"
+        assert (x.T @ np.ones(3)).shape == (2,), f"X^T @ v has incorrect shape: {(x.T @ np.ones(3)).shape}"
+        assert str(np.ones(2) @ x[0]) == str(x[0, 0] + x[0, 1]), "v @ x should build a single expression"
+
+    def test_mismatched_shapes_should_be_rejected(self):
+        model = Model("shapes")
+        x = model.create_variables((3, 2), "x")
+
+        with pytest.raises(ShapeMismatchError):
+            x @ np.ones(3)
+        with pytest.raises(ShapeMismatchError):
+            x + x.T
+        with pytest.raises(ShapeMismatchError):
+            x * np.ones(3)
+        with pytest.raises(ShapeMismatchError):
+            x.sum(axis=0) <= np.ones(3)
+
+
+class TestTableau:
+
+    @pytest.mark.parametrize("table, row, col, expected_table", [
+        ([[-1.0, -2.0, 0.0, 0.0, 0.0], [1.0, 1.0, 1.0, 0.0, 3.0], [1.0, 2.0, 0.0, 1.0, 4.0]], 2, 1,
+         [[0.0, 0.0, 0.0, 1.0, 4.0], [0.5, 0.0, 1.0, -0.5, 1.0], [0.5, 1.0, 0.0, 0.5, 2.0]]),
+        ([[-3.0, -5.0, 0.0, 0.0, 0.0], [2.0, 4.0, 1.0, 0.0, 8.0], [3.0, 1.0, 0.0, 1.0, 6.0]], 1, 0,
+         [[0.0, 1.0, 1.5, 0.0, 12.0], [1.0, 2.0, 0.5, 0.0, 4.0], [0.0, -5.0, -1.5, 1.0, -6.0]])
+    ])
+    def test_pivot_should_update_tableau_in_place(self, table, row, col, expected_table):
+        tableau = Tableau(Model("test"), np.array(table))
+        storage = tableau.table
+
+        tableau.pivot(row, col)
+
+        assert np.allclose(tableau.table, expected_table), "pivot produced incorrect tableau:" +\
+            f"\n- got:\n{indented_string(str(tableau.table))}" +\
+            f"\n- expected:\n{indented_string(str(np.array(expected_table)))}"
+        assert tableau.table is storage, "pivot should reuse the tableau storage instead of copying it"
+
+    @pytest.mark.parametrize("table, row, col, expected_basis", [
+        ([[-1.0, -2.0, 0.0, 0.0, 0.0], [1.0, 1.0, 1.0, 0.0, 3.0], [1.0, 2.0, 0.0, 1.0, 4.0]], 2, 1, [2, 1]),
+        ([[-3.0, -5.0, 0.0, 0.0, 0.0], [2.0, 4.0, 1.0, 0.0, 8.0], [3.0, 1.0, 0.0, 1.0, 6.0]], 1, 0, [0, 3])
+    ])
+    def test_pivot_should_update_basis(self, table, row, col, expected_basis):
+        tableau = Tableau(Model("test"), np.array(table))
+
+        tableau.pivot(row, col)
+
+        assert tableau.extract_basis() == expected_basis, "pivot produced incorrect basis:" +\
+            f"\n- got: {tableau.extract_basis()}" +\
+            f"\n- expected: {expected_basis}" +\
+            f"\n- for tableau:\n{indented_string(str(tableau.table))}"
+
+
+class TestPricing:
+
+    @pytest.mark.parametrize("pricing, reduced_costs, expected_col", [
+        ("dantzig", [1.0, -2.0, -5.0, 0.0], 2),
+        ("bland", [1.0, -2.0, -5.0, 0.0], 1),
+        ("partial", [-1.0, 0.0, 0.0, -5.0], 0),
+        ("steepest_edge", [1.0, -2.0, -5.0, 0.0], 2),
+        ("devex", [1.0, -2.0, -5.0, 0.0], 2)
+    ])
+    def test_pricing_rule_should_choose_improving_column(self, pricing, reduced_costs, expected_col):
+        rule = PricingFactory.rule(pricing)
+        rule.start(len(reduced_costs), lambda: np.zeros(len(reduced_costs)))
+
+        col = rule.choose_entering_variable(np.array(reduced_costs))
+
+        assert col == expected_col, f"pricing rule `{pricing}` chose incorrect column:" +\
+            f"\n- got: {col}" +\
+            f"\n- expected: {expected_col}" +\
+            f"\n- for reduced costs: {reduced_costs}"
+
+
+    @pytest.mark.parametrize("reduced_costs, expected_col, expected_priced", [
+        ([0.0] * 4 + [-1.0, -3.0, 0.0, 0.0] + [-5.0] * 8, 5, 8),
+        ([0.0] * 15 + [-1.0], 15, 16),
+        ([0.0] * 16, None, 16)
+    ])
+    def test_partial_pricing_should_stop_at_the_first_improving_block(self, reduced_costs, expected_col, expected_priced):
+        rule = PricingFactory.rule("partial")
+        rule.start(len(reduced_costs), lambda: np.zeros(len(reduced_costs)))
+        priced = []
+
+        def price(columns: slice):
+            priced.extend(range(len(reduced_costs))[columns])
+            return np.array(reduced_costs)[columns]
+
+        col = rule.price(len(reduced_costs), price)
+
+        assert col == expected_col, f"partial pricing chose incorrect column:" +\
+            f"\n- got: {col}" +\
+            f"\n- expected: {expected_col}" +\
+            f"\n- for reduced costs: {reduced_costs}"
+        assert sorted(priced) == list(range(expected_priced)), f"partial pricing priced incorrect columns:" +\
+            f"\n- got: {priced}" +\
+            f"\n- expected: the first {expected_priced} columns, each once"
+
+
+class TestSolver:
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder, is_feasible, is_bounded, expected_objective", [
+        (model_solvable, True, True, 2250.0),
+        (model_solvable_with_artificial_variables, True, True, 5.0),
+        (model_with_variable_bounds, True, True, 11.0),
+        (model_with_lower_bounds, True, True, 3.0),
+        (model_with_redundant_constraint, True, True, 4.0),
+        (model_unbounded, True, False, None),
+        (model_infeasible, False, True, None)
+    ])
+    def test_solver_should_solve_model_with_every_engine(self, engine, model_builder, is_feasible, is_bounded, expected_objective):
+        model = model_builder()
+        solution = model.solve(engine=engine)
+
+        assert (solution.is_feasible, solution.is_bounded) == (is_feasible, is_bounded), \
+            f"engine `{engine}` returned incorrect status:" +\
+            f"\n- got: feasible={solution.is_feasible}, bounded={solution.is_bounded}" +\
+            f"\n- expected: feasible={is_feasible}, bounded={is_bounded}" +\
+            f"\n- for model:\n{indented_string(str(model))}"
+        if expected_objective is not None:
+            assert np.isclose(solution.objective_value(), expected_objective), \
+                f"engine `{engine}` returned incorrect objective value:" +\
+                f"\n- got: {solution.objective_value()}" +\
+                f"\n- expected: {expected_objective}" +\
+                f"\n- for model:\n{indented_string(str(model))}"
+            assert type(solution.objective_value()) is float and all(type(v) is float for v in solution.assignment()), \
+                f"engine `{engine}` should return plain floats:" +\
+                f"\n- got: {type(solution.objective_value()).__name__}, {[type(v).__name__ for v in solution.assignment()]}"
+
+    @pytest.mark.parametrize("model_builder", [model_with_variable_bounds, model_with_lower_bounds])
+    def test_revised_solver_should_keep_the_right_hand_sides_of_the_augmented_model(self, model_builder):
+        # the flips of the bounded variables must not leak into the augmented model kept by the solution
+        expected = model_builder().solve(engine="tableau")._augmented.bounds
+        got = model_builder().solve(engine="revised")._augmented.bounds
+
+        assert np.allclose(got, expected), "revised solver changed the right hand sides of the augmented model:" +\
+            f"\n- got: {got}" +\
+            f"\n- expected: {expected}"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("pricing", PRICINGS)
+    @pytest.mark.parametrize("model_builder, expected_objective", [
+        (model_solvable, 2250.0),
+        (model_solvable_with_artificial_variables, 5.0),
+        (model_with_variable_bounds, 11.0),
+        (model_degenerate, 1.25)
+    ])
+    def test_solver_should_solve_model_with_every_pricing_rule(self, engine, pricing, model_builder, expected_objective):
+        model = model_builder()
+        solution = model.solve(engine=engine, pricing=pricing)
+
+        assert solution.has_assignment() and np.isclose(solution.objective_value(), expected_objective), \
+            f"engine `{engine}` with pricing `{pricing}` returned incorrect objective value:" +\
+            f"\n- got: {solution.objective_value()}" +\
+            f"\n- expected: {expected_objective}" +\
+            f"\n- for model:\n{indented_string(str(model))}"
+        assert solution.iterations > 0, f"engine `{engine}` with pricing `{pricing}` didn't report the iterations"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_redundant_constraint
+    ])
+    def test_solution_basis_should_consist_of_unit_columns(self, engine, model_builder):
+        model = model_builder()
+        solution = model.solve(engine=engine)
+        table = solution.tableau.table
+
+        for (constr_index, col) in enumerate(solution.basis()):
+            if col < 0:
+                continue
+            expected_column = np.zeros(table.shape[0])
+            expected_column[constr_index + 1] = 1.0
+            assert np.allclose(table[:, col], expected_column), f"engine `{engine}` returned incorrect basis:" +\
+                f"\n- got: {solution.basis()}" +\
+                f"\n- for tableau:\n{indented_string(str(solution.tableau))}"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable_with_artificial_variables,
+        model_with_lower_bounds,
+        model_unbounded
+    ])
+    def test_solver_should_not_copy_or_modify_model(self, engine, model_builder):
+        model = model_builder()
+        expected = str(model)
+
+        solution = model.solve(engine=engine)
+
+        assert str(model) == expected, "solving should not modify the model:" +\
+            f"\n- got:\n{indented_string(str(model))}" +\
+            f"\n- expected:\n{indented_string(expected)}"
+        tableau_variables = solution.tableau.model.variables[:len(model.variables)]
+        assert all(v is w for (v, w) in zip(tableau_variables, model.variables)), \
+            "tableau should share the variables of the model instead of copying them"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("retention, keeps_initial_tableau, keeps_tableau, keeps_basis", [
+        ("none", False, False, False),
+        ("basis", False, False, True),
+        ("tableaux", True, True, True)
+    ])
+    def test_solution_should_keep_solver_state_according_to_retention(self, engine, retention, keeps_initial_tableau,
+                                                                       keeps_tableau, keeps_basis):
+        model = model_solvable_with_artificial_variables()
+        expected = model.solve(engine=engine)
+
+        solution = model.solve(engine=engine, retention=retention)
+
+        kept = (solution.initial_tableau is not None, solution.tableau is not None, solution.basis() is not None)
+        assert kept == (keeps_initial_tableau, keeps_tableau, keeps_basis), \
+            f"solution with `{retention}` retention kept incorrect state (initial tableau, tableau, basis): {kept}"
+        if keeps_basis:
+            assert solution.basis() == expected.basis(), "retained basis should be the final one:" +\
+                f"\n- got: {solution.basis()}" +\
+                f"\n- expected: {expected.basis()}"
+        assert np.allclose(solution.assignment(), expected.assignment()), "retention should not change the assignment"
+
+    @pytest.mark.parametrize("retention", ["none", "basis"])
+    def test_resolve_should_solve_from_scratch_without_retained_tableau(self, retention):
+        model = model_solvable()
+        solver = Solver(retention=retention)
+        solution = solver.solve(model)
+
+        resolved = solver.resolve(solution, model.variables[0] + model.variables[1] <= 300)
+        extended_model = deepcopy(model)
+        extended_model.add_constraint(extended_model.variables[0] + extended_model.variables[1] <= 300)
+        expected = extended_model.solve()
+
+        assert np.isclose(resolved.objective_value(), expected.objective_value()), "resolve returned incorrect objective value:" +\
+            f"\n- got: {resolved.objective_value()}" +\
+            f"\n- expected: {expected.objective_value()}"
+        assert resolved.tableau is None, "resolved solution should follow the retention of the solver"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder, constraint_builder", [
+        (model_solvable, lambda x: x[0] + x[1] <= 300),
+        (model_solvable, lambda x: x[0] >= 140),
+        (model_solvable_with_artificial_variables, lambda x: x[1] <= 0.5),
+        (model_solvable_with_artificial_variables, lambda x: x[0] + x[2] == 4),
+        (model_with_variable_bounds, lambda x: x[0] - x[1] >= 2.5),
+        (model_with_variable_bounds, lambda x: x[0] + x[1] >= 6)
+    ])
+    def test_resolve_should_match_solving_model_with_new_constraint(self, engine, model_builder, constraint_builder):
+        model = model_builder()
+        solution = model.solve(engine=engine)
+        constraint = constraint_builder(model.variables)
+
+        resolved = Solver().resolve(solution, constraint)
+        extended_model = deepcopy(model)
+        extended_model.add_constraint(constraint_builder(extended_model.variables))
+        expected = extended_model.solve()
+
+        assert resolved.is_feasible == expected.is_feasible, "resolve returned incorrect feasibility:" +\
+            f"\n- got: {resolved.is_feasible}" +\
+            f"\n- expected: {expected.is_feasible}" +\
+            f"\n- for model:\n{indented_string(str(extended_model))}"
+        if expected.has_assignment():
+            assert np.isclose(resolved.objective_value(), expected.objective_value()), "resolve returned incorrect objective value:" +\
+                f"\n- got: {resolved.objective_value()}" +\
+                f"\n- expected: {expected.objective_value()}" +\
+                f"\n- for model:\n{indented_string(str(extended_model))}"
+
+
+class TestPresolve:
+
+    def test_presolve_should_remove_reducible_rows_and_columns(self):
+        model = model_with_presolve_reductions()
+
+        presolved = Presolver().presolve(model)
+
+        # x2 is fixed, the singleton rows become bounds and the three parallel rows become one equality
+        assert (presolved.removed_rows, presolved.removed_columns) == (4, 1), "presolve removed incorrect number of rows and columns:" +\
+            f"\n- got: {(presolved.removed_rows, presolved.removed_columns)}" +\
+            f"\n- expected: {(4, 1)}" +\
+            f"\n- reduced model:\n{indented_string(str(presolved.model))}"
+        assert [c.type for c in presolved.model.constraints] == [ConstraintType.EQ], "the >= and <= pair should become an equality:" +\
+            f"\n{indented_string(str(presolved.model))}"
+        assert [v.upper for v in presolved.model.variables] == [3.0, 3.0], "singleton rows should tighten the upper bounds:" +\
+            f"\n{indented_string(str(presolved.model))}"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_lower_bounds,
+        model_with_redundant_constraint,
+        model_degenerate,
+        model_unbounded,
+        model_infeasible,
+        model_with_presolve_reductions
+    ])
+    def test_presolved_solution_should_match_original_solution(self, engine, model_builder):
+        model = model_builder()
+
+        expected = model.solve(engine=engine)
+        solution = model.solve(engine=engine, presolve=True)
+
+        assert solution.presolved is not None, "solution should report the presolve result"
+        assert (solution.is_feasible, solution.is_bounded) == (expected.is_feasible, expected.is_bounded), \
+            "presolved solution has incorrect status:" +\
+            f"\n- got: {(solution.is_feasible, solution.is_bounded)}" +\
+            f"\n- expected: {(expected.is_feasible, expected.is_bounded)}" +\
+            f"\n- for model:\n{indented_string(str(model))}"
+        if expected.has_assignment():
+            assert len(solution.assignment()) == len(model.variables), "assignment should cover all the original variables"
+            assert np.isclose(solution.objective_value(), expected.objective_value()), "presolved solution has incorrect objective value:" +\
+                f"\n- got: {solution.objective_value()}" +\
+                f"\n- expected: {expected.objective_value()}" +\
+                f"\n- for model:\n{indented_string(str(model))}"
+
+    def test_presolve_should_detect_crossing_bounds(self):
+        model = Model("crossing_bounds")
+        x1 = model.create_variable("x1")
+        x2 = model.create_variable("x2")
+        model.add_constraint(x1 + x2 <= 5)
+        model.add_constraint(2 * x1 <= 2)
+        model.add_constraint(x1 >= 2)
+        model.maximize(x1 + x2)
+
+        presolved = Presolver().presolve(model)
+
+        assert presolved.is_infeasible, "presolve should detect the bounds of x1 cross each other"
+        assert not model.solve(presolve=True).is_feasible, "solution of the presolved model should be infeasible"
+
+
+class TestScaling:
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("scaling", SCALINGS)
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_lower_bounds,
+        model_with_redundant_constraint,
+        model_degenerate,
+        model_badly_scaled,
+        model_unbounded,
+        model_infeasible
+    ])
+    def test_scaled_solution_should_match_original_solution(self, engine, scaling, model_builder):
+        model = model_builder()
+
+        expected = model.solve(engine=engine)
+        solution = model.solve(engine=engine, scaling=scaling)
+
+        assert (solution.is_feasible, solution.is_bounded) == (expected.is_feasible, expected.is_bounded), \
+            "scaled solution has incorrect status:" +\
+            f"\n- got: {(solution.is_feasible, solution.is_bounded)}" +\
+            f"\n- expected: {(expected.is_feasible, expected.is_bounded)}" +\
+            f"\n- for model:\n{indented_string(str(model))}"
+        if expected.has_assignment():
+            assert np.allclose(solution.assignment(), expected.assignment()), "scaled solution should be unscaled:" +\
+                f"\n- got: {solution.assignment()}" +\
+                f"\n- expected: {expected.assignment()}" +\
+                f"\n- for model:\n{indented_string(str(model))}"
+
+    @pytest.mark.parametrize("scaling", SCALINGS)
+    def test_resolve_should_work_with_scaled_tableau(self, scaling):
+        model = model_badly_scaled()
+        solution = model.solve(scaling=scaling)
+        constraint = model.variables[1] <= 0.002
+
+        resolved = Solver(scaling=scaling).resolve(solution, constraint)
+        extended_model = deepcopy(model)
+        extended_model.add_constraint(extended_model.variables[1] <= 0.002)
+        expected = extended_model.solve()
+
+        assert np.isclose(resolved.objective_value(), expected.objective_value()), "resolve returned incorrect objective value:" +\
+            f"\n- got: {resolved.objective_value()}" +\
+            f"\n- expected: {expected.objective_value()}" +\
+            f"\n- for model:\n{indented_string(str(extended_model))}"
+
+
+class RecordingCallback(SolverCallback):
+
+    def __init__(self):
+        self.events = []
+
+    def on_phase_start(self, phase, objective):
+        self.events.append(("start", phase))
+
+    def on_iteration(self, phase, iteration, entering, leaving, objective):
+        self.events.append(("iteration", phase))
+
+    def on_phase_end(self, phase, iterations):
+        self.events.append(("end", phase))
+
+
+class TestSolveStats:
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_lower_bounds,
+        model_degenerate,
+        model_unbounded,
+        model_infeasible
+    ])
+    def test_phase_iterations_should_sum_up_to_solution_iterations(self, engine, model_builder):
+        model = model_builder()
+        solution = model.solve(engine=engine)
+        stats = solution.stats
+
+        assert stats.total_iterations() == solution.iterations, "iterations of the phases don't sum up:" +\
+            f"\n- got:\n{indented_string(str(stats))}" +\
+            f"\n- expected total: {solution.iterations}"
+        for phase in SolvePhase:
+            assert len(stats.objectives[phase]) in [0, stats.iterations[phase] + 1], \
+                f"objective trajectory of the `{phase.value}` should have a value per iteration and the starting one"
+        assert "total" in stats.times and "pricing" in stats.times, f"missing stage times:\n{indented_string(str(stats))}"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_lower_bounds,
+        model_degenerate
+    ])
+    def test_phase_two_trajectory_should_end_at_objective_value(self, engine, model_builder):
+        model = model_builder()
+        solution = model.solve(engine=engine)
+        trajectory = solution.stats.objectives[SolvePhase.PHASE_TWO]
+
+        assert np.isclose(trajectory[-1], solution.objective_value()), "trajectory ends at incorrect objective value:" +\
+            f"\n- got: {trajectory}" +\
+            f"\n- expected last: {solution.objective_value()}" +\
+            f"\n- for model:\n{indented_string(str(model))}"
+        sign = model.objective.type.value
+        assert all(sign * (b - a) >= -1e-9 for (a, b) in zip(trajectory, trajectory[1:])), \
+            f"objective should never get worse in the second phase: {trajectory}"
+
+    @pytest.mark.parametrize("engine", SIMPLEX_ENGINES)
+    def test_callbacks_should_be_notified_about_every_iteration(self, engine):
+        model = model_solvable_with_artificial_variables()
+        callback = RecordingCallback()
+        solution = model.solve(engine=engine, callbacks=[callback])
+
+        for phase in [SolvePhase.PHASE_ONE, SolvePhase.PHASE_TWO]:
+            events = [event for (event, p) in callback.events if p == phase]
+            expected = ["start"] + ["iteration"] * solution.stats.iterations[phase] + ["end"]
+            assert events == expected, f"callback got incorrect events of the `{phase.value}`:" +\
+                f"\n- got: {events}" +\
+                f"\n- expected: {expected}"
+
+    def test_resolve_should_report_dual_iterations(self):
+        model = model_solvable()
+        solution = model.solve()
+
+        resolved = Solver().resolve(solution, model.variables[0] + model.variables[1] <= 300)
+
+        assert resolved.stats.iterations[SolvePhase.DUAL] == resolved.iterations > 0, \
+            f"resolve should report its dual iterations:\n{indented_string(str(resolved.stats))}"
+
+
+class TestStart:
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("start", STARTS)
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_lower_bounds,
+        model_with_redundant_constraint,
+        model_degenerate,
+        model_with_singleton_columns,
+        model_unbounded,
+        model_infeasible
+    ])
+    def test_every_start_should_give_the_same_result(self, engine, start, model_builder):
+        model = model_builder()
+
+        expected = model.solve(engine=engine, start="two_phase")
+        solution = model.solve(engine=engine, start=start)
+
+        assert (solution.is_feasible, solution.is_bounded) == (expected.is_feasible, expected.is_bounded), \
+            f"`{start}` start returned incorrect status:" +\
+            f"\n- got: {(solution.is_feasible, solution.is_bounded)}" +\
+            f"\n- expected: {(expected.is_feasible, expected.is_bounded)}" +\
+            f"\n- for model:\n{indented_string(str(model))}"
+        if expected.has_assignment():
+            assert np.isclose(solution.objective_value(), expected.objective_value()), \
+                f"`{start}` start returned incorrect objective value:" +\
+                f"\n- got: {solution.objective_value()}" +\
+                f"\n- expected: {expected.objective_value()}" +\
+                f"\n- for model:\n{indented_string(str(model))}"
+
+    @pytest.mark.parametrize("engine", SIMPLEX_ENGINES)
+    @pytest.mark.parametrize("start", ["crash", "big_m"])
+    def test_crash_basis_should_skip_the_first_phase(self, engine, start):
+        model = model_with_singleton_columns()
+        solution = model.solve(engine=engine, start=start)
+        iterations = solution.stats.iterations
+
+        assert iterations[SolvePhase.PHASE_ONE] == iterations[SolvePhase.COMPOSITE] == 0, \
+            f"rows with the singleton columns shouldn't need the artificial variables:\n{indented_string(str(solution.stats))}"
+        assert solution.iterations < model.solve(engine=engine, start="two_phase").iterations, \
+            "crash basis should save the iterations of the first phase"
+
+    @pytest.mark.parametrize("engine", SIMPLEX_ENGINES)
+    def test_big_m_should_find_feasible_basis_in_a_single_phase(self, engine):
+        model = model_solvable_with_artificial_variables()
+        solution = model.solve(engine=engine, start="big_m")
+        iterations = solution.stats.iterations
+
+        assert iterations[SolvePhase.PHASE_ONE] == 0 and iterations[SolvePhase.COMPOSITE] > 0, \
+            f"composite objective should replace the first phase:\n{indented_string(str(solution.stats))}"
+        assert np.isclose(solution.objective_value(), 5.0), "composite objective should reach the optimum"
+
+
+def scenario_model(model, bounds, costs):
+    scenario = deepcopy(model)
+    for (constraint, bound) in zip(scenario.constraints, bounds):
+        constraint.bound = bound
+    objective = quicksum(c * x for (c, x) in zip(costs, scenario.variables))
+    scenario.maximize(objective) if model.objective.type.name == "MAX" else scenario.minimize(objective)
+    return scenario
+
+
+class TestBatch:
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("changes_rhs, changes_costs", [(True, False), (False, True), (True, True)])
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_lower_bounds,
+        model_with_singleton_columns
+    ])
+    def test_batch_should_match_solving_every_scenario(self, engine, changes_rhs, changes_costs, model_builder):
+        model = model_builder()
+        compiled = model.compile()
+        rng = np.random.default_rng(0)
+        rhs_list = [compiled.bounds * rng.uniform(0.5, 1.5, len(compiled.bounds)) for _ in range(6)]
+        cost_list = [compiled.costs + rng.uniform(-2, 2, len(compiled.costs)) for _ in range(6)]
+
+        solutions = SolverFactory.solver(engine).solve_batch(model, rhs_list if changes_rhs else None,
+                                                             cost_list if changes_costs else None)
+
+        assert len(solutions) == 6, f"batch should return a solution per scenario, got {len(solutions)}"
+        for (solution, bounds, costs) in zip(solutions, rhs_list, cost_list):
+            scenario = scenario_model(model, bounds if changes_rhs else compiled.bounds,
+                                      costs if changes_costs else compiled.costs)
+            expected = scenario.solve(engine=engine)
+            assert (solution.is_feasible, solution.is_bounded) == (expected.is_feasible, expected.is_bounded), \
+                "batch returned incorrect status:" +\
+                f"\n- got: {(solution.is_feasible, solution.is_bounded)}" +\
+                f"\n- expected: {(expected.is_feasible, expected.is_bounded)}" +\
+                f"\n- for model:\n{indented_string(str(scenario))}"
+            if expected.has_assignment():
+                assert np.isclose(solution.objective_value(), expected.objective_value()), \
+                    "batch returned incorrect objective value:" +\
+                    f"\n- got: {solution.objective_value()}" +\
+                    f"\n- expected: {expected.objective_value()}" +\
+                    f"\n- for model:\n{indented_string(str(scenario))}"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_batch_should_warm_start_from_the_previous_scenario(self, engine):
+        model = model_solvable_with_artificial_variables()
+        rhs_list = [[2, 1, 6], [2.5, 1, 6], [3, 1.5, 6], [3, 2, 7]]
+
+        solutions = SolverFactory.solver(engine).solve_batch(model, rhs_list=rhs_list)
+        cold_iterations = [scenario_model(model, bounds, model.compile().costs).solve(engine=engine).iterations
+                           for bounds in rhs_list]
+
+        warm_iterations = [solution.iterations for solution in solutions[1:]]
+        assert sum(warm_iterations) < sum(cold_iterations[1:]), "warm started scenarios should need fewer iterations:" +\
+            f"\n- got: {warm_iterations}" +\
+            f"\n- solved from scratch: {cold_iterations[1:]}"
+
+    def test_batch_should_keep_solver_state_according_to_retention(self):
+        model = model_solvable()
+        solver = Solver(retention="none")
+
+        solutions = solver.solve_batch(model, cost_list=[[8, 5], [5, 8]])
+
+        assert all(solution.tableau is None for solution in solutions), "batch solutions should follow the retention"
+        assert solver.retention.value == "none", "batch should restore the retention of the solver"
+
+    def test_batch_should_reject_lists_of_different_lengths(self):
+        model = model_solvable()
+
+        with pytest.raises(BatchSizeError):
+            Solver().solve_batch(model, rhs_list=[[150, 250, 500]], cost_list=[[8, 5], [5, 8]])
+
+
+class TestSensitivity:
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("scaling", [None] + SCALINGS)
+    def test_sensitivity_should_match_the_textbook_analysis(self, engine, scaling):
+        model = model_solvable()
+        sensitivity = model.solve(engine=engine, scaling=scaling).sensitivity()
+
+        expected = {
+            "shadow prices": [0, 1, 4],
+            "reduced costs": [0, 0],
+            "rhs ranges": [[125, np.inf], [200, 500], [250, 550]],
+            "cost ranges": [[0, 10], [4, np.inf]]
+        }
+        got = {
+            "shadow prices": sensitivity.shadow_prices,
+            "reduced costs": sensitivity.reduced_costs,
+            "rhs ranges": sensitivity.rhs_ranges,
+            "cost ranges": sensitivity.cost_ranges
+        }
+        for (name, values) in expected.items():
+            assert np.allclose(got[name], values), f"incorrect {name}:" +\
+                f"\n- got: {got[name]}" +\
+                f"\n- expected: {values}" +\
+                f"\n- for model:\n{indented_string(str(model))}"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_singleton_columns
+    ])
+    def test_shadow_prices_should_predict_objective_within_rhs_ranges(self, engine, model_builder):
+        model = model_builder()
+        solution = model.solve(engine=engine)
+        sensitivity = solution.sensitivity()
+
+        for constraint in model.constraints:
+            for bound in sensitivity.rhs_range(constraint):
+                if not np.isfinite(bound):
+                    continue
+                moved_model = deepcopy(model)
+                moved_model.constraints[constraint.index].bound = bound
+                expected = moved_model.solve(engine=engine).objective_value()
+                predicted = solution.objective_value() + \
+                    sensitivity.shadow_price(constraint) * (bound - constraint.bound)
+                assert np.isclose(predicted, expected), "shadow price predicted incorrect objective value:" +\
+                    f"\n- got: {predicted}" +\
+                    f"\n- expected: {expected}" +\
+                    f"\n- for bound {bound} of the constraint {constraint.index} in model:\n{indented_string(str(model))}"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_singleton_columns
+    ])
+    def test_assignment_should_stay_optimal_within_cost_ranges(self, engine, model_builder):
+        model = model_builder()
+        solution = model.solve(engine=engine)
+        sensitivity = solution.sensitivity()
+        costs = np.array(model.objective.expression.coefficients(model))
+
+        for var in model.variables:
+            for cost in sensitivity.cost_range(var):
+                if not np.isfinite(cost):
+                    continue
+                moved_costs = costs.copy()
+                moved_costs[var.index] = cost
+                moved_model = scenario_model(model, [c.bound for c in model.constraints], moved_costs)
+                expected = moved_model.solve(engine=engine).objective_value()
+                assert np.isclose(moved_costs @ solution.assignment(), expected), \
+                    "assignment should stay optimal within the cost range:" +\
+                    f"\n- got: {moved_costs @ solution.assignment()}" +\
+                    f"\n- expected: {expected}" +\
+                    f"\n- for cost {cost} of {var.name} in model:\n{indented_string(str(model))}"
+
+    @pytest.mark.parametrize("model_builder, solve_options", [
+        (model_infeasible, dict()),
+        (model_unbounded, dict()),
+        (model_solvable, dict(retention="basis")),
+        (model_with_presolve_reductions, dict(presolve=True))
+    ])
+    def test_sensitivity_should_be_unavailable_without_matching_tableau(self, model_builder, solve_options):
+        solution = model_builder().solve(**solve_options)
+
+        assert solution.sensitivity() is None, "sensitivity requires an optimal tableau of the solved model"
+
+
+def model_random(seed: int, variables_n: int = 30, constraints_n: int = 20):
+    rng = np.random.default_rng(seed)
+    model = Model(f"random_{seed}")
+    x = model.create_variables(variables_n, "x", upper=10)
+    model.add_constraint(rng.uniform(0, 5, (constraints_n, variables_n)) @ x <= rng.uniform(10, 50, constraints_n))
+    model.maximize(rng.uniform(1, 5, variables_n) @ x)
+    return model
+
+
+class TestSolveMany:
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_solve_many_should_return_solutions_in_order(self, engine):
+        models = [model_solvable(), model_infeasible(), model_unbounded(), model_with_variable_bounds()] +\
+                 [model_random(seed) for seed in range(4)]
+
+        solutions = solve_many(models, workers=3, engine=engine)
+
+        for (model, solution) in zip(models, solutions):
+            expected = model.solve(engine=engine)
+            assert solution.model is model, "solution should belong to the given model"
+            assert (solution.is_feasible, solution.is_bounded) == (expected.is_feasible, expected.is_bounded), \
+                f"solution of {model.name} has incorrect status"
+            if expected.has_assignment():
+                assert np.isclose(solution.objective_value(), expected.objective_value()), \
+                    "parallel solve should find the same objective value:" +\
+                    f"\n- got: {solution.objective_value()}" +\
+                    f"\n- expected: {expected.objective_value()}" +\
+                    f"\n- for model:\n{indented_string(str(model))}"
+                assert solution.basis() is not None, "parallel solve should retain the basis"
+                assert solution.iterations == expected.iterations, "parallel solve should take the same iterations"
+
+    def test_solve_many_should_isolate_failed_models(self):
+        without_objective = Model("without_objective")
+        without_objective.create_variable("x")
+        models = [model_solvable(), without_objective, Model("empty"), model_solvable()]
+
+        solutions = solve_many(models, workers=2)
+
+        assert isinstance(solutions[1], SolveFailedError) and solutions[1].index == 1, \
+            f"model without objective should fail, got: {solutions[1]}"
+        assert isinstance(solutions[2], SolveFailedError) and "EmptyModelError" in solutions[2].reason, \
+            f"empty model should fail, got: {solutions[2]}"
+        assert solutions[0].objective_value() == solutions[3].objective_value() == model_solvable().solve().objective_value(), \
+            "failures should not affect the other models"
+
+    def test_solve_many_should_stop_models_exceeding_timeout(self):
+        models = [model_random(0, 300, 200), model_solvable()]
+
+        solutions = solve_many(models, workers=1, timeout=0.001)
+
+        assert isinstance(solutions[0], SolveTimeoutError), f"model should time out, got: {solutions[0]}"
+        assert isinstance(solutions[1], SolveTimeoutError) or solutions[1].has_assignment(), \
+            "worker replacing the terminated one should solve the remaining models"
+
+    def test_solve_many_should_handle_empty_list(self):
+        assert solve_many([]) == [], "no models should give no solutions"
+
+
+MPS_WITH_RANGES_AND_BOUNDS = """* ranges, bounds and integrality markers
+NAME          ranged
+ROWS
+ N  COST
+ L  LIM1
+ G  LIM2
+ E  MYEQN
+ E  R4
+COLUMNS
+    MARKER                 'MARKER'                 'INTORG'
+    X1        COST         1.0   LIM1         1.0
+    X1        LIM2         1.0
+    MARKER                 'MARKER'                 'INTEND'
+    X2        COST         2.0   LIM1         1.0
+    X2        MYEQN       -1.0
+    X3        COST        -1.0   MYEQN        1.0
+    X4        COST         1.0   R4           1.0
+RHS
+    RHS       LIM1         4.0   LIM2         1.0
+    RHS       MYEQN        7.0   R4           2.0
+RANGES
+    RNG       LIM1         2.5   R4          -1.0
+BOUNDS
+ UP BND       X1           4.0
+ LO BND       X2          -1.0
+ UP BND       X2           1.0
+ UP BND       X3           1e30
+ BV BND       X4
+ENDATA
+"""
+
+LP_SPANNING_LINES = """\\ labels, expressions spanning lines and all the bound forms
+Maximize
+ obj: x1 + 2x2 + 3 x3
+   + x4
+Subject To
+ c1: - x1 + x2 + x3 + 10 x4 <= 20
+ c2: x1 - 3 x2 + x3
+     <= 30 \\ trailing comment
+ x2 - 3.5e0 x4 = 0
+Bounds
+ 0 <= x1 <= 40
+ 2 <= x4 <= 3
+ x3 <= 1e30
+ x2 >= -5
+General
+ x4
+End
+"""
+
+
+class TestFormats:
+
+    @pytest.mark.parametrize("file_format", ["mps", "lp"])
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_lower_bounds,
+        model_unbounded,
+        model_badly_scaled,
+        model_with_presolve_reductions
+    ])
+    def test_written_model_should_be_read_back(self, model_builder, file_format, tmp_path):
+        model = model_builder()
+        path = str(tmp_path / f"{model.name}.{file_format}")
+
+        getattr(model, f"write_{file_format}")(path)
+        read = getattr(Model, f"from_{file_format}")(path)
+
+        compiled, read_compiled = model.compile(), read.compile()
+        assert [v.name for v in read.variables] == [v.name for v in model.variables], "variables should be read in order"
+        assert np.array_equal(read_compiled.matrix, compiled.matrix), "read model has incorrect matrix:" +\
+            f"\n- got:\n{indented_string(str(read))}" +\
+            f"\n- expected:\n{indented_string(str(model))}"
+        assert np.array_equal(read_compiled.bounds, compiled.bounds), "read model has incorrect bounds"
+        assert list(read_compiled.senses) == list(compiled.senses), "read model has incorrect constraint types"
+        assert np.array_equal(read_compiled.costs, compiled.costs), "read model has incorrect objective"
+        assert read_compiled.objective_type == compiled.objective_type, "read model has incorrect objective type"
+        assert list(read_compiled.lower) == list(compiled.lower), "read model has incorrect lower bounds"
+        assert list(read_compiled.upper) == list(compiled.upper), "read model has incorrect upper bounds"
+
+    def test_mps_reader_should_read_ranges_and_bounds(self, tmp_path):
+        path = tmp_path / "ranged.mps"
+        path.write_text(MPS_WITH_RANGES_AND_BOUNDS)
+
+        model = Model.from_mps(str(path))
+        compiled = model.compile()
+
+        assert model.name == "ranged", "model should be named after the NAME section"
+        assert compiled.objective_type == ObjectiveType.MIN, "MPS objective should be minimized by default"
+        assert np.array_equal(compiled.costs, [1.0, 2.0, -1.0, 1.0]), "read model has incorrect objective"
+        # the ranges are the copies of their rows with the other bound
+        expected_matrix = np.array([[1, 1, 0, 0], [1, 0, 0, 0], [0, -1, 1, 0], [0, 0, 0, 1], [1, 1, 0, 0], [0, 0, 0, 1]])
+        assert np.array_equal(compiled.matrix, expected_matrix), "read model has incorrect matrix:" +\
+            f"\n- got:\n{indented_string(str(compiled.matrix))}" +\
+            f"\n- expected:\n{indented_string(str(expected_matrix))}"
+        assert np.array_equal(compiled.bounds, [4.0, 1.0, 7.0, 2.0, 1.5, 1.0]), "read model has incorrect bounds"
+        assert [compiled.sense(i) for i in range(6)] == [ConstraintType.LE, ConstraintType.GE, ConstraintType.EQ,
+                                                         ConstraintType.LE, ConstraintType.GE, ConstraintType.GE], \
+            "read model has incorrect constraint types"
+        assert list(compiled.lower) == [0.0, -1.0, 0.0, 0.0], "read model has incorrect lower bounds"
+        assert list(compiled.upper) == [4.0, 1.0, np.inf, 1.0], "read model has incorrect upper bounds"
+
+    def test_lp_reader_should_read_expressions_spanning_lines(self, tmp_path):
+        path = tmp_path / "spanning.lp"
+        path.write_text(LP_SPANNING_LINES)
+
+        model = Model.from_lp(str(path))
+        compiled = model.compile()
+
+        assert [v.name for v in model.variables] == ["x1", "x2", "x3", "x4"], "variables should be read in order"
+        assert compiled.objective_type == ObjectiveType.MAX, "read model has incorrect objective type"
+        assert np.array_equal(compiled.costs, [1.0, 2.0, 3.0, 1.0]), "read model has incorrect objective"
+        expected_matrix = np.array([[-1, 1, 1, 10], [1, -3, 1, 0], [0, 1, 0, -3.5]])
+        assert np.array_equal(compiled.matrix, expected_matrix), "read model has incorrect matrix:" +\
+            f"\n- got:\n{indented_string(str(compiled.matrix))}" +\
+            f"\n- expected:\n{indented_string(str(expected_matrix))}"
+        assert np.array_equal(compiled.bounds, [20.0, 30.0, 0.0]), "read model has incorrect bounds"
+        assert list(compiled.senses) == [-1, -1, 0], "read model has incorrect constraint types"
+        assert list(compiled.lower) == [0.0, -5.0, 0.0, 2.0], "read model has incorrect lower bounds"
+        assert list(compiled.upper) == [40.0, np.inf, np.inf, 3.0], "read model has incorrect upper bounds"
+
+    @pytest.mark.parametrize("file_format, text, line", [
+        ("lp", "Maximize\n obj: x + 2\nSubject To\n c: x <= 1\nEnd\n", 3),
+        ("lp", "Minimize\n x\nBounds\n x free\nEnd\n", 4),
+        ("lp", "Minimize\n x\nSubject To\n c: x <= 1\nBounds\n x <= y\nEnd\n", 6),
+        ("mps", "NAME x\nROWS\n N obj\nCOLUMNS\n    x  missing  1\nENDATA\n", 5),
+        ("mps", "NAME x\nROWS\n N obj\nCOLUMNS\n    x  obj  1\nBOUNDS\n MI BND x\nENDATA\n", 7),
+    ])
+    def test_readers_should_report_invalid_lines(self, file_format, text, line, tmp_path):
+        path = tmp_path / f"invalid.{file_format}"
+        path.write_text(text)
+
+        with pytest.raises(ModelFormatError) as error:
+            getattr(Model, f"from_{file_format}")(str(path))
+        assert error.value.line == line, f"error should point to line {line}, got: {error.value}"
+
+
+class TestSnapshot:
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_with_variable_bounds,
+        model_with_lower_bounds,
+        model_badly_scaled
+    ])
+    def test_saved_model_should_be_loaded_back(self, model_builder, mmap, tmp_path):
+        model = model_builder()
+        path = str(tmp_path / "model.npz")
+
+        model.save(path)
+        loaded = Model.load(path, mmap=mmap)
+
+        compiled, loaded_compiled = model.compile(), loaded.compile()
+        assert loaded.name == model.name, "loaded model should keep the name"
+        assert [v.name for v in loaded.variables] == [v.name for v in model.variables], "loaded model should keep the variables"
+        assert np.array_equal(loaded_compiled.matrix, compiled.matrix), "loaded model has incorrect matrix:" +\
+            f"\n- got:\n{indented_string(str(loaded))}" +\
+            f"\n- expected:\n{indented_string(str(model))}"
+        assert np.array_equal(loaded_compiled.bounds, compiled.bounds), "loaded model has incorrect bounds"
+        assert list(loaded_compiled.senses) == list(compiled.senses), "loaded model has incorrect constraint types"
+        assert np.array_equal(loaded_compiled.costs, compiled.costs), "loaded model has incorrect objective"
+        assert loaded_compiled.objective_type == compiled.objective_type, "loaded model has incorrect objective type"
+        assert list(loaded_compiled.lower) == list(compiled.lower), "loaded model has incorrect lower bounds"
+        assert list(loaded_compiled.upper) == list(compiled.upper), "loaded model has incorrect upper bounds"
+
+    @pytest.mark.parametrize("model_builder", [model_solvable, model_infeasible, model_unbounded])
+    def test_saved_solution_should_be_loaded_back_with_basis(self, model_builder, tmp_path):
+        model = model_builder()
+        solution = model.solve()
+        path = str(tmp_path / "solution.npz")
+
+        solution.save(path)
+        loaded = Solution.load(path, model)
+
+        assert (loaded.is_feasible, loaded.is_bounded) == (solution.is_feasible, solution.is_bounded), \
+            "loaded solution has incorrect status"
+        assert loaded.has_assignment() == solution.has_assignment(), "loaded solution has incorrect assignment"
+        if solution.has_assignment():
+            assert loaded.assignment() == solution.assignment(), "loaded solution has incorrect assignment:" +\
+                f"\n- got: {loaded.assignment()}" +\
+                f"\n- expected: {solution.assignment()}"
+        assert loaded.basis() == solution.basis(), "loaded solution should keep the final basis:" +\
+            f"\n- got: {loaded.basis()}" +\
+            f"\n- expected: {solution.basis()}"
+        assert loaded.iterations == solution.iterations, "loaded solution has incorrect number of iterations"
+
+    def test_load_should_reject_snapshots_of_other_kind(self, tmp_path):
+        model = model_solvable()
+        model_path, solution_path = str(tmp_path / "model.npz"), str(tmp_path / "solution.npz")
+        model.save(model_path)
+        model.solve().save(solution_path)
+
+        with pytest.raises(SnapshotError):
+            Solution.load(model_path, model)
+        with pytest.raises(SnapshotError):
+            Model.load(solution_path)
+        other_model = Model("other")
+        other_model.create_variable("x")
+        with pytest.raises(SnapshotError):
+            Solution.load(solution_path, other_model)
+
+
+class TestInteriorPoint:
+
+    @pytest.mark.parametrize("crossover", [True, False])
+    @pytest.mark.parametrize("model_builder", [
+        model_solvable,
+        model_solvable_with_artificial_variables,
+        model_with_variable_bounds,
+        model_with_lower_bounds,
+        model_with_redundant_constraint,
+        model_degenerate,
+        model_badly_scaled,
+        model_unbounded,
+        model_infeasible
+    ] + [lambda seed=seed: model_random(seed) for seed in range(5)])
+    def test_interior_point_should_find_the_simplex_solution(self, model_builder, crossover):
+        model = model_builder()
+        expected = model.solve(engine="tableau")
+
+        solution = model.solve(engine="ipm", crossover=crossover)
+
+        assert (solution.is_feasible, solution.is_bounded) == (expected.is_feasible, expected.is_bounded), \
+            f"interior point solution of {model.name} has incorrect status"
+        if expected.has_assignment():
+            assert np.isclose(solution.objective_value(), expected.objective_value(), rtol=1e-6), \
+                "interior point method should find the optimal objective value:" +\
+                f"\n- got: {solution.objective_value()}" +\
+                f"\n- expected: {expected.objective_value()}" +\
+                f"\n- for model:\n{indented_string(str(model))}"
+
+    @pytest.mark.filterwarnings("error")
+    def test_step_of_diverging_iterates_should_not_warn(self):
+        values = [np.array([1e300, 1.0]), np.array([2.0])]
+        directions = [np.array([-1e-300, -0.5]), np.array([1.0])]
+
+        assert _max_step(values, directions, np.inf) == 2.0, "step should be limited by the finite quotient"
+        assert _max_step([np.array([1e300])], [np.array([-1e-300])], np.inf) == np.inf, \
+            "overflowing step should be infinite"
+
+    @pytest.mark.parametrize("model_builder", [model_solvable, model_with_variable_bounds, model_degenerate])
+    def test_crossover_should_give_basic_solution(self, model_builder):
+        model = model_builder()
+        expected = model.solve(engine="tableau")
+
+        solution = model.solve(engine="ipm")
+
+        assert solution.basis() is not None, "crossover should give the final basis"
+        assert np.allclose(solution.assignment(), expected.assignment()), "crossover should find the basic solution:" +\
+            f"\n- got: {solution.assignment()}" +\
+            f"\n- expected: {expected.assignment()}"
+        assert np.allclose(solution.sensitivity().shadow_prices, expected.sensitivity().shadow_prices), \
+            "crossover solution should have the shadow prices of the simplex one"
+
+    def test_interior_point_without_crossover_should_have_no_basis(self):
+        solution = model_solvable().solve(engine="ipm", crossover=False)
+
+        assert solution.has_assignment(), "interior point method should find the solution"
+        assert solution.basis() is None, "interior solution should have no basis"
+        assert solution.sensitivity() is None, "interior solution should have no sensitivity"
+
+    def test_interior_point_iterations_should_be_recorded(self):
+        solution = model_random(0, 60, 40).solve(engine="ipm", crossover=False)
+
+        iterations = solution.stats.iterations[SolvePhase.INTERIOR_POINT]
+        assert iterations > 0, "interior point iterations should be recorded"
+        assert solution.iterations == iterations, "interior point iterations should be the only ones without crossover"
+        assert len(solution.stats.objectives[SolvePhase.INTERIOR_POINT]) == iterations + 1, \
+            "interior point trajectory should have the starting point and every iteration"
+
+
+class CancellingCallback(SolverCallback):
+
+    def __init__(self, token: CancellationToken, iterations: int):
+        self.token = token
+        self.iterations = iterations
+        self.seen = 0
+
+    def on_iteration(self, phase, iteration, entering, leaving, objective):
+        self.seen += 1
+        if self.seen == self.iterations:
+            self.token.cancel()
+
+
+def assert_satisfies_constraints(model: Model, assignment):
+    for constraint in model.constraints:
+        value = constraint.expression.evaluate(assignment)
+        satisfied = {
+            ConstraintType.LE: value <= constraint.bound + 1e-6,
+            ConstraintType.GE: value >= constraint.bound - 1e-6,
+            ConstraintType.EQ: abs(value - constraint.bound) <= 1e-6
+        }[constraint.type]
+        assert satisfied, f"assignment violates the constraint {constraint}: {value}"
+    for var in model.variables:
+        assert var.lower - 1e-6 <= assignment[var.index] <= var.upper + 1e-6, \
+            f"assignment violates the bounds of {var.name}: {assignment[var.index]}"
+
+
+class TestLimits:
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("max_iterations", [0, 1, 3])
+    def test_iteration_limit_should_stop_the_solve(self, engine, max_iterations):
+        model = model_random(0)
+
+        solution = model.solve(engine=engine, max_iterations=max_iterations)
+
+        assert solution.status() == SolutionStatus.LIMIT_REACHED, \
+            f"solve should stop at the limit, got status: {solution.status().value}"
+        assert solution.limit == LimitType.ITERATIONS, f"solve should be stopped by the iteration limit, got: {solution.limit}"
+        assert solution.iterations == max_iterations, \
+            f"solve should perform exactly {max_iterations} iterations, got: {solution.iterations}"
+        assert solution.sensitivity() is None, "stopped solve should have no sensitivity"
+
+    @pytest.mark.parametrize("engine", SIMPLEX_ENGINES)
+    @pytest.mark.parametrize("retention", ["tableaux", "basis", "none"])
+    def test_stopped_second_phase_should_keep_feasible_assignment_and_basis(self, engine, retention):
+        model = model_random(1)
+        optimal = model.solve(engine=engine)
+
+        solution = model.solve(engine=engine, retention=retention, max_iterations=optimal.iterations // 2)
+
+        assert solution.has_assignment(), "second phase should keep the last basic solution"
+        assert_satisfies_constraints(model, solution.assignment())
+        assert solution.objective_value() <= optimal.objective_value() + 1e-6, \
+            "stopped solve should not be better than the optimal one:" +\
+            f"\n- got: {solution.objective_value()}" +\
+            f"\n- optimal: {optimal.objective_value()}"
+        assert (solution.basis() is not None) == (retention != "none"), "stopped solve should keep the last basis"
+
+    @pytest.mark.parametrize("engine", SIMPLEX_ENGINES)
+    def test_stopped_first_phase_should_have_no_assignment(self, engine):
+        model = model_solvable_with_artificial_variables()
+
+        solution = model.solve(engine=engine, max_iterations=1, start="two_phase")
+
+        assert solution.status() == SolutionStatus.LIMIT_REACHED, "solve should stop at the limit"
+        assert not solution.has_assignment(), "first phase solution should have no assignment"
+        assert not solution.is_feasible and not solution.is_optimal(), "first phase solution should not look feasible"
+        assert solution.basis() is not None, "stopped solve should keep the last basis"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("model_builder", [model_solvable, model_infeasible, model_unbounded, model_degenerate])
+    def test_solve_within_the_limits_should_not_change(self, engine, model_builder):
+        model = model_builder()
+        expected = model.solve(engine=engine)
+
+        solution = model.solve(engine=engine, max_iterations=1000, time_limit=60.0, cancellation=CancellationToken())
+
+        assert solution.status() == expected.status() != SolutionStatus.LIMIT_REACHED, \
+            f"solve within the limits should finish, got status: {solution.status().value}"
+        assert solution.limit is None, "solve within the limits should not be stopped"
+        assert solution.iterations == expected.iterations, "limits should not change the iterations"
+        assert solution.objective_value() == expected.objective_value(), "limits should not change the solution"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_cancellation_should_stop_the_solve(self, engine):
+        token = CancellationToken()
+        callback = CancellingCallback(token, 2)
+
+        solution = model_random(0).solve(engine=engine, callbacks=[callback], cancellation=token)
+
+        assert solution.limit == LimitType.CANCELLED, f"solve should be cancelled, got: {solution.limit}"
+        assert solution.iterations == 2, f"solve should stop right after the cancellation, got: {solution.iterations}"
+
+    def test_cancelled_token_should_stop_every_solve(self):
+        token = CancellationToken()
+        token.cancel()
+
+        solutions = [model_random(seed).solve(cancellation=token) for seed in range(3)]
+
+        assert all(s.limit == LimitType.CANCELLED and s.iterations == 0 for s in solutions), \
+            "cancelled token should stop the solves before the first iteration"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_time_limit_should_stop_the_solve(self, engine):
+        solution = model_random(0).solve(engine=engine, time_limit=0.0)
+
+        assert solution.limit == LimitType.TIME, f"solve should be stopped by the time limit, got: {solution.limit}"
+        assert solution.iterations == 0, "solve with no time should perform no iterations"
+
+    def test_resolve_should_not_start_from_stopped_solve(self):
+        model = model_random(1)
+        stopped = model.solve(max_iterations=1)
+
+        solution = Solver().resolve(stopped, model.variables[0] <= 1.0)
+        extended_model = deepcopy(model)
+        extended_model.add_constraint(extended_model.variables[0] <= 1.0)
+        expected = extended_model.solve()
+        assert solution.is_optimal(), f"resolve should finish the solve, got status: {solution.status().value}"
+        assert abs(solution.objective_value() - expected.objective_value()) <= 1e-6, \
+            "resolved solution should be optimal:" +\
+            f"\n- got: {solution.objective_value()}" +\
+            f"\n- expected: {expected.objective_value()}"
+
+    def test_limit_should_survive_presolve(self):
+        solution = model_random(0).solve(presolve=True, max_iterations=1)
+
+        assert solution.status() == SolutionStatus.LIMIT_REACHED, "presolved solve should keep the limit status"
+        assert_satisfies_constraints(solution.model, solution.assignment())
+
+    def test_limit_should_survive_snapshot(self, tmp_path):
+        model = model_random(0)
+        solution = model.solve(max_iterations=2)
+        path = str(tmp_path / "solution.npz")
+
+        solution.save(path)
+        loaded = Solution.load(path, model)
+
+        assert loaded.limit == LimitType.ITERATIONS, f"loaded solution should keep the limit, got: {loaded.limit}"
+        assert loaded.assignment() == solution.assignment(), "loaded solution should keep the partial assignment"
+
+    def test_solve_many_should_pass_the_limits(self):
+        models = [model_random(seed) for seed in range(3)]
+
+        solutions = solve_many(models, workers=2, max_iterations=1)
+
+        assert all(s.status() == SolutionStatus.LIMIT_REACHED and s.iterations == 1 for s in solutions), \
+            "every solution should be stopped at the limit"